@@ -0,0 +1,350 @@
+"""
+Plateaux de Tetris vectorisés avec NumPy.
+Ce module fait avancer N parties en parallèle : les N grilles sont stockées dans un
+seul tableau (N x lignes x colonnes, uint8) et chaque règle du moteur (collisions,
+verrouillage, effacement des lignes, gravité, score) est appliquée à tout le lot en
+quelques opérations NumPy. Les règles sont celles de engine.GameState avec la courbe de
+niveaux classique (engine.COURBE_CLASSIQUE, une ligne par descente).
+"""
+
+import numpy as np
+
+from engine import (
+    CARTE_COULEURS, FORMES, LISTE_FORMES, NB_COLONNES, NB_LIGNES, COURBE_CLASSIQUE,
+    DUREE_ANIMATION_LIGNE, DUREE_TICK, ACTION_GAUCHE, ACTION_DROITE, ACTION_ROTATION,
+    ACTION_DESCENTE, ACTION_CHUTE, ACTION_PAUSE, MODE_ALEATOIRE, GenerateurPieces, indice_couleur
+)
+
+LONGUEUR_SUITE = 1024      # Nombre de formes pré-générées par partie à chaque remplissage
+
+# =============================================================================
+# Tables des formes au format NumPy
+#
+# Les formes sont désignées par leur indice dans LISTE_FORMES. Les rotations sont
+# complétées cycliquement jusqu'à 4 pour que toutes les formes aient la même taille.
+# =============================================================================
+NB_ROTATIONS = np.array([len(FORMES[forme]) for forme in LISTE_FORMES], dtype=np.int64)
+DX = np.array([[[dx for dx, _ in FORMES[forme][r % len(FORMES[forme])]] for r in range(4)]
+               for forme in LISTE_FORMES], dtype=np.int64)
+DY = np.array([[[dy for _, dy in FORMES[forme][r % len(FORMES[forme])]] for r in range(4)]
+               for forme in LISTE_FORMES], dtype=np.int64)
+# Indice de palette (engine.PALETTE) de la couleur de chaque forme
+INDICES_FORMES = np.array([indice_couleur(CARTE_COULEURS[forme]) for forme in LISTE_FORMES], dtype=np.uint8)
+# Temps entre deux descentes (ms) à chaque niveau de la courbe classique
+PERIODES_CHUTE = np.array([COURBE_CLASSIQUE.chute(niveau)[0] for niveau in range(len(COURBE_CLASSIQUE.gravites))],
+                          dtype=np.int64)
+
+# =============================================================================
+# Classe PlateauxBatch (N grilles de jeu dans un seul tableau)
+# =============================================================================
+class PlateauxBatch:
+    def __init__(self, nb_plateaux, largeur=NB_COLONNES, hauteur=NB_LIGNES):
+        """
+        Initialise un lot de plateaux vides.
+
+        :param nb_plateaux: Nombre de plateaux du lot.
+        :param largeur: Nombre de colonnes de chaque grille.
+        :param hauteur: Nombre de lignes de chaque grille.
+        """
+        self.nb_plateaux = nb_plateaux
+        self.largeur = largeur
+        self.hauteur = hauteur
+        # Indice de palette de chaque case (0 = case vide)
+        self.cases = np.zeros((nb_plateaux, hauteur, largeur), dtype=np.uint8)
+
+    def _indices(self, indices):
+        """Retourne les indices de plateaux concernés (tous par défaut)."""
+        if indices is None:
+            return np.arange(self.nb_plateaux)
+        return np.asarray(indices)
+
+    def _positions(self, formes, rotations, cols, ligs):
+        """Calcule les colonnes et lignes (tableaux K x 4) des blocs de K pièces."""
+        formes = np.asarray(formes)
+        rotations = np.asarray(rotations)
+        xs = np.asarray(cols)[:, None] + DX[formes, rotations]
+        ys = np.asarray(ligs)[:, None] + DY[formes, rotations]
+        return xs, ys
+
+    def is_valid_move(self, formes, rotations, cols, ligs, indices=None):
+        """
+        Vérifie pour chaque plateau si la pièce donnée est à une position valide
+        (dans la grille et sans chevaucher de case occupée).
+
+        :param formes: Indices de formes (dans LISTE_FORMES), un par plateau concerné.
+        :param rotations: Indices de rotation.
+        :param cols: Colonnes du coin supérieur gauche des pièces.
+        :param ligs: Lignes du coin supérieur gauche des pièces.
+        :param indices: Indices des plateaux concernés (tous par défaut).
+        :return: Tableau de booléens, True si la position est valide.
+        """
+        indices = self._indices(indices)
+        xs, ys = self._positions(formes, rotations, cols, ligs)
+        dans_grille = (xs >= 0) & (xs < self.largeur) & (ys < self.hauteur)
+        occupees = self.cases[indices[:, None], np.clip(ys, 0, self.hauteur - 1),
+                              np.clip(xs, 0, self.largeur - 1)] != 0
+        # Les blocs situés au-dessus de la grille ne sont pas en collision
+        occupees &= ys >= 0
+        return np.all(dans_grille & ~occupees, axis=1)
+
+    def lock_piece(self, formes, rotations, cols, ligs, indices=None):
+        """
+        Verrouille une pièce sur chacun des plateaux concernés.
+
+        :param formes: Indices de formes (dans LISTE_FORMES), un par plateau concerné.
+        :param rotations: Indices de rotation.
+        :param cols: Colonnes du coin supérieur gauche des pièces.
+        :param ligs: Lignes du coin supérieur gauche des pièces.
+        :param indices: Indices des plateaux concernés (tous par défaut).
+        """
+        indices = self._indices(indices)
+        xs, ys = self._positions(formes, rotations, cols, ligs)
+        couleurs = np.broadcast_to(INDICES_FORMES[np.asarray(formes)][:, None], xs.shape)
+        visibles = ys >= 0
+        plateaux = np.broadcast_to(indices[:, None], xs.shape)
+        self.cases[plateaux[visibles], ys[visibles], xs[visibles]] = couleurs[visibles]
+
+    def get_lignes_completes(self, indices=None):
+        """
+        Identifie les lignes entièrement remplies de chaque plateau.
+
+        :param indices: Indices des plateaux concernés (tous par défaut).
+        :return: Tableau de booléens (plateaux x lignes).
+        """
+        return np.all(self.cases[self._indices(indices)] != 0, axis=2)
+
+    def effacer_lignes(self, lignes, indices=None):
+        """
+        Supprime les lignes marquées de chaque plateau et décale les lignes supérieures
+        vers le bas, en une seule réindexation pour tout le lot.
+
+        :param lignes: Tableau de booléens (plateaux x lignes) des lignes à effacer.
+        :param indices: Indices des plateaux concernés (tous par défaut).
+        :return: Nombre de lignes effacées sur chaque plateau.
+        """
+        indices = self._indices(indices)
+        lignes = np.asarray(lignes, dtype=bool)
+        # Tri stable : les lignes effacées passent en haut, les autres gardent leur ordre
+        ordre = np.argsort(~lignes, axis=1, kind='stable')
+        cases = np.take_along_axis(self.cases[indices], ordre[:, :, None], axis=1)
+        nb_effacees = lignes.sum(axis=1)
+        cases[np.arange(self.hauteur)[None, :] < nb_effacees[:, None]] = 0
+        self.cases[indices] = cases
+        return nb_effacees
+
+# =============================================================================
+# Classe BatchGameState (N parties avancées tick par tick en parallèle)
+# =============================================================================
+class BatchGameState:
+    def __init__(self, nb_parties, largeur=NB_COLONNES, hauteur=NB_LIGNES, graine=None,
+                 duree_animation=DUREE_ANIMATION_LIGNE, mode_pieces=MODE_ALEATOIRE):
+        """
+        Initialise N parties sans affichage, avancées ensemble par step().
+        La partie i reçoit la graine graine + i : sa suite de pièces est la même que celle
+        d'un engine.GameState créé avec cette graine.
+
+        :param nb_parties: Nombre de parties du lot.
+        :param largeur: Nombre de colonnes de chaque grille.
+        :param hauteur: Nombre de lignes de chaque grille.
+        :param graine: Graine de la première partie du lot (optionnel).
+        :param duree_animation: Durée en millisecondes de l'animation d'effacement des lignes.
+        :param mode_pieces: Mode de génération des pièces (MODE_ALEATOIRE ou MODE_SAC).
+        """
+        self.nb_parties = nb_parties
+        self.duree_animation = duree_animation
+        # Suites de pièces pré-générées par blocs pour chaque partie
+        self.generateurs = [GenerateurPieces(None if graine is None else graine + i, mode_pieces)
+                            for i in range(nb_parties)]
+        self._suites = np.array([g.generer_indices(LONGUEUR_SUITE) for g in self.generateurs],
+                                dtype=np.int64).reshape(nb_parties, LONGUEUR_SUITE)
+        self._positions = np.zeros(nb_parties, dtype=np.int64)
+        self.plateaux = PlateauxBatch(nb_parties, largeur, hauteur)
+        n = nb_parties
+        self.forme = np.zeros(n, dtype=np.int64)
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.col = np.zeros(n, dtype=np.int64)
+        self.lig = np.zeros(n, dtype=np.int64)
+        self.forme_suivante = self._tirer_formes(np.arange(n))
+        self.fall_speed = np.full(n, PERIODES_CHUTE[0], dtype=np.int64)
+        self.fall_time = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.nb_lignes = np.zeros(n, dtype=np.int64)
+        self.nb_pieces = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.pause = np.zeros(n, dtype=bool)
+        self.en_animation = np.zeros(n, dtype=bool)
+        self.lignes_animation = np.zeros((n, hauteur), dtype=bool)
+        self.timer_animation = np.zeros(n, dtype=np.int64)
+        self._piece_suivante(np.arange(n))
+
+    def _tirer_formes(self, indices):
+        """Retourne la forme suivante de chacune des parties données."""
+        epuisees = indices[self._positions[indices] >= LONGUEUR_SUITE]
+        for i in epuisees:
+            self._suites[i] = self.generateurs[i].generer_indices(LONGUEUR_SUITE)
+            self._positions[i] = 0
+        formes = self._suites[indices, self._positions[indices]]
+        self._positions[indices] += 1
+        return formes
+
+    def _piece_suivante(self, indices):
+        """Passe à la pièce suivante sur les parties données et détecte les fins de partie."""
+        if indices.size == 0:
+            return
+        self.forme[indices] = self.forme_suivante[indices]
+        self.forme_suivante[indices] = self._tirer_formes(indices)
+        self.rotation[indices] = 0
+        self.col[indices] = self.plateaux.largeur // 2 - 2
+        self.lig[indices] = 0
+        zeros = np.zeros(indices.size, dtype=np.int64)
+        valides = self.plateaux.is_valid_move(self.forme[indices], zeros, self.col[indices], zeros, indices)
+        self.game_over[indices[~valides]] = True
+        self.fall_time[indices] = 0
+
+    def _valides(self, indices, dcol=0, dlig=0, rotations=None):
+        """Teste le déplacement (ou la rotation) de la pièce courante sur les parties données."""
+        if rotations is None:
+            rotations = self.rotation[indices]
+        return self.plateaux.is_valid_move(self.forme[indices], rotations, self.col[indices] + dcol,
+                                           self.lig[indices] + dlig, indices)
+
+    def appliquer(self, actions):
+        """
+        Applique une action par partie (constantes ACTION_* de engine).
+
+        :param actions: Tableau d'entiers, une action par partie.
+        """
+        actions = np.asarray(actions)
+        bascule = (actions == ACTION_PAUSE) & ~self.game_over & ~self.en_animation
+        self.pause ^= bascule
+        actives = ~self.pause & ~self.en_animation & ~self.game_over
+        for action, dcol, dlig in ((ACTION_GAUCHE, -1, 0), (ACTION_DROITE, 1, 0), (ACTION_DESCENTE, 0, 1)):
+            indices = np.flatnonzero(actives & (actions == action))
+            if indices.size:
+                indices = indices[self._valides(indices, dcol, dlig)]
+                self.col[indices] += dcol
+                self.lig[indices] += dlig
+        indices = np.flatnonzero(actives & (actions == ACTION_ROTATION))
+        if indices.size:
+            rotations = (self.rotation[indices] + 1) % NB_ROTATIONS[self.forme[indices]]
+            valides = self._valides(indices, rotations=rotations)
+            self.rotation[indices[valides]] = rotations[valides]
+        indices = np.flatnonzero(actives & (actions == ACTION_CHUTE))
+        if indices.size:
+            self.fall_time[indices] = self.fall_speed[indices]
+            # Toutes les pièces descendent ensemble tant qu'au moins une peut encore bouger
+            while indices.size:
+                indices = indices[self._valides(indices, dlig=1)]
+                self.lig[indices] += 1
+
+    def mettre_a_jour(self, dt):
+        """
+        Applique la gravité, le verrouillage et la fin des animations d'effacement.
+
+        :param dt: Temps écoulé en millisecondes.
+        :return: Couple de tableaux de booléens (pièces verrouillées, lignes détectées).
+        """
+        actives = ~self.pause & ~self.game_over
+        en_animation = actives & self.en_animation
+        poses = np.zeros(self.nb_parties, dtype=bool)
+        effacements = np.zeros(self.nb_parties, dtype=bool)
+
+        indices = np.flatnonzero(actives & ~self.en_animation & (self.fall_time >= self.fall_speed))
+        if indices.size:
+            descentes = self._valides(indices, dlig=1)
+            self.lig[indices[descentes]] += 1
+            bloquees = indices[~descentes]
+            self.fall_time[indices] = 0
+            if bloquees.size:
+                self.plateaux.lock_piece(self.forme[bloquees], self.rotation[bloquees],
+                                         self.col[bloquees], self.lig[bloquees], bloquees)
+                self.nb_pieces[bloquees] += 1
+                poses[bloquees] = True
+                lignes = self.plateaux.get_lignes_completes(bloquees)
+                completes = lignes.any(axis=1)
+                animees = bloquees[completes]
+                self.en_animation[animees] = True
+                self.lignes_animation[animees] = lignes[completes]
+                self.timer_animation[animees] = self.duree_animation
+                effacements[animees] = True
+                self._piece_suivante(bloquees[~completes])
+
+        indices = np.flatnonzero(en_animation)
+        if indices.size:
+            self.timer_animation[indices] -= dt
+            terminees = indices[self.timer_animation[indices] <= 0]
+            if terminees.size:
+                nb = self.plateaux.effacer_lignes(self.lignes_animation[terminees], terminees)
+                self.nb_lignes[terminees] += nb
+                self.score[terminees] += nb * 100
+                niveaux = self.score[terminees] // COURBE_CLASSIQUE.points_par_niveau
+                self.fall_speed[terminees] = PERIODES_CHUTE[np.minimum(niveaux, len(PERIODES_CHUTE) - 1)]
+                self.en_animation[terminees] = False
+                self.lignes_animation[terminees] = False
+                self._piece_suivante(terminees)
+        return poses, effacements
+
+    def step(self, actions, dt=DUREE_TICK):
+        """
+        Avance toutes les parties d'un tick logique, comme engine.GameState.step.
+
+        :param actions: Tableau d'entiers, une action par partie.
+        :param dt: Durée du tick en millisecondes.
+        :return: Couple de tableaux de booléens (pièces verrouillées, lignes détectées).
+        """
+        self.fall_time[~self.pause & ~self.en_animation] += dt
+        self.appliquer(actions)
+        return self.mettre_a_jour(dt)
+
+# =============================================================================
+# Caractéristiques de tous les placements d'une pièce (évaluation vectorisée)
+# =============================================================================
+def caracteristiques_placements(plateau, forme):
+    """
+    Calcule en une fois les caractéristiques (voir caracteristiques.NOMS_CARACTERISTIQUES)
+    des plateaux obtenus par chacun des placements d'une forme : les K plateaux candidats
+    sont construits dans un tableau K x lignes x colonnes, leurs lignes complètes effacées,
+    puis chaque caractéristique est réduite sur tout le lot.
+
+    :param plateau: Instance de engine.Plateau (non modifiée).
+    :param forme: Identifiant de la forme.
+    :return: Tuple (placements, lignes effacées, caractéristiques) : la liste de
+             Plateau.placements(forme), un tableau de K entiers et un tableau K x 6.
+    """
+    placements = plateau.placements(forme)
+    nb, hauteur, largeur = len(placements), plateau.hauteur, plateau.largeur
+    cols, rotations, ligs = (np.array(valeurs, dtype=np.int64) for valeurs in zip(*placements))
+
+    # Plateau d'origine répété K fois, puis blocs de chaque pièce (ceux au-dessus de la grille sont ignorés)
+    lignes = np.array(plateau.lignes, dtype=np.uint64)
+    cases = np.broadcast_to((lignes[:, None] >> np.arange(largeur, dtype=np.uint64)) & 1 == 1,
+                            (nb, hauteur, largeur)).copy()
+    indice = LISTE_FORMES.index(forme)
+    xs = cols[:, None] + DX[indice, rotations]
+    ys = ligs[:, None] + DY[indice, rotations]
+    candidats = np.broadcast_to(np.arange(nb)[:, None], xs.shape)
+    visibles = ys >= 0
+    cases[candidats[visibles], ys[visibles], xs[visibles]] = True
+
+    # Effacement : les lignes pleines passent en tête (tri stable) et sont vidées
+    pleines = cases.all(axis=2)
+    nb_lignes = pleines.sum(axis=1)
+    ordre = np.argsort(~pleines, axis=1, kind="stable")
+    cases = np.take_along_axis(cases, ordre[:, :, None], axis=1)
+    cases[np.arange(hauteur)[None, :] < nb_lignes[:, None]] = False
+
+    hauteurs = np.where(cases.any(axis=1), hauteur - cases.argmax(axis=1), 0)
+    hauteur_totale = hauteurs.sum(axis=1)
+    trous = hauteur_totale - cases.sum(axis=(1, 2))
+    bosses = np.abs(np.diff(hauteurs, axis=1)).sum(axis=1)
+    murs = np.ones((nb, hauteur, 1), dtype=bool)
+    etendu = np.concatenate([murs, cases, murs], axis=2)
+    transitions_lignes = (etendu[:, :, 1:] != etendu[:, :, :-1]).sum(axis=(1, 2))
+    transitions_colonnes = ((cases[:, 1:] != cases[:, :-1]).sum(axis=(1, 2))
+                            + (~cases[:, -1]).sum(axis=1))
+    bords = np.full((nb, 1), hauteur)
+    voisines = np.concatenate([bords, hauteurs, bords], axis=1)
+    profondeurs = np.maximum(0, np.minimum(voisines[:, :-2], voisines[:, 2:]) - hauteurs)
+    puits = (profondeurs * (profondeurs + 1) // 2).sum(axis=1)
+    valeurs = np.stack([hauteur_totale, trous, bosses, transitions_lignes, transitions_colonnes, puits], axis=1)
+    return placements, nb_lignes, valeurs
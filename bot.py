@@ -0,0 +1,348 @@
+"""
+Joueur automatique par recherche en faisceau sur la pièce courante et la pièce suivante.
+
+Chaque placement de la pièce courante est posé sur une copie du plateau (instantanés du
+moteur, voir Plateau.instantane) puis évalué ; les meilleurs sont développés avec tous les
+placements de la pièce suivante. Les évaluations sont mémorisées dans une table de
+transposition indexée par un hachage de Zobrist des cases occupées, de taille bornée
+(éviction du moins récemment utilisé) : les plateaux explorés pour la pièce suivante
+sont ainsi déjà connus au coup d'après.
+
+Le joueur s'utilise sans affichage comme politique (politiques.charger_politique("recherche")),
+ou dans le jeu par PiloteAutomatique (mode autoplay de main.main).
+
+Utilisation en ligne de commande (mesure des performances de la recherche) :
+    python bot.py --parties 5 --faisceau 8
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from engine import (Piece, Plateau, FORMES, ACTION_AUCUNE, ACTION_GAUCHE, ACTION_DROITE,
+                    ACTION_ROTATION, ACTION_CHUTE, GameState, NB_COLONNES, NB_LIGNES)
+from politiques import POIDS_HAUTEUR, POIDS_LIGNES, POIDS_TROUS, POIDS_BOSSES
+
+# =============================================================================
+# Configuration de la recherche
+# =============================================================================
+LARGEUR_FAISCEAU = 8       # Placements de la pièce courante développés avec la pièce suivante
+TAILLE_TABLE = 1 << 16     # Nombre maximal d'entrées de la table de transposition
+GRAINE_ZOBRIST = 0x7E7215  # Graine fixe : les hachages sont identiques d'une exécution à l'autre
+PERDU = float("-inf")      # Valeur d'un placement qui fait perdre la partie
+
+# =============================================================================
+# Hachage de Zobrist des cases occupées
+# =============================================================================
+_CLES_PAR_TAILLE = {}
+
+def cles_zobrist(largeur, hauteur):
+    """
+    Retourne les clés aléatoires de 64 bits de chaque case, tirées une seule fois par
+    taille de grille.
+
+    :param largeur: Nombre de colonnes de la grille.
+    :param hauteur: Nombre de lignes de la grille.
+    :return: Liste (par ligne) de listes (par colonne) d'entiers.
+    """
+    cles = _CLES_PAR_TAILLE.get((largeur, hauteur))
+    if cles is None:
+        rng = random.Random(GRAINE_ZOBRIST)
+        cles = [[rng.getrandbits(64) for _ in range(largeur)] for _ in range(hauteur)]
+        _CLES_PAR_TAILLE[(largeur, hauteur)] = cles
+    return cles
+
+def hacher(plateau):
+    """
+    Calcule le hachage de Zobrist d'un plateau : le OU exclusif des clés de ses cases
+    occupées (les couleurs sont ignorées).
+
+    :param plateau: Instance de engine.Plateau.
+    :return: Entier de 64 bits.
+    """
+    cles = cles_zobrist(plateau.largeur, plateau.hauteur)
+    h = 0
+    for lig, masque in enumerate(plateau.lignes):
+        cles_ligne = cles[lig]
+        while masque:
+            bit = masque & -masque
+            h ^= cles_ligne[bit.bit_length() - 1]
+            masque ^= bit
+    return h
+
+# =============================================================================
+# Évaluation d'un plateau
+# =============================================================================
+def evaluer_plateau(plateau):
+    """
+    Évalue un plateau avec les poids de politiques.evaluer_placement : hauteur totale,
+    trous (cases vides sous le sommet de leur colonne) et bosses. Les lignes effacées
+    sont comptées séparément par la recherche.
+
+    :param plateau: Instance de engine.Plateau.
+    :return: Score du plateau (plus il est élevé, meilleur est le plateau).
+    """
+    hauteurs = plateau.hauteurs
+    hauteur_totale = sum(hauteurs)
+    nb_trous = hauteur_totale - sum(plateau.remplies)
+    bosses = sum(abs(a - b) for a, b in zip(hauteurs, hauteurs[1:]))
+    return POIDS_HAUTEUR * hauteur_totale + POIDS_TROUS * nb_trous + POIDS_BOSSES * bosses
+
+# =============================================================================
+# Classe RechercheFaisceau (choix d'un placement par recherche)
+# =============================================================================
+class RechercheFaisceau:
+    def __init__(self, largeur_faisceau=LARGEUR_FAISCEAU, taille_table=TAILLE_TABLE):
+        """
+        Initialise la recherche et ses statistiques.
+
+        :param largeur_faisceau: Nombre de placements de la pièce courante développés avec
+                                 la pièce suivante (les autres ne sont évalués qu'une fois posés).
+        :param taille_table: Nombre maximal d'entrées de la table de transposition.
+        """
+        self.largeur_faisceau = largeur_faisceau
+        self.taille_table = taille_table
+        # (hachage,) -> évaluation du plateau ; (hachage, forme) -> meilleure valeur avec cette pièce
+        self.table = OrderedDict()
+        self._plateau = None       # Plateau de travail, copie de celui de la partie
+        # Statistiques cumulées
+        self.noeuds = 0            # Plateaux produits par la pose d'une pièce
+        self.consultations = 0     # Recherches dans la table de transposition
+        self.succes = 0            # Recherches ayant trouvé une entrée
+        self.duree = 0.0           # Temps total passé dans choisir() (secondes)
+
+    @property
+    def noeuds_par_seconde(self):
+        """Nombre moyen de nœuds produits par seconde de recherche."""
+        return self.noeuds / self.duree if self.duree else 0.0
+
+    @property
+    def taux_succes(self):
+        """Proportion des consultations de la table ayant trouvé une entrée."""
+        return self.succes / self.consultations if self.consultations else 0.0
+
+    def _lire(self, cle):
+        """Retourne la valeur mémorisée pour une clé (ou None) et la marque comme récente."""
+        self.consultations += 1
+        valeur = self.table.get(cle)
+        if valeur is not None:
+            self.succes += 1
+            self.table.move_to_end(cle)
+        return valeur
+
+    def _ecrire(self, cle, valeur):
+        """Mémorise une valeur ; au-delà de taille_table, l'entrée la moins récente est évincée."""
+        self.table[cle] = valeur
+        if len(self.table) > self.taille_table:
+            self.table.popitem(last=False)
+
+    def _poser(self, plateau, h, forme, col, rotation, lig):
+        """
+        Pose une forme sur le plateau de travail et efface les lignes complètes.
+
+        :return: Tuple (hachage du nouveau plateau, nombre de lignes effacées).
+        """
+        self.noeuds += 1
+        lignes_completes = plateau.lock_piece(Piece(forme, col, lig, rotation))
+        nb_lignes = len(lignes_completes)
+        plateau.effacer_lignes(lignes_completes)
+        if nb_lignes:
+            return hacher(plateau), nb_lignes
+        # Sans effacement, seules les cases de la pièce ont changé
+        cles = cles_zobrist(plateau.largeur, plateau.hauteur)
+        for dx, dy in FORMES[forme][rotation]:
+            if lig + dy >= 0:
+                h ^= cles[lig + dy][col + dx]
+        return h, 0
+
+    def _evaluer(self, plateau, h):
+        """Évaluation du plateau de travail, lue dans la table si elle y est."""
+        cle = (h,)
+        valeur = self._lire(cle)
+        if valeur is None:
+            valeur = evaluer_plateau(plateau)
+            self._ecrire(cle, valeur)
+        return valeur
+
+    def _enfants(self, plateau, h, forme):
+        """
+        Pose la forme à chacun de ses placements et évalue les plateaux obtenus.
+
+        :return: Liste de tuples (valeur, col, rotation, lig, lignes effacées), les placements
+                 qui débordent du haut de la grille valant PERDU.
+        """
+        enfants = []
+        instantane = plateau.instantane()
+        for col, rotation, lig in plateau.placements(forme):
+            if lig + min(dy for _, dy in FORMES[forme][rotation]) < 0:
+                enfants.append((PERDU, col, rotation, lig, 0))
+                continue
+            h_enfant, nb_lignes = self._poser(plateau, h, forme, col, rotation, lig)
+            valeur = POIDS_LIGNES * nb_lignes + self._evaluer(plateau, h_enfant)
+            enfants.append((valeur, col, rotation, lig, nb_lignes))
+            plateau.restaurer(instantane)
+        return enfants
+
+    def _meilleure_valeur(self, plateau, h, forme):
+        """Meilleure valeur atteignable en posant la forme sur le plateau de travail (mémorisée)."""
+        cle = (h, forme)
+        valeur = self._lire(cle)
+        if valeur is None:
+            valeur = max(enfant[0] for enfant in self._enfants(plateau, h, forme))
+            self._ecrire(cle, valeur)
+        return valeur
+
+    def choisir(self, etat):
+        """
+        Choisit le placement de la pièce courante.
+
+        :param etat: Instance de engine.GameState (non modifiée).
+        :return: Tuple (col, rotation), parmi les placements de Plateau.placements().
+        """
+        debut = time.perf_counter()
+        source = etat.plateau
+        plateau = self._plateau
+        if plateau is None or (plateau.largeur, plateau.hauteur) != (source.largeur, source.hauteur):
+            plateau = self._plateau = Plateau(source.largeur, source.hauteur)
+        plateau.restaurer(source.instantane())
+        h = hacher(plateau)
+        forme, forme_suivante = etat.piece_actuelle.forme, etat.piece_suivante.forme
+        # Coordonnées d'apparition de la pièce suivante (partie perdue si elle y est bloquée)
+        col_apparition = source.largeur // 2 - 2
+
+        enfants = self._enfants(plateau, h, forme)
+        enfants.sort(key=lambda enfant: enfant[0], reverse=True)
+        meilleur, meilleure_valeur = enfants[0], PERDU
+        instantane = plateau.instantane()
+        for enfant in enfants[:self.largeur_faisceau]:
+            valeur, col, rotation, lig, nb_lignes = enfant
+            if valeur == PERDU:
+                break
+            h_enfant, _ = self._poser(plateau, h, forme, col, rotation, lig)
+            if plateau.collision(forme_suivante, 0, col_apparition, 0):
+                valeur = PERDU
+            else:
+                valeur = POIDS_LIGNES * nb_lignes + self._meilleure_valeur(plateau, h_enfant, forme_suivante)
+            plateau.restaurer(instantane)
+            if valeur > meilleure_valeur:
+                meilleur, meilleure_valeur = enfant, valeur
+        self.duree += time.perf_counter() - debut
+        return meilleur[1], meilleur[2]
+
+    __call__ = choisir
+
+def politique_recherche(graine=None):
+    """
+    Fabrique une politique qui choisit ses placements par RechercheFaisceau.
+
+    :param graine: Ignorée (politique déterministe), présente pour l'interface commune.
+    :return: Instance de RechercheFaisceau (appelable : etat -> (col, rotation)).
+    """
+    return RechercheFaisceau()
+
+# =============================================================================
+# Classe PiloteAutomatique (conduite de la pièce comme un joueur)
+# =============================================================================
+class PiloteAutomatique:
+    def __init__(self, recherche=None):
+        """
+        Pilote la pièce courante vers le placement choisi par la recherche, une action
+        par tick, avec les mêmes actions que le clavier (enregistrables dans un replay).
+
+        :param recherche: Instance de RechercheFaisceau (nouvelle instance par défaut).
+        """
+        self.recherche = recherche or RechercheFaisceau()
+        self._piece = None         # Pièce pour laquelle la cible a été choisie
+        self._cible = None         # (col, rotation) visés
+
+    def action(self, etat):
+        """
+        Retourne la prochaine action à appliquer à la partie. Si la pièce est bloquée avant
+        d'atteindre sa cible, elle est lâchée là où elle se trouve.
+
+        :param etat: Instance de engine.GameState.
+        :return: Une des constantes ACTION_*.
+        """
+        if etat.game_over or etat.pause or etat.en_animation:
+            return ACTION_AUCUNE
+        piece = etat.piece_actuelle
+        if piece is not self._piece:
+            self._piece = piece
+            self._cible = self.recherche.choisir(etat)
+        col, rotation = self._cible
+        plateau = etat.plateau
+        if piece.rotation != rotation:
+            suivante = (piece.rotation + 1) % len(FORMES[piece.forme])
+            if not plateau.collision(piece.forme, suivante, piece.col, piece.lig):
+                return ACTION_ROTATION
+        elif piece.col != col:
+            dcol = 1 if col > piece.col else -1
+            if plateau.position_valide(piece, dcol=dcol):
+                return ACTION_DROITE if dcol > 0 else ACTION_GAUCHE
+        return ACTION_CHUTE
+
+# =============================================================================
+# Mesure des performances sans affichage
+# =============================================================================
+def mesurer(nb_parties=3, graine=0, largeur_faisceau=LARGEUR_FAISCEAU, taille_table=TAILLE_TABLE,
+            max_pieces=500, largeur=NB_COLONNES, hauteur=NB_LIGNES):
+    """
+    Joue des parties placement par placement avec une même recherche et retourne ses statistiques.
+
+    :param nb_parties: Nombre de parties (graines graine, graine + 1, ...).
+    :param graine: Graine de la première partie.
+    :param largeur_faisceau: Largeur du faisceau de la recherche.
+    :param taille_table: Taille maximale de la table de transposition.
+    :param max_pieces: Nombre maximal de pièces par partie.
+    :param largeur: Nombre de colonnes de la grille.
+    :param hauteur: Nombre de lignes de la grille.
+    :return: Dictionnaire des statistiques (résultats par partie, nœuds, nœuds/s, succès de la table).
+    """
+    recherche = RechercheFaisceau(largeur_faisceau, taille_table)
+    resultats = []
+    for g in range(graine, graine + nb_parties):
+        etat = GameState(largeur, hauteur, graine=g)
+        while not etat.game_over and etat.nb_pieces < max_pieces:
+            etat.jouer_placement(*recherche.choisir(etat))
+        resultats.append({"graine": g, "score": etat.score, "pieces": etat.nb_pieces,
+                          "game_over": etat.game_over})
+    return {
+        "resultats": resultats,
+        "noeuds": recherche.noeuds,
+        "duree": recherche.duree,
+        "noeuds_par_seconde": recherche.noeuds_par_seconde,
+        "taux_succes": recherche.taux_succes,
+        "entrees_table": len(recherche.table),
+    }
+
+def main(argv=None):
+    """
+    Lit les options de la ligne de commande, joue les parties et affiche les performances.
+
+    :param argv: Arguments de la ligne de commande (sys.argv[1:] par défaut).
+    """
+    parser = argparse.ArgumentParser(description="Mesure des performances du joueur automatique.")
+    parser.add_argument("--parties", type=int, default=3, help="nombre de parties à jouer")
+    parser.add_argument("--graine", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--faisceau", type=int, default=LARGEUR_FAISCEAU, help="largeur du faisceau")
+    parser.add_argument("--table", type=int, default=TAILLE_TABLE,
+                        help="nombre maximal d'entrées de la table de transposition")
+    parser.add_argument("--max-pieces", type=int, default=500, help="nombre maximal de pièces par partie")
+    parser.add_argument("--largeur", type=int, default=NB_COLONNES, help="nombre de colonnes de la grille")
+    parser.add_argument("--hauteur", type=int, default=NB_LIGNES, help="nombre de lignes de la grille")
+    args = parser.parse_args(argv)
+
+    stats = mesurer(args.parties, args.graine, args.faisceau, args.table, args.max_pieces,
+                    args.largeur, args.hauteur)
+    for resultat in stats["resultats"]:
+        fin = "game over" if resultat["game_over"] else "arrêt"
+        print(f"Graine {resultat['graine']} : score {resultat['score']}, "
+              f"{resultat['pieces']} pièces ({fin})")
+    print(f"{stats['noeuds']} nœuds en {stats['duree']:.2f} s de recherche "
+          f"({stats['noeuds_par_seconde']:.0f} nœuds/s), "
+          f"table : {stats['taux_succes']:.1%} de succès, {stats['entrees_table']} entrées")
+
+if __name__ == "__main__":
+    sys.exit(main())
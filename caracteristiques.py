@@ -0,0 +1,93 @@
+"""
+Caractéristiques d'un plateau pour l'évaluation heuristique des placements.
+
+Les hauteurs et les remplissages de colonnes sont tenus à jour par engine.Plateau à chaque
+pose et à chaque effacement : hauteur totale, trous, bosses et puits s'en déduisent en
+O(largeur), sans parcourir la grille. Les transitions se comptent sur les masques de
+lignes par quelques opérations binaires par ligne.
+
+La variante vectorisée, qui évalue d'un coup tous les placements d'une pièce, est
+batch.caracteristiques_placements (NumPy).
+"""
+
+from engine import Piece
+
+# =============================================================================
+# Liste des caractéristiques (ordre des tuples retournés)
+# =============================================================================
+NOMS_CARACTERISTIQUES = (
+    "hauteur_totale",          # Somme des hauteurs de colonnes
+    "trous",                   # Cases vides sous le sommet de leur colonne
+    "bosses",                  # Somme des écarts de hauteur entre colonnes voisines
+    "transitions_lignes",      # Passages vide/occupé le long des lignes (bords comptés occupés)
+    "transitions_colonnes",    # Passages vide/occupé le long des colonnes (fond compté occupé)
+    "puits",                   # Somme cumulée des profondeurs de puits (1 + 2 + ... + profondeur)
+)
+
+# =============================================================================
+# Extraction des caractéristiques
+# =============================================================================
+def trous_par_colonne(plateau):
+    """
+    Retourne le nombre de trous de chaque colonne, en O(largeur).
+
+    :param plateau: Instance de engine.Plateau.
+    :return: Liste d'entiers.
+    """
+    return [hauteur - nb for hauteur, nb in zip(plateau.hauteurs, plateau.remplies)]
+
+def caracteristiques(plateau):
+    """
+    Calcule les caractéristiques du plateau (voir NOMS_CARACTERISTIQUES).
+
+    :param plateau: Instance de engine.Plateau.
+    :return: Tuple d'entiers, dans l'ordre de NOMS_CARACTERISTIQUES.
+    """
+    hauteurs = plateau.hauteurs
+    hauteur_totale = sum(hauteurs)
+    trous = hauteur_totale - sum(plateau.remplies)
+    bosses = sum(abs(a - b) for a, b in zip(hauteurs, hauteurs[1:]))
+
+    # Transitions le long des lignes : les bords gauche et droit sont des cases occupées
+    largeur = plateau.largeur
+    bords = 1 | 1 << (largeur + 1)
+    paires = (1 << (largeur + 1)) - 1
+    transitions_lignes = 0
+    for masque in plateau.lignes:
+        etendu = masque << 1 | bords
+        transitions_lignes += ((etendu ^ etendu >> 1) & paires).bit_count()
+
+    # Transitions le long des colonnes : comparaison de chaque ligne avec la suivante
+    lignes = plateau.lignes
+    transitions_colonnes = sum((haut ^ bas).bit_count() for haut, bas in zip(lignes, lignes[1:]))
+    transitions_colonnes += (plateau.ligne_pleine & ~lignes[-1]).bit_count()
+
+    # Puits : colonnes plus basses que leurs deux voisines (les bords sont infiniment hauts)
+    puits = 0
+    bord = plateau.hauteur
+    for col, hauteur in enumerate(hauteurs):
+        gauche = hauteurs[col - 1] if col > 0 else bord
+        droite = hauteurs[col + 1] if col + 1 < largeur else bord
+        profondeur = min(gauche, droite) - hauteur
+        if profondeur > 0:
+            puits += profondeur * (profondeur + 1) // 2
+    return hauteur_totale, trous, bosses, transitions_lignes, transitions_colonnes, puits
+
+def caracteristiques_placement(plateau, forme, col, rotation, lig):
+    """
+    Calcule les caractéristiques du plateau obtenu en posant une forme (lignes complètes
+    effacées), puis remet le plateau dans son état d'origine.
+
+    :param plateau: Instance de engine.Plateau (même contenu au retour ; sa version change).
+    :param forme: Identifiant de la forme.
+    :param col: Colonne du coin supérieur gauche de la pièce posée.
+    :param rotation: Indice de rotation de la pièce.
+    :param lig: Ligne du coin supérieur gauche de la pièce posée (voir Plateau.placements).
+    :return: Tuple (lignes effacées, caractéristiques).
+    """
+    instantane = plateau.instantane()
+    lignes_completes = plateau.lock_piece(Piece(forme, col, lig, rotation))
+    plateau.effacer_lignes(lignes_completes)
+    valeurs = caracteristiques(plateau)
+    plateau.restaurer(instantane)
+    return len(lignes_completes), valeurs
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test de charge du serveur de versus.
+
+Lance un serveur (serveur_versus.py) dans un processus séparé, sauf si --hote est donné,
+puis le fait jouer par des clients automatiques sans affichage, tous dans une même boucle
+asyncio : chaque client reflète sa partie à partir des messages reçus (versus.appliquer_vue)
+et la joue avec bot.PiloteAutomatique, une action à la fois (la suivante part quand le
+serveur a acquitté la précédente). Un client dont le match est terminé se reconnecte pour
+un nouveau match jusqu'à la fin du test.
+
+Exemple : python charge_versus.py --matchs 200 --duree 30
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+from bot import PiloteAutomatique
+from engine import ACTION_AUCUNE
+from politiques import POLITIQUES, charger_politique
+from versus import PORT_DEFAUT, appliquer_vue, creer_miroir, decoder, encoder
+
+# =============================================================================
+# Client automatique
+# =============================================================================
+class StatistiquesClients:
+    """Statistiques cumulées de tous les clients du test."""
+
+    def __init__(self):
+        self.matchs = 0            # Matchs terminés vus par les clients (deux par match)
+        self.messages = 0          # Messages reçus
+        self.actions = 0           # Actions acquittées
+        self.latences = []         # Délais envoi -> acquittement des actions (secondes)
+        self.erreurs = 0           # Connexions refusées ou coupées avant la fin d'un match
+
+async def jouer_match(hote, port, politique, statistiques, graine=None):
+    """
+    Connecte un client automatique, joue un match jusqu'à sa fin et se déconnecte.
+
+    :param hote: Adresse du serveur.
+    :param port: Port du serveur.
+    :param politique: Nom de la politique de placement du pilote (politiques.POLITIQUES).
+    :param statistiques: Instance de StatistiquesClients mise à jour.
+    :param graine: Graine de la politique.
+    """
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    pilote = PiloteAutomatique(SimpleNamespace(choisir=charger_politique(politique)(graine)))
+    etat = None
+    joueur = None
+    envoyees = 0
+    envoi = None               # Instant d'envoi de l'action en vol (None : aucune)
+    try:
+        while True:
+            ligne = await lecteur.readline()
+            if not ligne:
+                statistiques.erreurs += 1
+                return
+            message = decoder(ligne)
+            statistiques.messages += 1
+            if message["type"] == "debut":
+                etat = creer_miroir(message)
+                joueur = message["joueur"]
+            elif message["type"] == "fin":
+                statistiques.matchs += 1
+                return
+            elif message["type"] == "etat":
+                appliquer_vue(etat, message["joueurs"][joueur])
+                # Une seule action en vol : la suivante est choisie sur un état à jour
+                if etat.actions_traitees == envoyees:
+                    if envoi is not None:
+                        statistiques.latences.append(time.perf_counter() - envoi)
+                        statistiques.actions += 1
+                        envoi = None
+                    action = pilote.action(etat)
+                    if action != ACTION_AUCUNE:
+                        envoyees += 1
+                        envoi = time.perf_counter()
+                        ecrivain.write(encoder({"type": "action", "action": action}))
+    finally:
+        ecrivain.close()
+
+async def client(hote, port, politique, statistiques, fin, graine):
+    """Enchaîne les matchs d'un client automatique jusqu'à l'instant `fin` (time.monotonic)."""
+    while time.monotonic() < fin:
+        try:
+            await asyncio.wait_for(jouer_match(hote, port, politique, statistiques, graine),
+                                   fin - time.monotonic())
+        except asyncio.TimeoutError:
+            return
+        except OSError:
+            statistiques.erreurs += 1
+            await asyncio.sleep(0.1)
+
+async def charger(hote, port, nb_matchs, duree, politique="heuristique"):
+    """
+    Fait jouer 2 * nb_matchs clients automatiques pendant `duree` secondes.
+
+    :return: Instance de StatistiquesClients.
+    """
+    statistiques = StatistiquesClients()
+    fin = time.monotonic() + duree
+    await asyncio.gather(*(client(hote, port, politique, statistiques, fin, graine)
+                           for graine in range(2 * nb_matchs)))
+    return statistiques
+
+# =============================================================================
+# Point d'entrée en ligne de commande
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du serveur de versus.")
+    parser.add_argument("--matchs", type=int, default=100, help="nombre de matchs simultanés")
+    parser.add_argument("--duree", type=float, default=20.0, help="durée du test en secondes")
+    parser.add_argument("--politique", default="heuristique", choices=sorted(POLITIQUES),
+                        help="politique de placement des clients")
+    parser.add_argument("--hote", default=None, help="serveur existant (sinon un serveur local est lancé)")
+    parser.add_argument("--port", type=int, default=PORT_DEFAUT, help="port du serveur")
+    args = parser.parse_args(argv)
+
+    serveur = None
+    hote = args.hote
+    if hote is None:
+        # Le serveur tourne dans son propre processus et affiche ses statistiques en s'arrêtant
+        hote = "127.0.0.1"
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serveur_versus.py")
+        # La sortie d'erreur n'est pas capturée : une erreur de démarrage reste visible
+        serveur = subprocess.Popen([sys.executable, script, "--port", str(args.port),
+                                    "--duree", str(args.duree + 2)], stdout=subprocess.PIPE, text=True)
+        annonce = serveur.stdout.readline().strip()
+        if not annonce or serveur.poll() is not None:
+            # Port déjà pris par exemple : le test mesurerait un autre serveur que le sien
+            serveur.kill()
+            print(f"Erreur: le serveur de versus n'a pas démarré sur le port {args.port} "
+                  f"(code de sortie {serveur.wait()}).", file=sys.stderr)
+            return 1
+        print(annonce)
+
+    debut = time.perf_counter()
+    statistiques = asyncio.run(charger(hote, args.port, args.matchs, args.duree, args.politique))
+    duree = time.perf_counter() - debut
+
+    latences = sorted(statistiques.latences)
+    print(f"{2 * args.matchs} clients, {duree:.1f} s")
+    print(f"Matchs terminés : {statistiques.matchs // 2}")
+    print(f"Messages reçus : {statistiques.messages} ({statistiques.messages / duree:.0f}/s)")
+    print(f"Actions acquittées : {statistiques.actions} ({statistiques.actions / duree:.0f}/s)")
+    if latences:
+        print(f"Latence des actions : médiane {1000 * latences[len(latences) // 2]:.1f} ms, "
+              f"99e centile {1000 * latences[len(latences) * 99 // 100]:.1f} ms")
+    print(f"Erreurs de connexion : {statistiques.erreurs}")
+    if serveur is not None:
+        print("Serveur :")
+        print(serveur.communicate()[0].rstrip())
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
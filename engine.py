@@ -0,0 +1,1249 @@
+"""
+Moteur de jeu Tetris sans affichage.
+Ce module contient toutes les règles du jeu (plateau, pièces, gravité, verrouillage,
+effacement des lignes, score) et n'importe pas pygame : il peut être utilisé par la
+boucle graphique de main.py comme par des simulations sans fenêtre.
+"""
+
+import random
+from bisect import bisect_left
+from fractions import Fraction
+
+# =============================================================================
+# Dimensions par défaut de la grille de jeu (en cases)
+# =============================================================================
+NB_COLONNES = 10           # Nombre de colonnes de la grille
+NB_LIGNES = 20             # Nombre de lignes de la grille
+TAILLE_MIN = 4             # Nombre minimal de colonnes et de lignes d'une partie (largeur d'une pièce I)
+
+# =============================================================================
+# Définition des couleurs associées à chaque type de pièce
+# =============================================================================
+CARTE_COULEURS = {
+    "I": (0, 255, 255),    # Cyan
+    "J": (0, 0, 255),      # Bleu
+    "L": (255, 165, 0),    # Orange
+    "O": (255, 255, 0),    # Jaune
+    "S": (0, 255, 0),      # Vert
+    "T": (128, 0, 128),    # Violet
+    "Z": (255, 0, 0)       # Rouge
+}
+
+# =============================================================================
+# Définition des formes et de leurs rotations
+#
+# Chaque pièce est définie par une liste de rotations.
+# Chaque rotation est une liste de tuples (dx, dy) exprimés en nombre de cases.
+# =============================================================================
+FORMES = {
+    "I": [
+        [(0, 1), (1, 1), (2, 1), (3, 1)],
+        [(2, 0), (2, 1), (2, 2), (2, 3)]
+    ],
+    "J": [
+        [(0, 0), (0, 1), (1, 1), (2, 1)],
+        [(1, 0), (2, 0), (1, 1), (1, 2)],
+        [(0, 1), (1, 1), (2, 1), (2, 2)],
+        [(1, 0), (1, 1), (0, 2), (1, 2)]
+    ],
+    "L": [
+        [(2, 0), (0, 1), (1, 1), (2, 1)],
+        [(1, 0), (1, 1), (1, 2), (2, 2)],
+        [(0, 1), (1, 1), (2, 1), (0, 2)],
+        [(0, 0), (1, 0), (1, 1), (1, 2)]
+    ],
+    "O": [
+        [(0, 0), (1, 0), (0, 1), (1, 1)]
+    ],
+    "S": [
+        [(1, 0), (2, 0), (0, 1), (1, 1)],
+        [(1, 0), (1, 1), (2, 1), (2, 2)]
+    ],
+    "T": [
+        [(1, 0), (0, 1), (1, 1), (2, 1)],
+        [(1, 0), (1, 1), (2, 1), (1, 2)],
+        [(0, 1), (1, 1), (2, 1), (1, 2)],
+        [(1, 0), (0, 1), (1, 1), (1, 2)]
+    ],
+    "Z": [
+        [(0, 0), (1, 0), (1, 1), (2, 1)],
+        [(2, 0), (1, 1), (2, 1), (1, 2)]
+    ]
+}
+
+# =============================================================================
+# Configuration du rythme de chute et de l'animation d'effacement
+# =============================================================================
+VITESSE_CHUTE_INIT = 500      # Temps en millisecondes avant que la pièce ne descende d'une case
+VITESSE_CHUTE_MIN = 100       # Temps de descente minimal de la courbe classique (millisecondes)
+ACCELERATION_NIVEAU = 20      # Réduction du temps de descente à chaque niveau (courbe classique)
+POINTS_PAR_NIVEAU = 500       # Points de score nécessaires pour passer un niveau (courbe classique)
+DUREE_ANIMATION_LIGNE = 500   # Durée de l'animation (flash) lors de l'effacement d'une ligne
+
+# =============================================================================
+# Classe Piece (modèle d'une pièce en coordonnées de grille)
+#
+# Toute la logique de jeu manipule des colonnes et des lignes entières ; la
+# conversion en pixels n'a lieu que dans la couche de dessin (classe Tetris).
+# =============================================================================
+class Piece:
+    __slots__ = ("forme", "rotation", "col", "lig")
+
+    def __init__(self, forme, col=0, lig=0, rotation=0):
+        """
+        Initialise une pièce positionnée sur la grille.
+
+        :param forme: Identifiant de la forme ("I", "J", "L", "O", "S", "T", "Z").
+        :param col: Colonne du coin supérieur gauche de la pièce.
+        :param lig: Ligne du coin supérieur gauche de la pièce.
+        :param rotation: Indice de rotation dans FORMES[forme].
+        """
+        self.forme = forme
+        self.rotation = rotation
+        self.col = col
+        self.lig = lig
+
+    @property
+    def couleur(self):
+        """Couleur RGB associée à la forme de la pièce."""
+        return CARTE_COULEURS[self.forme]
+
+    def get_cases(self):
+        """
+        Retourne la liste des positions (col, lig) des cases occupées par la pièce.
+        """
+        return [(self.col + dx, self.lig + dy) for dx, dy in FORMES[self.forme][self.rotation]]
+
+    def descendre(self, nb_lignes=1):
+        """
+        Déplace la pièce vers le bas.
+
+        :param nb_lignes: Nombre de lignes de descente.
+        """
+        self.lig += nb_lignes
+
+    def decaler(self, dcol):
+        """
+        Déplace la pièce horizontalement.
+
+        :param dcol: Décalage en colonnes (positif vers la droite, négatif vers la gauche).
+        """
+        self.col += dcol
+
+    def tourner(self):
+        """
+        Effectue une rotation de la pièce dans le sens horaire.
+        Retourne la rotation précédente pour permettre une annulation si nécessaire.
+        """
+        ancienne_rotation = self.rotation
+        self.rotation = (self.rotation + 1) % len(FORMES[self.forme])
+        return ancienne_rotation
+
+    def copie(self):
+        """Retourne une copie indépendante de la pièce."""
+        return Piece(self.forme, self.col, self.lig, self.rotation)
+
+    def __repr__(self):
+        return f"Piece({self.forme!r}, col={self.col}, lig={self.lig}, rotation={self.rotation})"
+
+# =============================================================================
+# Palette des couleurs du plateau
+#
+# Le plateau ne stocke pas directement les tuples RGB : chaque case contient un
+# indice compact (0 = case vide) vers cette palette. Les couleurs des pièces et des
+# lignes de déchets sont enregistrées d'office (mêmes indices dans tous les processus),
+# les autres couleurs sont ajoutées à la première utilisation.
+# =============================================================================
+COULEUR_DECHETS = (128, 128, 128)   # Lignes de déchets reçues de l'adversaire (versus)
+PALETTE = [None] + list(CARTE_COULEURS.values()) + [COULEUR_DECHETS]
+INDICES_COULEURS = {couleur: indice for indice, couleur in enumerate(PALETTE) if couleur is not None}
+
+def indice_couleur(couleur):
+    """
+    Retourne l'indice de palette associé à une couleur, en l'enregistrant si nécessaire.
+
+    :param couleur: Tuple RGB, ou None pour une case vide.
+    :return: Indice entre 0 et 255 (0 pour une case vide).
+    """
+    if couleur is None:
+        return 0
+    indice = INDICES_COULEURS.get(couleur)
+    if indice is None:
+        indice = len(PALETTE)
+        if indice > 255:
+            raise ValueError("La palette du plateau est limitée à 255 couleurs.")
+        PALETTE.append(couleur)
+        INDICES_COULEURS[couleur] = indice
+    return indice
+
+# =============================================================================
+# Profils inférieurs des formes
+#
+# Pour chaque forme et rotation, on précalcule les couples (dx, dy_bas) : pour
+# chaque colonne relative dx occupée par la pièce, la ligne relative de son bloc
+# le plus bas. Combinés aux hauteurs de colonnes du plateau, ils donnent la ligne
+# d'atterrissage d'une pièce sans la faire descendre ligne par ligne.
+# =============================================================================
+PROFILS = {
+    forme: [
+        tuple(sorted({dx: max(dy2 for dx2, dy2 in blocs if dx2 == dx) for dx, _ in blocs}.items()))
+        for blocs in rotations
+    ]
+    for forme, rotations in FORMES.items()
+}
+
+# =============================================================================
+# Rotations distinctes des formes
+#
+# Deux rotations dont les blocs coïncident à une translation près donnent les mêmes
+# placements ; seule la première est conservée pour l'énumération des placements.
+# =============================================================================
+def _forme_normalisee(blocs):
+    """Retourne l'ensemble des blocs ramenés au coin supérieur gauche."""
+    min_dx = min(dx for dx, _ in blocs)
+    min_dy = min(dy for _, dy in blocs)
+    return frozenset((dx - min_dx, dy - min_dy) for dx, dy in blocs)
+
+ROTATIONS_DISTINCTES = {}
+for _forme, _rotations in FORMES.items():
+    _vues = set()
+    ROTATIONS_DISTINCTES[_forme] = []
+    for _rotation, _blocs in enumerate(_rotations):
+        _normalisee = _forme_normalisee(_blocs)
+        if _normalisee not in _vues:
+            _vues.add(_normalisee)
+            ROTATIONS_DISTINCTES[_forme].append(_rotation)
+del _forme, _rotations, _vues, _rotation, _blocs, _normalisee
+
+# =============================================================================
+# Masques de collision précalculés
+#
+# Pour chaque forme, rotation et colonne d'ancrage, on précalcule les couples
+# (dy, masque) : le masque de bits occupé par la pièce sur sa ligne relative dy.
+# Les couples sont triés du bas vers le haut de la pièce, ce qui détecte plus tôt
+# les collisions lors d'une descente. Une colonne absente de la table signifie que
+# la pièce sort de la grille.
+# =============================================================================
+_MASQUES_PAR_LARGEUR = {}
+
+def masques_collision(largeur):
+    """
+    Retourne (en la construisant au premier appel) la table des masques de collision
+    pour une grille de la largeur donnée.
+
+    :param largeur: Nombre de colonnes de la grille.
+    :return: Dictionnaire forme -> liste (par rotation) de couples (col_min, masques_par_colonne),
+             où masques_par_colonne[col - col_min] est un tuple de couples (dy, masque).
+    """
+    table = _MASQUES_PAR_LARGEUR.get(largeur)
+    if table is None:
+        table = {}
+        for forme, rotations in FORMES.items():
+            table[forme] = []
+            for blocs in rotations:
+                col_min = -min(dx for dx, _ in blocs)
+                col_max = largeur - 1 - max(dx for dx, _ in blocs)
+                masques_par_colonne = []
+                for col in range(col_min, col_max + 1):
+                    rangees = {}
+                    for dx, dy in blocs:
+                        rangees[dy] = rangees.get(dy, 0) | 1 << (col + dx)
+                    masques_par_colonne.append(tuple(sorted(rangees.items(), reverse=True)))
+                table[forme].append((col_min, masques_par_colonne))
+        _MASQUES_PAR_LARGEUR[largeur] = table
+    return table
+
+# =============================================================================
+# Vues de compatibilité sur la grille
+#
+# `PlateauDeJeu.grille` reste indexable comme une liste de listes de couleurs
+# (grille[lig][col]), mais chaque lecture ou écriture passe par les masques de bits.
+# =============================================================================
+class _VueLigne:
+    """Vue d'une ligne du plateau, indexable par colonne."""
+
+    __slots__ = ("_plateau", "_lig")
+
+    def __init__(self, plateau, lig):
+        self._plateau = plateau
+        self._lig = lig
+
+    def __len__(self):
+        return self._plateau.largeur
+
+    def __getitem__(self, col):
+        return PALETTE[self._plateau.couleurs[self._lig][col]]
+
+    def __setitem__(self, col, couleur):
+        if col < 0:
+            col += self._plateau.largeur
+        self._plateau.set_case(self._lig, col, couleur)
+
+    def __iter__(self):
+        for indice in self._plateau.couleurs[self._lig]:
+            yield PALETTE[indice]
+
+    def __eq__(self, autre):
+        return list(self) == list(autre)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _VueGrille:
+    """Vue de la grille complète, indexable par ligne."""
+
+    __slots__ = ("_plateau",)
+
+    def __init__(self, plateau):
+        self._plateau = plateau
+
+    def __len__(self):
+        return self._plateau.hauteur
+
+    def __getitem__(self, lig):
+        if lig < 0:
+            lig += self._plateau.hauteur
+        if not 0 <= lig < self._plateau.hauteur:
+            raise IndexError("indice de ligne hors de la grille")
+        return _VueLigne(self._plateau, lig)
+
+    def __iter__(self):
+        for lig in range(self._plateau.hauteur):
+            yield _VueLigne(self._plateau, lig)
+
+    def __repr__(self):
+        return repr([list(ligne) for ligne in self])
+
+# =============================================================================
+# Classe Plateau (logique de la grille de jeu, sans affichage)
+# =============================================================================
+class Plateau:
+    def __init__(self, largeur, hauteur):
+        """
+        Initialise le plateau de jeu avec une grille vide.
+
+        Le plateau est représenté par un bitboard : un entier par ligne dont le bit `col`
+        vaut 1 si la case est occupée, et un tableau parallèle d'indices de couleur.
+        Une ligne est complète lorsque son masque vaut `ligne_pleine`.
+        Les rangées de couleurs sont immuables (bytes) : une modification remplace la rangée,
+        ce qui permet aux instantanés de partager les rangées inchangées (copie sur écriture).
+
+        :param largeur: Nombre de colonnes de la grille.
+        :param hauteur: Nombre de lignes de la grille.
+        """
+        self.largeur = largeur
+        self.hauteur = hauteur
+        # Masque d'une ligne entièrement remplie
+        self.ligne_pleine = (1 << largeur) - 1
+        # Un masque de bits par ligne (ligne 0 en haut)
+        self.lignes = [0] * hauteur
+        # Indices de palette de chaque case (0 = case vide), une rangée bytes par ligne
+        self.rangee_vide = bytes(largeur)
+        self.couleurs = [self.rangee_vide] * hauteur
+        # Vue compatible avec l'ancienne liste de listes contenant None ou une couleur
+        self.grille = _VueGrille(self)
+        # Masques de collision de chaque forme pour cette largeur de grille
+        self.masques = masques_collision(largeur)
+        # Hauteur de chaque colonne : nombre de lignes entre le bas de la grille et
+        # le bloc le plus haut de la colonne (0 si la colonne est vide)
+        self.hauteurs = [0] * largeur
+        # Nombre de cases occupées de chaque colonne : les trous d'une colonne sont
+        # hauteurs[col] - remplies[col]
+        self.remplies = [0] * largeur
+        # Incrémenté à chaque modification des cases (permet aux affichages de garder un cache)
+        self.version = 0
+
+    def set_case(self, lig, col, couleur):
+        """
+        Modifie le contenu d'une case en maintenant le masque de la ligne.
+
+        :param lig: Indice de ligne.
+        :param col: Indice de colonne.
+        :param couleur: Tuple RGB, ou None pour vider la case.
+        """
+        if not 0 <= col < self.largeur:
+            raise IndexError("indice de colonne hors de la grille")
+        indice = indice_couleur(couleur)
+        self.remplies[col] += bool(indice) - (self.lignes[lig] >> col & 1)
+        rangee = bytearray(self.couleurs[lig])
+        rangee[col] = indice
+        self.couleurs[lig] = bytes(rangee)
+        self.version += 1
+        if indice:
+            self.lignes[lig] |= 1 << col
+            if self.hauteur - lig > self.hauteurs[col]:
+                self.hauteurs[col] = self.hauteur - lig
+        else:
+            self.lignes[lig] &= ~(1 << col)
+            if self.hauteur - lig == self.hauteurs[col]:
+                # Le bloc le plus haut de la colonne a été retiré
+                self._recalculer_hauteur(col, lig + 1)
+
+    def _recalculer_hauteur(self, col, depuis):
+        """
+        Recherche le bloc le plus haut d'une colonne à partir d'une ligne donnée
+        (les lignes au-dessus sont supposées vides dans cette colonne).
+
+        :param col: Indice de colonne.
+        :param depuis: Indice de la première ligne à examiner.
+        """
+        bit = 1 << col
+        lignes = self.lignes
+        for lig in range(depuis, self.hauteur):
+            if lignes[lig] & bit:
+                self.hauteurs[col] = self.hauteur - lig
+                return
+        self.hauteurs[col] = 0
+
+    def collision(self, forme, rotation, col, lig):
+        """
+        Teste si une forme placée à la position donnée (en cases) sort de la grille ou
+        chevauche une case occupée. Le test se réduit à quelques ET binaires entre les
+        masques précalculés de la pièce et ceux des lignes du plateau.
+
+        :param forme: Identifiant de la forme.
+        :param rotation: Indice de rotation de la forme.
+        :param col: Colonne du coin supérieur gauche de la pièce.
+        :param lig: Ligne du coin supérieur gauche de la pièce.
+        :return: True en cas de collision, False si la position est libre.
+        """
+        col_min, masques_par_colonne = self.masques[forme][rotation]
+        i = col - col_min
+        if i < 0 or i >= len(masques_par_colonne):
+            return True
+        lignes = self.lignes
+        for dy, masque in masques_par_colonne[i]:
+            lig_bloc = lig + dy
+            if lig_bloc >= self.hauteur:
+                return True
+            # Les blocs situés au-dessus de la grille ne sont pas en collision
+            if lig_bloc >= 0 and lignes[lig_bloc] & masque:
+                return True
+        return False
+
+    def position_valide(self, piece, dcol=0, dlig=0):
+        """
+        Vérifie si le déplacement de la pièce (exprimé en cases) est valide.
+
+        :param piece: Instance de Piece à déplacer.
+        :param dcol: Décalage horizontal (en colonnes).
+        :param dlig: Décalage vertical (en lignes).
+        :return: True si le mouvement est valide, False sinon.
+        """
+        return not self.collision(piece.forme, piece.rotation, piece.col + dcol, piece.lig + dlig)
+
+    def lock_piece(self, piece):
+        """
+        Verrouille la pièce en ajoutant ses blocs à la grille.
+        Cette opération est effectuée lorsque la pièce ne peut plus descendre.
+        Seules les lignes touchées par la pièce peuvent être devenues complètes : elles sont
+        les seules testées, quelle que soit la hauteur de la grille.
+
+        :param piece: Instance de Piece à verrouiller.
+        :return: Liste triée des indices des lignes complétées par la pièce.
+        """
+        indice = indice_couleur(piece.couleur)
+        self.version += 1
+        # Rangées copiées une seule fois chacune, puis figées après l'écriture des blocs
+        rangees = {}
+        for dx, dy in FORMES[piece.forme][piece.rotation]:
+            col = piece.col + dx
+            lig = piece.lig + dy
+            if lig >= 0:
+                self.lignes[lig] |= 1 << col
+                rangee = rangees.get(lig)
+                if rangee is None:
+                    rangee = rangees[lig] = bytearray(self.couleurs[lig])
+                rangee[col] = indice
+                self.remplies[col] += 1
+                if self.hauteur - lig > self.hauteurs[col]:
+                    self.hauteurs[col] = self.hauteur - lig
+        for lig, rangee in rangees.items():
+            self.couleurs[lig] = bytes(rangee)
+        return sorted(lig for lig in rangees if self.lignes[lig] == self.ligne_pleine)
+
+    def ligne_atterrissage(self, forme, rotation, col):
+        """
+        Calcule en temps constant la ligne où se pose une pièce lâchée depuis le haut de
+        la grille dans la colonne donnée, à partir des hauteurs de colonnes.
+
+        :param forme: Identifiant de la forme.
+        :param rotation: Indice de rotation de la forme.
+        :param col: Colonne du coin supérieur gauche de la pièce (supposée valide).
+        :return: Ligne du coin supérieur gauche de la pièce posée (négative si la pile déborde).
+        """
+        hauteurs = self.hauteurs
+        fond = self.hauteur - 1
+        return min(fond - hauteurs[col + dx] - dy for dx, dy in PROFILS[forme][rotation])
+
+    def distance_chute(self, piece):
+        """
+        Retourne le nombre de lignes dont la pièce peut descendre avant de se poser.
+        Si la pièce est au-dessus de toutes les colonnes qu'elle couvre, le calcul se fait
+        en temps constant par les hauteurs ; sinon (pièce glissée sous un surplomb), la
+        descente est testée ligne par ligne.
+
+        :param piece: Instance de Piece à une position valide.
+        :return: Nombre de lignes de descente possibles.
+        """
+        distance = self.ligne_atterrissage(piece.forme, piece.rotation, piece.col) - piece.lig
+        if distance >= 0:
+            return distance
+        distance = 0
+        while not self.collision(piece.forme, piece.rotation, piece.col, piece.lig + distance + 1):
+            distance += 1
+        return distance
+
+    def placements(self, forme):
+        """
+        Énumère les placements finaux d'une forme lâchée verticalement depuis le haut de la
+        grille : une entrée par rotation distincte et par colonne où la pièce tient dans la
+        largeur. La ligne d'atterrissage est obtenue par les hauteurs de colonnes, sans
+        simuler de déplacement ni créer de Piece.
+
+        :param forme: Identifiant de la forme.
+        :return: Liste de tuples (col, rotation, lig) ; lig est la ligne du coin supérieur
+                 gauche de la pièce posée (négative si la pièce dépasse du haut de la grille).
+        """
+        resultats = []
+        fond = self.hauteur - 1
+        hauteurs = self.hauteurs
+        for rotation in ROTATIONS_DISTINCTES[forme]:
+            profil = PROFILS[forme][rotation]
+            col_min, masques_par_colonne = self.masques[forme][rotation]
+            for col in range(col_min, col_min + len(masques_par_colonne)):
+                lig = min(fond - hauteurs[col + dx] - dy for dx, dy in profil)
+                resultats.append((col, rotation, lig))
+        return resultats
+
+    def get_lignes_completes(self):
+        """
+        Identifie et retourne une liste des indices de lignes entièrement remplies.
+        Chaque ligne est testée par une seule comparaison d'entiers.
+
+        :return: Liste d'indices de lignes complètes.
+        """
+        pleine = self.ligne_pleine
+        return [i for i, masque in enumerate(self.lignes) if masque == pleine]
+
+    def effacer_lignes(self, indices_lignes):
+        """
+        Supprime les lignes spécifiées par leurs indices, puis ajoute en haut des lignes vides
+        afin de maintenir la taille de la grille.
+        Les lignes sont retirées et insérées sur place : le décalage des lignes conservées
+        est une copie mémoire, et le coût en Python ne dépend que du nombre de lignes
+        effacées et de la largeur (mise à jour des colonnes).
+
+        :param indices_lignes: Liste d'indices des lignes à effacer.
+        """
+        a_effacer = sorted(set(indices_lignes))
+        if not a_effacer:
+            return
+        self.version += 1
+        # Les lignes pleines retirent une case à chaque colonne, les autres case par case
+        remplies = self.remplies
+        nb_pleines = 0
+        for lig in a_effacer:
+            masque = self.lignes[lig]
+            if masque == self.ligne_pleine:
+                nb_pleines += 1
+                continue
+            while masque:
+                bit = masque & -masque
+                remplies[bit.bit_length() - 1] -= 1
+                masque ^= bit
+        if nb_pleines:
+            self.remplies = [nb - nb_pleines for nb in remplies]
+        # Retrait de bas en haut pour que les indices restant à retirer ne bougent pas
+        for lig in reversed(a_effacer):
+            del self.lignes[lig]
+            del self.couleurs[lig]
+        nb_effacees = len(a_effacer)
+        self.lignes[0:0] = [0] * nb_effacees
+        self.couleurs[0:0] = [self.rangee_vide] * nb_effacees
+        # Seules les lignes effacées au niveau du sommet d'une colonne ou en dessous la font
+        # baisser (toutes, pour des lignes pleines) ; si la case arrivée au nouveau sommet est
+        # vide (sommet effacé au-dessus d'un trou), la colonne est examinée plus bas
+        lignes = self.lignes
+        for col, hauteur_col in enumerate(self.hauteurs):
+            if hauteur_col:
+                sommet = self.hauteur - hauteur_col
+                hauteur_col -= nb_effacees - bisect_left(a_effacer, sommet)
+                if hauteur_col and not lignes[self.hauteur - hauteur_col] >> col & 1:
+                    self._recalculer_hauteur(col, self.hauteur - hauteur_col)
+                else:
+                    self.hauteurs[col] = hauteur_col
+
+    def inserer_lignes(self, nb_lignes, trou, couleur=COULEUR_DECHETS):
+        """
+        Insère en une opération des lignes de déchets en bas de la grille : les lignes
+        existantes remontent d'autant et celles du haut sortent de la grille. Chaque ligne
+        insérée est pleine sauf à la colonne du trou.
+
+        :param nb_lignes: Nombre de lignes à insérer.
+        :param trou: Colonne laissée vide dans les lignes insérées.
+        :param couleur: Couleur des blocs insérés.
+        :return: True si des blocs sont sortis par le haut de la grille (la pile déborde).
+        """
+        nb_lignes = min(nb_lignes, self.hauteur)
+        if nb_lignes <= 0:
+            return False
+        self.version += 1
+        # Les blocs des lignes qui sortent par le haut ne sont plus comptés
+        remplies = self.remplies
+        deborde = False
+        for masque in self.lignes[:nb_lignes]:
+            deborde = deborde or masque != 0
+            while masque:
+                bit = masque & -masque
+                remplies[bit.bit_length() - 1] -= 1
+                masque ^= bit
+        del self.lignes[:nb_lignes]
+        del self.couleurs[:nb_lignes]
+        rangee = bytearray([indice_couleur(couleur)]) * self.largeur
+        rangee[trou] = 0
+        self.lignes.extend([self.ligne_pleine & ~(1 << trou)] * nb_lignes)
+        self.couleurs.extend([bytes(rangee)] * nb_lignes)
+        # Les sommets remontent de nb_lignes ; une colonne vide (hors trou) prend la hauteur des déchets
+        for col, hauteur_col in enumerate(self.hauteurs):
+            if col != trou:
+                remplies[col] += nb_lignes
+            if hauteur_col + nb_lignes > self.hauteur:
+                # Le sommet de la colonne est sorti de la grille
+                self._recalculer_hauteur(col, 0)
+            elif hauteur_col:
+                self.hauteurs[col] = hauteur_col + nb_lignes
+            elif col != trou:
+                self.hauteurs[col] = nb_lignes
+        return deborde
+
+    def charger_rangees(self, rangees):
+        """
+        Remplace tout le contenu du plateau par des rangées d'indices de palette (par exemple
+        reçues du serveur de versus) et recalcule masques, hauteurs et remplissages.
+
+        :param rangees: Séquence de hauteur rangées bytes de largeur indices (0 = case vide).
+        """
+        self.couleurs = [bytes(rangee) for rangee in rangees]
+        self.lignes = [sum(1 << col for col, indice in enumerate(rangee) if indice) for rangee in self.couleurs]
+        self.remplies = [0] * self.largeur
+        for masque in self.lignes:
+            while masque:
+                bit = masque & -masque
+                self.remplies[bit.bit_length() - 1] += 1
+                masque ^= bit
+        for col in range(self.largeur):
+            self._recalculer_hauteur(col, 0)
+        self.version += 1
+
+    def instantane(self):
+        """
+        Capture le contenu du plateau en O(hauteur) : les masques, les rangées de couleurs
+        (immuables, donc partagées et non copiées), les hauteurs et les remplissages de colonnes.
+
+        :return: Tuple (lignes, couleurs, hauteurs, remplies) de tuples, à passer à restaurer().
+        """
+        return tuple(self.lignes), tuple(self.couleurs), tuple(self.hauteurs), tuple(self.remplies)
+
+    def restaurer(self, instantane):
+        """
+        Remet le plateau dans l'état capturé par instantane(). Un même instantané peut être
+        restauré autant de fois que nécessaire.
+
+        :param instantane: Valeur retournée par instantane() sur un plateau de mêmes dimensions.
+        """
+        lignes, couleurs, hauteurs, remplies = instantane
+        self.lignes = list(lignes)
+        self.couleurs = list(couleurs)
+        self.hauteurs = list(hauteurs)
+        self.remplies = list(remplies)
+        self.version += 1
+
+    def clear_lines(self):
+        """
+        Alternative d'effacement des lignes complètes en une seule opération.
+        Retourne le nombre de lignes effacées.
+
+        :return: Nombre de lignes effacées.
+        """
+        lignes_completes = self.get_lignes_completes()
+        self.effacer_lignes(lignes_completes)
+        return len(lignes_completes)
+
+# =============================================================================
+# Actions du joueur et évènements produits par le moteur
+# =============================================================================
+ACTION_AUCUNE = 0          # Aucune action pendant ce tick
+ACTION_GAUCHE = 1          # Déplacement d'une colonne vers la gauche
+ACTION_DROITE = 2          # Déplacement d'une colonne vers la droite
+ACTION_ROTATION = 3        # Rotation dans le sens horaire
+ACTION_DESCENTE = 4        # Descente douce d'une ligne
+ACTION_CHUTE = 5           # Descente rapide (hard drop)
+ACTION_PAUSE = 6           # Bascule du mode pause
+
+# Les noms des évènements correspondent aux effets sonores de SoundManager
+EVENEMENT_POSE = 'piece_drop'      # Une pièce vient d'être verrouillée
+EVENEMENT_LIGNES = 'line_clear'    # Des lignes complètes viennent d'être détectées
+
+DUREE_TICK = 1000 // 60    # Durée d'un tick logique en millisecondes (équivalent à 60 FPS)
+
+LISTE_FORMES = tuple(FORMES)
+
+# =============================================================================
+# Classe GenerateurPieces (suite de pièces déterministe propre à une partie)
+# =============================================================================
+MODE_ALEATOIRE = "aleatoire"   # Chaque forme est tirée indépendamment
+MODE_SAC = "sac"               # Les 7 formes sont distribuées par sacs mélangés (7-bag)
+TAILLE_LOT_PIECES = 256        # Nombre de formes tirées à la fois en mode aléatoire
+
+class GenerateurPieces:
+    def __init__(self, graine=None, mode=MODE_ALEATOIRE):
+        """
+        Initialise un générateur de formes doté de son propre générateur aléatoire, pour que
+        chaque partie soit reproductible et indépendante des autres.
+        Les formes sont tirées par lots dans un tampon : la suite produite ne dépend que de
+        la graine et du mode, quelle que soit la taille des demandes.
+
+        :param graine: Graine du générateur aléatoire (optionnel).
+        :param mode: MODE_ALEATOIRE ou MODE_SAC.
+        """
+        if mode not in (MODE_ALEATOIRE, MODE_SAC):
+            raise ValueError(f"Mode de génération inconnu : '{mode}'")
+        self.mode = mode
+        self.rng = random.Random(graine)
+        self._indices = range(len(LISTE_FORMES))
+        self._tampon = []
+        self._position = 0
+        # État du générateur aléatoire après le dernier remplissage (voir instantane())
+        self._etat_rng = self.rng.getstate()
+
+    def _remplir(self, nb_minimum):
+        """Remplit le tampon avec au moins nb_minimum nouveaux indices de formes."""
+        if self.mode == MODE_SAC:
+            tampon = []
+            while len(tampon) < nb_minimum:
+                sac = list(self._indices)
+                self.rng.shuffle(sac)
+                tampon.extend(sac)
+        else:
+            tampon = self.rng.choices(self._indices, k=max(nb_minimum, TAILLE_LOT_PIECES))
+        self._tampon = tampon
+        self._position = 0
+        self._etat_rng = self.rng.getstate()
+
+    def generer_indices(self, nb):
+        """
+        Tire les nb formes suivantes de la suite, sous forme d'indices dans LISTE_FORMES.
+
+        :param nb: Nombre de formes à tirer.
+        :return: Liste d'entiers.
+        """
+        resultat = []
+        while len(resultat) < nb:
+            if self._position >= len(self._tampon):
+                self._remplir(nb - len(resultat))
+            fin = min(len(self._tampon), self._position + nb - len(resultat))
+            resultat.extend(self._tampon[self._position:fin])
+            self._position = fin
+        return resultat
+
+    def generer(self, nb):
+        """
+        Tire les nb formes suivantes de la suite.
+
+        :param nb: Nombre de formes à tirer.
+        :return: Liste d'identifiants de formes.
+        """
+        return [LISTE_FORMES[i] for i in self.generer_indices(nb)]
+
+    def suivante(self):
+        """Retourne l'identifiant de la forme suivante de la suite."""
+        if self._position >= len(self._tampon):
+            self._remplir(1)
+        indice = self._tampon[self._position]
+        self._position += 1
+        return LISTE_FORMES[indice]
+
+    def instantane(self):
+        """
+        Capture la position dans la suite en temps constant : le tampon n'est jamais modifié
+        après son remplissage et l'état du générateur aléatoire est mémorisé à ce moment-là.
+
+        :return: Tuple opaque à passer à restaurer().
+        """
+        return self._tampon, self._position, self._etat_rng
+
+    def restaurer(self, instantane):
+        """
+        Replace le générateur à la position capturée par instantane().
+
+        :param instantane: Valeur retournée par instantane() sur ce générateur.
+        """
+        tampon, self._position, etat_rng = instantane
+        if tampon is not self._tampon:
+            self.rng.setstate(etat_rng)
+            self._tampon = tampon
+            self._etat_rng = etat_rng
+
+# =============================================================================
+# Classe CourbeNiveaux (niveau atteint et gravité de chaque niveau)
+#
+# La gravité s'exprime en lignes par tick : 1/32 fait descendre la pièce d'une ligne
+# tous les 32 ticks, 3/2 de trois lignes tous les deux ticks, GRAVITE_20G la pose
+# directement sur sa ligne de repos. Chaque descente est calculée en une opération
+# (Plateau.distance_chute), quel que soit le nombre de lignes parcourues.
+# =============================================================================
+GRAVITE_20G = float("inf")     # Gravité « instantanée » : la pièce tombe sur sa ligne de repos
+
+class CourbeNiveaux:
+    def __init__(self, gravites, points_par_niveau=None, lignes_par_niveau=None):
+        """
+        Définit la progression des niveaux, au score ou aux lignes effacées.
+
+        :param gravites: Gravité de chaque niveau en lignes par tick (entier, réel, Fraction ou
+                         GRAVITE_20G) ; au-delà du dernier niveau, la dernière gravité s'applique.
+        :param points_par_niveau: Points de score nécessaires pour passer un niveau.
+        :param lignes_par_niveau: Lignes effacées nécessaires pour passer un niveau
+                                  (à donner à la place de points_par_niveau).
+        """
+        if (points_par_niveau is None) == (lignes_par_niveau is None):
+            raise ValueError("Indiquer soit points_par_niveau, soit lignes_par_niveau")
+        self.gravites = tuple(gravites)
+        self.points_par_niveau = points_par_niveau
+        self.lignes_par_niveau = lignes_par_niveau
+        # (ticks entre deux descentes, lignes par descente) de chaque niveau
+        self._chutes = []
+        for gravite in self.gravites:
+            if gravite == GRAVITE_20G:
+                self._chutes.append((1, GRAVITE_20G))
+                continue
+            fraction = Fraction(gravite)
+            if fraction <= 0:
+                raise ValueError(f"Gravité invalide : {gravite!r} (lignes par tick, strictement positive)")
+            if fraction < 1:
+                # Une ligne tous les n ticks (gravité arrondie au nombre de ticks le plus proche)
+                self._chutes.append((max(1, round(1 / fraction)), 1))
+            else:
+                # p lignes tous les q ticks, avec au plus 4 ticks entre deux descentes
+                fraction = fraction.limit_denominator(4)
+                self._chutes.append((fraction.denominator, fraction.numerator))
+        if not self._chutes:
+            raise ValueError("La courbe doit définir au moins un niveau")
+
+    def niveau(self, score, nb_lignes):
+        """
+        Retourne le niveau atteint (0 au début de la partie).
+
+        :param score: Score du joueur.
+        :param nb_lignes: Nombre total de lignes effacées.
+        :return: Entier positif ou nul.
+        """
+        if self.points_par_niveau is not None:
+            return score // self.points_par_niveau
+        return nb_lignes // self.lignes_par_niveau
+
+    def chute(self, niveau, duree_tick=DUREE_TICK):
+        """
+        Traduit la gravité d'un niveau pour la boucle de jeu.
+
+        :param niveau: Niveau de la partie.
+        :param duree_tick: Durée d'un tick logique en millisecondes.
+        :return: Tuple (temps en millisecondes entre deux descentes, lignes par descente) ;
+                 le nombre de lignes vaut GRAVITE_20G pour une chute jusqu'à la ligne de repos.
+        """
+        nb_ticks, nb_lignes = self._chutes[min(niveau, len(self._chutes) - 1)]
+        return nb_ticks * duree_tick, nb_lignes
+
+# Courbe d'origine : une ligne toutes les VITESSE_CHUTE_INIT ms, puis ACCELERATION_NIVEAU ms
+# de moins tous les POINTS_PAR_NIVEAU points, jusqu'à VITESSE_CHUTE_MIN (arrondi au tick supérieur)
+COURBE_CLASSIQUE = CourbeNiveaux(
+    [Fraction(1, -(-max(VITESSE_CHUTE_MIN, VITESSE_CHUTE_INIT - niveau * ACCELERATION_NIVEAU) // DUREE_TICK))
+     for niveau in range((VITESSE_CHUTE_INIT - VITESSE_CHUTE_MIN) // ACCELERATION_NIVEAU + 1)],
+    points_par_niveau=POINTS_PAR_NIVEAU)
+
+# Courbe des jeux récents : un niveau toutes les 10 lignes, temps par ligne (0,8 - 0,007 (n - 1))^(n - 1)
+# secondes au niveau n (à 60 ticks par seconde), jusqu'à la gravité instantanée
+COURBE_RAPIDE = CourbeNiveaux(
+    [1 / (60 * (0.8 - (n - 1) * 0.007) ** (n - 1)) for n in range(1, 20)] + [GRAVITE_20G],
+    lignes_par_niveau=10)
+
+# =============================================================================
+# Classe Instantane (copie légère de l'état d'une partie)
+#
+# Les recherches (bots) explorent des milliers de variantes par coup : un instantané
+# ne copie que les listes de lignes du plateau, dont les rangées immuables sont
+# partagées entre toutes les branches, et quelques scalaires.
+# =============================================================================
+class Instantane:
+    """État complet d'une partie à un instant donné, restaurable par GameState.restaurer()."""
+
+    __slots__ = ("plateau", "piece_actuelle", "piece_suivante", "generateur", "niveau", "fall_speed",
+                 "lignes_chute", "fall_time", "score", "nb_lignes", "nb_pieces", "game_over", "pause",
+                 "en_animation", "lignes_animation", "timer_animation")
+
+# =============================================================================
+# Classe GameState (état complet d'une partie et règles de progression)
+# =============================================================================
+class GameState:
+    def __init__(self, largeur=NB_COLONNES, hauteur=NB_LIGNES, graine=None,
+                 duree_animation=DUREE_ANIMATION_LIGNE, mode_pieces=MODE_ALEATOIRE,
+                 courbe=COURBE_CLASSIQUE, duree_tick=DUREE_TICK):
+        """
+        Initialise une partie sans affichage.
+
+        :param largeur: Nombre de colonnes de la grille.
+        :param hauteur: Nombre de lignes de la grille.
+        :param graine: Graine de la suite de pièces propre à la partie (optionnel).
+        :param duree_animation: Durée en millisecondes de l'animation d'effacement des lignes.
+        :param mode_pieces: Mode de génération des pièces (MODE_ALEATOIRE ou MODE_SAC).
+        :param courbe: Instance de CourbeNiveaux (niveaux et gravité de chaque niveau).
+        :param duree_tick: Durée d'un tick logique en millisecondes (unité de la gravité).
+        """
+        if largeur < TAILLE_MIN or hauteur < TAILLE_MIN:
+            raise ValueError(f"Grille trop petite : {largeur}x{hauteur} (minimum {TAILLE_MIN}x{TAILLE_MIN})")
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.duree_animation = duree_animation
+        self.courbe = courbe
+        self.duree_tick = duree_tick
+        self.generateur = GenerateurPieces(graine, mode_pieces)
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        """Remet la partie dans son état initial (nouveau plateau, score nul)."""
+        self.plateau = Plateau(self.largeur, self.hauteur)
+        self.piece_actuelle = self.nouvelle_piece()
+        self.piece_suivante = self.nouvelle_piece()
+        self.score = 0                         # Score du joueur
+        self.nb_lignes = 0                     # Nombre total de lignes effacées
+        self.niveau = self.courbe.niveau(0, 0)  # Niveau atteint (voir CourbeNiveaux)
+        # Temps entre deux descentes (en millisecondes) et lignes parcourues à chaque descente
+        self.fall_speed, self.lignes_chute = self.courbe.chute(self.niveau, self.duree_tick)
+        self.fall_time = 0                     # Temps accumulé depuis la dernière descente
+        self.nb_pieces = 0                     # Nombre de pièces verrouillées
+        self.game_over = False                 # Indique si le jeu est terminé
+        self.pause = False                     # Indique si le jeu est en pause
+        # Animation d'effacement des lignes
+        self.en_animation = False
+        self.lignes_animation = []
+        self.timer_animation = 0
+        # Évènements produits depuis le dernier appel à vider_evenements()
+        self.evenements = []
+
+    def nouvelle_piece(self):
+        """
+        Crée une nouvelle pièce placée en haut de la grille et centrée horizontalement.
+
+        :return: Instance de Piece.
+        """
+        return Piece(self.generateur.suivante(), self.largeur // 2 - 2, 0)
+
+    def instantane(self):
+        """
+        Capture l'état de la partie (plateau, pièces, suite de pièces, score, niveau, gravité,
+        pause et animation) en O(hauteur), sans copier les rangées du plateau.
+        Les évènements en attente ne font pas partie de l'instantané.
+
+        :return: Instance de Instantane.
+        """
+        instantane = Instantane()
+        instantane.plateau = self.plateau.instantane()
+        instantane.piece_actuelle = self.piece_actuelle.copie()
+        instantane.piece_suivante = self.piece_suivante.copie()
+        instantane.generateur = self.generateur.instantane()
+        instantane.niveau = self.niveau
+        instantane.fall_speed = self.fall_speed
+        instantane.lignes_chute = self.lignes_chute
+        instantane.fall_time = self.fall_time
+        instantane.score = self.score
+        instantane.nb_lignes = self.nb_lignes
+        instantane.nb_pieces = self.nb_pieces
+        instantane.game_over = self.game_over
+        instantane.pause = self.pause
+        instantane.en_animation = self.en_animation
+        instantane.lignes_animation = tuple(self.lignes_animation)
+        instantane.timer_animation = self.timer_animation
+        return instantane
+
+    def restaurer(self, instantane):
+        """
+        Remet la partie dans l'état capturé par instantane() ; la suite de pièces reprend
+        à la même position. Un instantané peut être restauré plusieurs fois.
+
+        :param instantane: Instance de Instantane produite par cette partie.
+        """
+        self.plateau.restaurer(instantane.plateau)
+        self.piece_actuelle = instantane.piece_actuelle.copie()
+        self.piece_suivante = instantane.piece_suivante.copie()
+        self.generateur.restaurer(instantane.generateur)
+        self.niveau = instantane.niveau
+        self.fall_speed = instantane.fall_speed
+        self.lignes_chute = instantane.lignes_chute
+        self.fall_time = instantane.fall_time
+        self.score = instantane.score
+        self.nb_lignes = instantane.nb_lignes
+        self.nb_pieces = instantane.nb_pieces
+        self.game_over = instantane.game_over
+        self.pause = instantane.pause
+        self.en_animation = instantane.en_animation
+        self.lignes_animation = list(instantane.lignes_animation)
+        self.timer_animation = instantane.timer_animation
+        self.evenements = []
+
+    def vider_evenements(self):
+        """
+        Retourne les évènements produits depuis le dernier appel et vide la liste.
+
+        :return: Liste de noms d'évènements (EVENEMENT_POSE, EVENEMENT_LIGNES).
+        """
+        evenements = self.evenements
+        self.evenements = []
+        return evenements
+
+    def ecouler(self, dt):
+        """
+        Fait avancer le temps de chute, sauf en pause ou pendant une animation.
+
+        :param dt: Temps écoulé en millisecondes.
+        """
+        if not self.pause and not self.en_animation:
+            self.fall_time += dt
+
+    def appliquer(self, action):
+        """
+        Applique une action du joueur à la pièce courante.
+
+        :param action: Une des constantes ACTION_*.
+        """
+        if action == ACTION_PAUSE:
+            if not self.game_over and not self.en_animation:
+                self.pause = not self.pause
+            return
+        if self.pause or self.en_animation or self.game_over:
+            return
+        plateau = self.plateau
+        piece = self.piece_actuelle
+        if action == ACTION_GAUCHE:
+            if plateau.position_valide(piece, dcol=-1):
+                piece.decaler(-1)
+        elif action == ACTION_DROITE:
+            if plateau.position_valide(piece, dcol=1):
+                piece.decaler(1)
+        elif action == ACTION_DESCENTE:
+            if plateau.position_valide(piece, dlig=1):
+                piece.descendre()
+        elif action == ACTION_ROTATION:
+            # Effectue la rotation ; en cas d'invalidité, annule la rotation
+            ancienne_rotation = piece.tourner()
+            if not plateau.position_valide(piece):
+                piece.rotation = ancienne_rotation
+        elif action == ACTION_CHUTE:
+            # La pièce descend directement jusqu'à sa ligne d'atterrissage
+            piece.descendre(plateau.distance_chute(piece))
+            # Force le verrouillage immédiat au prochain tick de mise à jour
+            self.fall_time = self.fall_speed
+
+    def mettre_a_jour(self, dt):
+        """
+        Applique la gravité, le verrouillage et la fin de l'animation d'effacement.
+
+        :param dt: Temps écoulé en millisecondes (utilisé par l'animation).
+        """
+        if self.pause or self.game_over:
+            return
+        if not self.en_animation:
+            # Vérifie si le temps écoulé est suffisant pour une descente de lignes_chute lignes,
+            # faite en une fois (jusqu'à la ligne de repos au plus)
+            if self.fall_time >= self.fall_speed:
+                distance = self.plateau.distance_chute(self.piece_actuelle)
+                if distance > 0:
+                    self.piece_actuelle.descendre(min(distance, self.lignes_chute))
+                else:
+                    self._verrouiller()
+                self.fall_time = 0
+        else:
+            self.timer_animation -= dt
+            if self.timer_animation <= 0:
+                self._terminer_animation()
+
+    def step(self, action=ACTION_AUCUNE, dt=DUREE_TICK):
+        """
+        Avance la partie d'un tick logique : écoulement du temps, action du joueur puis mise à jour.
+
+        :param action: Une des constantes ACTION_*.
+        :param dt: Durée du tick en millisecondes.
+        :return: Liste des évènements produits pendant ce tick.
+        """
+        self.ecouler(dt)
+        if action != ACTION_AUCUNE:
+            self.appliquer(action)
+        self.mettre_a_jour(dt)
+        return self.vider_evenements()
+
+    def avancer(self, nb_ticks, dt=DUREE_TICK):
+        """
+        Avance la partie de nb_ticks ticks sans action du joueur, avec le même résultat que
+        nb_ticks appels à step() mais en sautant directement d'une descente (ou d'une fin
+        d'animation) à la suivante. Les évènements produits restent dans self.evenements.
+
+        :param nb_ticks: Nombre de ticks logiques à simuler.
+        :param dt: Durée d'un tick en millisecondes.
+        """
+        while nb_ticks > 0 and not self.game_over and not self.pause:
+            if self.en_animation:
+                # Ticks nécessaires pour que le minuteur de l'animation atteigne 0
+                nb = max(1, -(-self.timer_animation // dt))
+                if nb > nb_ticks:
+                    self.timer_animation -= nb_ticks * dt
+                    return
+                self.timer_animation -= nb * dt
+                nb_ticks -= nb
+                self._terminer_animation()
+            else:
+                # Ticks nécessaires pour que le temps de chute atteigne la vitesse de chute
+                nb = max(1, -(-(self.fall_speed - self.fall_time) // dt))
+                if nb > nb_ticks:
+                    self.fall_time += nb_ticks * dt
+                    return
+                distance = self.plateau.distance_chute(self.piece_actuelle)
+                if distance > 0:
+                    # Descentes successives sans obstacle : la première après nb ticks,
+                    # les suivantes toutes les `periode` ticks (le temps de chute repart de 0)
+                    periode = max(1, -(-self.fall_speed // dt))
+                    if self.lignes_chute == GRAVITE_20G:
+                        necessaires = 1
+                    else:
+                        necessaires = -(-distance // self.lignes_chute)
+                    nb_descentes = min(necessaires, 1 + (nb_ticks - nb) // periode)
+                    nb_ticks -= nb + (nb_descentes - 1) * periode
+                    self.piece_actuelle.descendre(min(distance, nb_descentes * self.lignes_chute))
+                else:
+                    nb_ticks -= nb
+                    self._verrouiller()
+                self.fall_time = 0
+        if self.game_over and not self.pause:
+            # Comme ecouler(), le temps de chute continue de s'accumuler après la fin de partie
+            self.fall_time += nb_ticks * dt
+
+    def jouer_placement(self, col, rotation):
+        """
+        Pose directement la pièce courante à un placement final (voir Plateau.placements),
+        sans simuler la gravité ni l'animation d'effacement : les lignes complètes sont
+        effacées immédiatement et la pièce suivante est mise en jeu. Le score et la vitesse
+        évoluent comme dans la boucle tick par tick.
+
+        :param col: Colonne du coin supérieur gauche de la pièce.
+        :param rotation: Indice de rotation de la pièce.
+        :return: Nombre de lignes effacées par ce placement.
+        """
+        if self.game_over:
+            return 0
+        piece = self.piece_actuelle
+        piece.col = col
+        piece.rotation = rotation
+        piece.lig = self.plateau.ligne_atterrissage(piece.forme, rotation, col)
+        lignes_completes = self.plateau.lock_piece(piece)
+        self.nb_pieces += 1
+        if lignes_completes:
+            self.plateau.effacer_lignes(lignes_completes)
+            self._compter_lignes(len(lignes_completes))
+        self._piece_suivante()
+        return len(lignes_completes)
+
+    def recevoir_lignes(self, nb_lignes, trou):
+        """
+        Ajoute des lignes de déchets en bas du plateau (partie versus, voir versus.py).
+        La pièce courante remonte si elle chevauche les blocs déplacés ; la partie est
+        perdue si des blocs sortent par le haut de la grille.
+
+        :param nb_lignes: Nombre de lignes de déchets.
+        :param trou: Colonne laissée vide dans les lignes de déchets.
+        """
+        if self.game_over or nb_lignes <= 0:
+            return
+        if self.plateau.inserer_lignes(nb_lignes, trou):
+            self.game_over = True
+            return
+        # Les lignes en cours d'animation ont remonté avec le reste de la pile
+        self.lignes_animation = [lig - nb_lignes for lig in self.lignes_animation]
+        # Les cases où se trouvait la pièce sont maintenant nb_lignes plus haut : elles sont libres
+        piece = self.piece_actuelle
+        for _ in range(nb_lignes):
+            if self.plateau.position_valide(piece):
+                break
+            piece.lig -= 1
+
+    def _verrouiller(self):
+        """Verrouille la pièce courante et lance l'animation si des lignes sont complètes."""
+        lignes_completes = self.plateau.lock_piece(self.piece_actuelle)
+        self.nb_pieces += 1
+        self.evenements.append(EVENEMENT_POSE)
+        if lignes_completes:
+            self.en_animation = True
+            self.lignes_animation = lignes_completes
+            self.timer_animation = self.duree_animation
+            self.evenements.append(EVENEMENT_LIGNES)
+        else:
+            self._piece_suivante()
+
+    def _terminer_animation(self):
+        """Efface les lignes animées, met à jour le score et la vitesse puis passe à la pièce suivante."""
+        self.plateau.effacer_lignes(self.lignes_animation)
+        self._compter_lignes(len(self.lignes_animation))
+        self.en_animation = False
+        self.lignes_animation = []
+        self._piece_suivante()
+
+    def _compter_lignes(self, nb_lignes):
+        """Met à jour le score, le niveau et la gravité après l'effacement de lignes."""
+        self.nb_lignes += nb_lignes
+        self.score += nb_lignes * 100
+        self.niveau = self.courbe.niveau(self.score, self.nb_lignes)
+        self.fall_speed, self.lignes_chute = self.courbe.chute(self.niveau, self.duree_tick)
+
+    def _piece_suivante(self):
+        """Passe à la pièce suivante ; la partie est perdue si elle ne peut pas être placée."""
+        self.piece_actuelle = self.piece_suivante
+        self.piece_suivante = self.nouvelle_piece()
+        if not self.plateau.position_valide(self.piece_actuelle):
+            self.game_over = True
+        self.fall_time = 0
+
+# =============================================================================
+# Pas de temps fixe (boucle logique découplée de l'affichage)
+# =============================================================================
+RETARD_MAX = 1000          # Retard maximal (ms) rattrapé après une frame bloquée ; le surplus est abandonné
+
+class HorlogeFixe:
+    """
+    Convertit le temps réel écoulé en ticks logiques de durée constante : chaque frame exécute
+    autant de ticks que nécessaire, quel que soit le rythme d'affichage, et le reste est
+    conservé pour la frame suivante (il sert aussi à interpoler l'affichage).
+    """
+
+    def __init__(self, duree_tick=DUREE_TICK, retard_max=RETARD_MAX):
+        """
+        :param duree_tick: Durée d'un tick logique en millisecondes.
+        :param retard_max: Temps maximal accumulé en millisecondes (évite l'emballement après un blocage).
+        """
+        self.duree_tick = duree_tick
+        self.retard_max = retard_max
+        self.accumulateur = 0
+
+    def avancer(self, dt):
+        """
+        Ajoute le temps écoulé depuis la frame précédente.
+
+        :param dt: Temps écoulé en millisecondes.
+        :return: Nombre de ticks logiques à exécuter pour rattraper le temps réel.
+        """
+        self.accumulateur = min(self.accumulateur + dt, self.retard_max)
+        nb_ticks = self.accumulateur // self.duree_tick
+        self.accumulateur -= nb_ticks * self.duree_tick
+        return nb_ticks
+
+    @property
+    def alpha(self):
+        """Fraction du tick suivant déjà écoulée, entre 0.0 et 1.0 (interpolation de l'affichage)."""
+        return self.accumulateur / self.duree_tick
@@ -0,0 +1,86 @@
+import pygame
+from collections import OrderedDict
+
+# =============================================================================
+# Configuration du cache
+# =============================================================================
+TAILLE_MAX_TEXTES = 256    # Nombre maximal de textes rendus conservés (éviction LRU au-delà)
+
+# =============================================================================
+# Classe CacheTextes (cache des polices et des textes rendus)
+# =============================================================================
+class CacheTextes:
+    """Cache partagé des polices et des surfaces de texte rendues"""
+
+    # Instance unique pour le pattern Singleton
+    _instance = None
+
+    def __new__(cls):
+        """
+        Implémentation du pattern Singleton : l'écran d'accueil et le jeu partagent le même cache.
+
+        :return: L'instance unique de CacheTextes.
+        """
+        if cls._instance is None:
+            cls._instance = super(CacheTextes, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initialise le cache (une seule fois).
+        Les polices ne sont plus utilisables après pygame.quit() : le cache est alors vidé.
+        """
+        if self._initialized:
+            return
+        self.taille_max = TAILLE_MAX_TEXTES
+        self.polices = {}              # (police, taille) -> pygame.font.Font
+        self.textes = OrderedDict()    # (police, taille, texte, couleur) -> Surface, du plus ancien au plus récent
+        self._initialized = True
+
+    def vider(self):
+        """Oublie toutes les polices et tous les textes rendus."""
+        self.polices.clear()
+        self.textes.clear()
+
+    def police(self, nom, taille):
+        """
+        Retourne la police demandée, chargée une seule fois.
+
+        :param nom: Nom de la police système (ex. 'Arial'), ou None pour la police par défaut de Pygame.
+        :param taille: Taille de la police.
+        :return: Objet pygame.font.Font.
+        """
+        cle = (nom, taille)
+        font = self.polices.get(cle)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            if not self.polices:
+                # Pygame oublie ses fonctions de sortie à chaque pygame.quit() : réenregistrement
+                pygame.register_quit(self.vider)
+            font = pygame.font.Font(None, taille) if nom is None else pygame.font.SysFont(nom, taille)
+            self.polices[cle] = font
+        return font
+
+    def rendre(self, texte, nom, taille, couleur):
+        """
+        Retourne la surface du texte rendu (anticrénelé), en ne le rasterisant qu'au premier appel.
+        Au-delà de taille_max textes, le texte utilisé le moins récemment est évincé.
+
+        :param texte: Texte à rendre.
+        :param nom: Nom de la police (voir police()).
+        :param taille: Taille de la police.
+        :param couleur: Couleur du texte (tuple RGB).
+        :return: Surface Pygame contenant le texte. Elle est partagée : ne pas la modifier.
+        """
+        cle = (nom, taille, texte, tuple(couleur))
+        surface = self.textes.get(cle)
+        if surface is not None:
+            self.textes.move_to_end(cle)
+            return surface
+        surface = self.police(nom, taille).render(texte, True, couleur)
+        self.textes[cle] = surface
+        if len(self.textes) > self.taille_max:
+            self.textes.popitem(last=False)
+        return surface
@@ -1,5 +1,6 @@
 import pygame
 import sys
+from font_cache import CacheTextes
 
 # =============================================================================
 # Classe TetrisMenu (représente l'écran d'accueil du jeu)
@@ -13,7 +14,7 @@ class TetrisMenu:
         pygame.init()
         self.screen = pygame.display.set_mode((400, 600))  # Fenêtre de 400x600 pixels
         pygame.display.set_caption('Tetris Menu')          # Titre de la fenêtre
-        self.font = pygame.font.Font(None, 50)             # Police par défaut, taille 50
+        self.font = CacheTextes().police(None, 50)         # Police par défaut, taille 50
         self.clock = pygame.time.Clock()                   # Horloge pour limiter les FPS
 
     def draw_button(self, text, y_pos, is_hover):
@@ -28,8 +29,8 @@ class TetrisMenu:
         # Couleur verte plus claire si survol, plus foncée sinon
         color = (100, 200, 100) if is_hover else (50, 150, 50)
         
-        # Création du texte rendu avec la police définie
-        text_surface = self.font.render(text, True, (255, 255, 255))
+        # Texte rendu avec la police définie (rasterisé une seule fois grâce au cache)
+        text_surface = CacheTextes().rendre(text, None, 50, (255, 255, 255))
         text_rect = text_surface.get_rect(center=(200, y_pos))
         
         # Création du rectangle du bouton (largeur 200, hauteur 50)
@@ -62,7 +63,7 @@ class TetrisMenu:
             self.screen.fill((0, 0, 0))  # Remplissage de l'écran avec la couleur noire
             
             # Affichage du titre "TETRIS"
-            title = self.font.render('TETRIS', True, (255, 255, 255))
+            title = CacheTextes().rendre('TETRIS', None, 50, (255, 255, 255))
             title_rect = title.get_rect(center=(200, 100))
             self.screen.blit(title, title_rect)
             
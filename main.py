@@ -1,7 +1,19 @@
 import pygame
 import random
 import sys
+import weakref
 from sound_manager import SoundManager
+from font_cache import CacheTextes
+from replay import EnregistreurReplay
+from bot import PiloteAutomatique
+from versus import ClientVersus, PORT_DEFAUT, appliquer_vue, creer_miroir
+from spectateur import ClientSpectateur, PORT_SPECTATEURS, appliquer_trame
+# Les règles du jeu sont dans engine.py ; ses constantes et classes restent accessibles depuis main
+from engine import (
+    CARTE_COULEURS, FORMES, VITESSE_CHUTE_INIT, DUREE_ANIMATION_LIGNE, PALETTE, Piece, Plateau, GameState,
+    GenerateurPieces, HorlogeFixe, DUREE_TICK, COURBE_CLASSIQUE,
+    ACTION_AUCUNE, ACTION_GAUCHE, ACTION_DROITE, ACTION_ROTATION, ACTION_DESCENTE, ACTION_CHUTE, ACTION_PAUSE
+)
 
 print("Démarrage du programme...")
 import pygame
@@ -23,6 +35,13 @@ LARGEUR_JEU = 300          # Largeur de la zone de jeu (partie de la fenêtre d
 NB_COLONNES = LARGEUR_JEU // TAILLE_CASE   # Nombre de colonnes de la grille
 NB_LIGNES = HAUTEUR_FENETRE // TAILLE_CASE    # Nombre de lignes de la grille
 
+# Rendu : seules les zones modifiées sont redessinées et transmises à l'écran (False : frame complète)
+RENDU_PARTIEL = True
+# Nombre maximal d'images affichées par seconde (la logique avance toujours par ticks de DUREE_TICK)
+IMAGES_PAR_SECONDE = 60
+# Dossier où enregistrer le replay de chaque partie (None : pas d'enregistrement), ex. "replays"
+DOSSIER_REPLAYS = None
+
 # =============================================================================
 # Définition des couleurs (format RGB)
 # =============================================================================
@@ -32,70 +51,11 @@ BLANC = (255, 255, 255)     # Couleur blanche (utilisée pour l'animation flash)
 NOIR = (0, 0, 0)           # Couleur noire (utilisée pour les contours)
 
 # =============================================================================
-# Définition des couleurs associées à chaque type de pièce
-# =============================================================================
-CARTE_COULEURS = {
-    "I": (0, 255, 255),    # Cyan
-    "J": (0, 0, 255),      # Bleu
-    "L": (255, 165, 0),    # Orange
-    "O": (255, 255, 0),    # Jaune
-    "S": (0, 255, 0),      # Vert
-    "T": (128, 0, 128),    # Violet
-    "Z": (255, 0, 0)       # Rouge
-}
-
-# =============================================================================
-# Définition des formes et de leurs rotations
-#
-# Chaque pièce est définie par une liste de rotations.
-# Chaque rotation est une liste de tuples (dx, dy) exprimés en nombre de cases.
-# =============================================================================
-FORMES = {
-    "I": [
-        [(0, 1), (1, 1), (2, 1), (3, 1)],
-        [(2, 0), (2, 1), (2, 2), (2, 3)]
-    ],
-    "J": [
-        [(0, 0), (0, 1), (1, 1), (2, 1)],
-        [(1, 0), (2, 0), (1, 1), (1, 2)],
-        [(0, 1), (1, 1), (2, 1), (2, 2)],
-        [(1, 0), (1, 1), (0, 2), (1, 2)]
-    ],
-    "L": [
-        [(2, 0), (0, 1), (1, 1), (2, 1)],
-        [(1, 0), (1, 1), (1, 2), (2, 2)],
-        [(0, 1), (1, 1), (2, 1), (0, 2)],
-        [(0, 0), (1, 0), (1, 1), (1, 2)]
-    ],
-    "O": [
-        [(0, 0), (1, 0), (0, 1), (1, 1)]
-    ],
-    "S": [
-        [(1, 0), (2, 0), (0, 1), (1, 1)],
-        [(1, 0), (1, 1), (2, 1), (2, 2)]
-    ],
-    "T": [
-        [(1, 0), (0, 1), (1, 1), (2, 1)],
-        [(1, 0), (1, 1), (2, 1), (1, 2)],
-        [(0, 1), (1, 1), (2, 1), (1, 2)],
-        [(1, 0), (0, 1), (1, 1), (1, 2)]
-    ],
-    "Z": [
-        [(0, 0), (1, 0), (1, 1), (2, 1)],
-        [(2, 0), (1, 1), (2, 1), (1, 2)]
-    ]
-}
-
-# =============================================================================
-# Configuration du rythme de chute et de l'animation d'effacement
+# Classe Tetris (représente une pièce affichée à l'écran)
 # =============================================================================
-VITESSE_CHUTE_INIT = 500      # Temps en millisecondes avant que la pièce ne descende d'une case
-DUREE_ANIMATION_LIGNE = 500   # Durée de l'animation (flash) lors de l'effacement d'une ligne
+class Tetris(Piece):
+    __slots__ = ("taille_case",)
 
-# =============================================================================
-# Classe Tetris (représente une pièce)
-# =============================================================================
-class Tetris:
     def __init__(self, x, y, forme, taille_case):
         """
         Initialise une pièce de Tetris.
@@ -105,26 +65,37 @@ class Tetris:
         :param forme: Identifiant de la forme ("I", "J", "L", "O", "S", "T", "Z").
         :param taille_case: Taille d'une case en pixels.
         """
-        self.x = x
-        self.y = y
-        self.forme = forme
-        self.couleur = CARTE_COULEURS[forme]
+        super().__init__(forme, x // taille_case, y // taille_case)
         self.taille_case = taille_case
-        self.rotation = 0
+
+    @property
+    def x(self):
+        """Position x (en pixels) du coin supérieur gauche de la pièce."""
+        return self.col * self.taille_case
+
+    @x.setter
+    def x(self, valeur):
+        self.col = valeur // self.taille_case
+
+    @property
+    def y(self):
+        """Position y (en pixels) du coin supérieur gauche de la pièce."""
+        return self.lig * self.taille_case
+
+    @y.setter
+    def y(self, valeur):
+        self.lig = valeur // self.taille_case
 
     def get_blocs(self):
         """
         Calcule et retourne la liste des positions (en pixels) de chaque bloc constituant la pièce.
         Chaque position est calculée en fonction de la rotation actuelle.
         """
-        blocs = []
-        for dx, dy in FORMES[self.forme][self.rotation]:
-            blocs.append((self.x + dx * self.taille_case, self.y + dy * self.taille_case))
-        return blocs
+        return [(col * self.taille_case, lig * self.taille_case) for col, lig in self.get_cases()]
 
     def move_down(self):
         """Déplace la pièce d'une case vers le bas."""
-        self.y += self.taille_case
+        self.lig += 1
 
     def move_side(self, dx):
         """
@@ -132,16 +103,14 @@ class Tetris:
 
         :param dx: Décalage en pixels (positif vers la droite, négatif vers la gauche).
         """
-        self.x += dx
+        self.col += dx // self.taille_case
 
     def rotate(self):
         """
         Effectue une rotation de la pièce dans le sens horaire.
         Retourne la rotation précédente pour permettre une annulation si nécessaire.
         """
-        old_rotation = self.rotation
-        self.rotation = (self.rotation + 1) % len(FORMES[self.forme])
-        return old_rotation
+        return self.tourner()
 
     def rotate_back(self, old_rotation):
         """
@@ -151,33 +120,37 @@ class Tetris:
         """
         self.rotation = old_rotation
 
+    def copie(self):
+        """Retourne une copie indépendante de la pièce, avec la même taille de case."""
+        autre = Tetris(0, 0, self.forme, self.taille_case)
+        autre.col, autre.lig, autre.rotation = self.col, self.lig, self.rotation
+        return autre
+
     def draw(self, surface):
         """
         Dessine la pièce sur la surface donnée.
 
         :param surface: Surface Pygame sur laquelle dessiner la pièce.
         """
-        for x_bloc, y_bloc in self.get_blocs():
-            rect = pygame.Rect(x_bloc, y_bloc, self.taille_case, self.taille_case)
-            pygame.draw.rect(surface, self.couleur, rect)
-            # Dessine un contour pour mieux visualiser les blocs
-            pygame.draw.rect(surface, NOIR, rect, 1)
+        draw_piece(surface, self, self.taille_case)
 
 # =============================================================================
-# Classe PlateauDeJeu (représente la grille de jeu)
+# Classe PlateauDeJeu (représente la grille de jeu affichée à l'écran)
+#
+# La logique (bitboard, collisions, effacement) est héritée de engine.Plateau ;
+# cette classe ajoute l'interface en pixels et le dessin.
 # =============================================================================
-class PlateauDeJeu:
-    def __init__(self, largeur, hauteur):
+class PlateauDeJeu(Plateau):
+    def __init__(self, largeur=NB_COLONNES, hauteur=NB_LIGNES, taille_case=TAILLE_CASE):
         """
-        Initialise le plateau de jeu avec une grille vide.
+        Initialise une grille de jeu vide de dimensions quelconques.
 
         :param largeur: Nombre de colonnes de la grille.
         :param hauteur: Nombre de lignes de la grille.
+        :param taille_case: Taille d'une case en pixels (conversion des déplacements en cases).
         """
-        self.largeur = largeur
-        self.hauteur = hauteur
-        # La grille est une liste de listes contenant None (case vide) ou une couleur (case occupée)
-        self.grille = [[None for _ in range(largeur)] for _ in range(hauteur)]
+        super().__init__(largeur, hauteur)
+        self.taille_case = taille_case
 
     def is_valid_move(self, tetris, dx=0, dy=0):
         """
@@ -189,94 +162,173 @@ class PlateauDeJeu:
         :param dy: Décalage vertical (en pixels).
         :return: True si le mouvement est valide, False sinon.
         """
-        for x, y in tetris.get_blocs():
-            new_x = x + dx
-            new_y = y + dy
-            col = new_x // TAILLE_CASE
-            lig = new_y // TAILLE_CASE
-            if col < 0 or col >= self.largeur or lig >= self.hauteur:
-                return False
-            if lig >= 0 and self.grille[lig][col] is not None:
-                return False
-        return True
+        return self.position_valide(tetris, dx // self.taille_case, dy // self.taille_case)
 
-    def lock_piece(self, tetris):
+    def draw(self, surface, lignes_animation=None):
         """
-        Verrouille la pièce en ajoutant ses blocs à la grille.
-        Cette opération est effectuée lorsque la pièce ne peut plus descendre.
+        Dessine la grille (les blocs déjà placés) sur la surface donnée.
+        Si des lignes sont en cours d'animation d'effacement, celles-ci sont dessinées avec un effet flash.
 
-        :param tetris: Instance de Tetris à verrouiller.
+        :param surface: Surface Pygame sur laquelle dessiner la grille.
+        :param lignes_animation: Liste d'indices de lignes à animer (optionnel).
         """
-        for x, y in tetris.get_blocs():
-            col = x // TAILLE_CASE
-            lig = y // TAILLE_CASE
-            if lig >= 0:
-                self.grille[lig][col] = tetris.couleur
+        draw_plateau(surface, self, lignes_animation)
+
+# =============================================================================
+# Atlas des blocs pré-rendus (un sprite par couleur et par taille de case)
+# =============================================================================
+class AtlasBlocs:
+    """
+    Sprites des blocs : chaque bloc (couleur de fond et contour NOIR de 1 px) est rendu une
+    seule fois, puis dessiné par un simple blit. Les couleurs de CARTE_COULEURS et la variante
+    BLANC du flash sont créées d'avance ; toute autre couleur l'est à sa première utilisation.
+    Remplacer une surface de self.blocs suffit pour changer l'apparence (texture) d'un bloc.
+    """
 
-    def get_lignes_completes(self):
+    def __init__(self, taille_case=TAILLE_CASE):
         """
-        Identifie et retourne une liste des indices de lignes entièrement remplies.
+        :param taille_case: Taille d'une case en pixels.
+        """
+        self.taille_case = taille_case
+        self.blocs = {}  # couleur RGB -> Surface
+        for couleur in list(CARTE_COULEURS.values()) + [BLANC]:
+            self.bloc(couleur)
 
-        :return: Liste d'indices de lignes complètes.
+    def bloc(self, couleur):
         """
-        lignes = []
-        for i, ligne in enumerate(self.grille):
-            if all(cell is not None for cell in ligne):
-                lignes.append(i)
-        return lignes
+        Retourne le sprite du bloc de la couleur donnée.
 
-    def effacer_lignes(self, indices_lignes):
+        :param couleur: Tuple RGB.
+        :return: Surface Pygame de taille taille_case x taille_case.
         """
-        Supprime les lignes spécifiées par leurs indices, puis ajoute en haut des lignes vides
-        afin de maintenir la taille de la grille.
+        sprite = self.blocs.get(couleur)
+        if sprite is None:
+            sprite = pygame.Surface((self.taille_case, self.taille_case))
+            sprite.fill(couleur)
+            pygame.draw.rect(sprite, NOIR, sprite.get_rect(), 1)
+            # Conversion au format de l'écran pour des blits rapides (si une fenêtre existe)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            self.blocs[couleur] = sprite
+        return sprite
+
+# Atlas déjà construits, par taille de case
+_ATLAS_PAR_TAILLE = {}
+
+def atlas_blocs(taille_case=TAILLE_CASE):
+    """
+    Retourne l'atlas des blocs pour une taille de case, construit au premier appel.
 
-        :param indices_lignes: Liste d'indices des lignes à effacer.
+    :param taille_case: Taille d'une case en pixels.
+    :return: Instance de AtlasBlocs.
+    """
+    atlas = _ATLAS_PAR_TAILLE.get(taille_case)
+    if atlas is None:
+        atlas = _ATLAS_PAR_TAILLE[taille_case] = AtlasBlocs(taille_case)
+    return atlas
+
+# =============================================================================
+# Animation d'effacement des lignes
+# =============================================================================
+EFFET_FLASH = "flash"                # Les lignes alternent entre BLANC et leur couleur
+EFFET_FONDU = "fondu"                # Les lignes s'assombrissent progressivement jusqu'au NOIR
+EFFET_EFFONDREMENT = "effondrement"  # Les lignes s'écrasent vers leur milieu
+PERIODE_FLASH = 150                  # Durée (ms) de chaque alternance du flash
+NB_ETAPES_ANIMATION = 16             # Nombre d'états distincts du fondu et de l'effondrement
+
+class AnimationLignes:
+    """
+    Animation des lignes en cours d'effacement. Les lignes animées sont marquées une fois
+    dans un tableau de drapeaux (test d'appartenance en O(1)), la phase est calculée une fois
+    par frame, et chaque effet est dessiné ligne par ligne (un blit ou un remplissage par
+    ligne) par-dessus le plateau, sans parcourir les cases.
+    Les lignes animées étant complètes, le flash d'une ligne est une rangée de blocs BLANC.
+    """
+
+    def __init__(self, effet=EFFET_FLASH):
+        """
+        :param effet: EFFET_FLASH, EFFET_FONDU ou EFFET_EFFONDREMENT.
         """
-        for lig in sorted(indices_lignes):
-            # Supprime la ligne complète
-            del self.grille[lig]
-            # Insère une nouvelle ligne vide en haut de la grille
-            self.grille.insert(0, [None for _ in range(self.largeur)])
+        if effet not in (EFFET_FLASH, EFFET_FONDU, EFFET_EFFONDREMENT):
+            raise ValueError(f"Effet d'animation inconnu : '{effet}'")
+        self.effet = effet
+        self.lignes = ()             # Lignes animées
+        self.drapeaux = bytearray()  # drapeaux[lig] vaut 1 si la ligne est animée
+        self.rangees = {}            # (effet, largeur) -> Surface d'une ligne de recouvrement
 
-    def clear_lines(self):
+    def synchroniser(self, lignes, hauteur):
         """
-        Alternative d'effacement des lignes complètes en réassemblant la grille.
-        Retourne le nombre de lignes effacées.
+        Met à jour les drapeaux lorsque les lignes animées changent.
 
-        :return: Nombre de lignes effacées.
+        :param lignes: Indices des lignes animées.
+        :param hauteur: Nombre de lignes du plateau.
         """
-        lignes_cleared = 0
-        nouvelle_grille = [ligne for ligne in self.grille if any(cell is None for cell in ligne)]
-        lignes_cleared = self.hauteur - len(nouvelle_grille)
-        for _ in range(lignes_cleared):
-            nouvelle_grille.insert(0, [None for _ in range(self.largeur)])
-        self.grille = nouvelle_grille
-        return lignes_cleared
+        lignes = tuple(lignes)
+        if lignes != self.lignes or len(self.drapeaux) != hauteur:
+            self.lignes = lignes
+            self.drapeaux = bytearray(hauteur)
+            for lig in lignes:
+                self.drapeaux[lig] = 1
 
-    def draw(self, surface, lignes_animation=None):
+    def est_animee(self, lig):
         """
-        Dessine la grille (les blocs déjà placés) sur la surface donnée.
-        Si des lignes sont en cours d'animation d'effacement, celles-ci sont dessinées avec un effet flash.
+        :param lig: Indice de ligne.
+        :return: True si la ligne est en cours d'animation.
+        """
+        return lig < len(self.drapeaux) and self.drapeaux[lig] == 1
 
-        :param surface: Surface Pygame sur laquelle dessiner la grille.
-        :param lignes_animation: Liste d'indices de lignes à animer (optionnel).
+    def phase(self, temps, progression=0.0):
         """
-        temps = pygame.time.get_ticks()
-        for lig in range(self.hauteur):
-            for col in range(self.largeur):
-                couleur = self.grille[lig][col]
-                if couleur is not None:
-                    # Si la ligne fait partie de l'animation, on alterne entre BLANC et la couleur d'origine
-                    if lignes_animation is not None and lig in lignes_animation:
-                        if (temps // 150) % 2 == 0:
-                            couleur_affiche = BLANC
-                        else:
-                            couleur_affiche = couleur
-                    else:
-                        couleur_affiche = couleur
-                    rect = pygame.Rect(col * TAILLE_CASE, lig * TAILLE_CASE, TAILLE_CASE, TAILLE_CASE)
-                    pygame.draw.rect(surface, couleur_affiche, rect)
-                    pygame.draw.rect(surface, NOIR, rect, 1)
+        Calcule l'état de l'effet pour la frame : deux frames de même phase sont identiques.
+
+        :param temps: Temps courant en millisecondes (rythme du flash).
+        :param progression: Avancement de l'animation, de 0.0 (début) à 1.0 (fin).
+        :return: Entier identifiant l'état de l'effet.
+        """
+        if self.effet == EFFET_FLASH:
+            return (temps // PERIODE_FLASH) % 2
+        return min(NB_ETAPES_ANIMATION, max(0, int(progression * NB_ETAPES_ANIMATION)))
+
+    def _rangee(self, largeur):
+        """Retourne la surface de recouvrement d'une ligne pour l'effet, construite une seule fois."""
+        cle = (self.effet, largeur)
+        rangee = self.rangees.get(cle)
+        if rangee is None:
+            rangee = pygame.Surface((largeur * TAILLE_CASE, TAILLE_CASE))
+            if self.effet == EFFET_FLASH:
+                flash = atlas_blocs(TAILLE_CASE).bloc(BLANC)
+                rangee.blits([(flash, (col * TAILLE_CASE, 0)) for col in range(largeur)], doreturn=False)
+            else:
+                rangee.fill(NOIR)
+            self.rangees[cle] = rangee
+        return rangee
+
+    def draw(self, surface, largeur, phase):
+        """
+        Dessine l'effet sur les lignes animées.
+
+        :param surface: Surface Pygame sur laquelle dessiner (le plateau y est déjà dessiné).
+        :param largeur: Nombre de colonnes du plateau.
+        :param phase: Phase de la frame (voir phase()).
+        """
+        if self.effet == EFFET_FLASH:
+            # Phase 0 : lignes en BLANC ; phase 1 : couleurs d'origine (déjà dessinées)
+            if phase == 0:
+                rangee = self._rangee(largeur)
+                surface.blits([(rangee, (0, lig * TAILLE_CASE)) for lig in self.lignes], doreturn=False)
+        elif self.effet == EFFET_FONDU:
+            rangee = self._rangee(largeur)
+            rangee.set_alpha(255 * phase // NB_ETAPES_ANIMATION)
+            surface.blits([(rangee, (0, lig * TAILLE_CASE)) for lig in self.lignes], doreturn=False)
+        else:
+            # Bande NOIR qui grandit depuis le milieu de chaque ligne
+            hauteur_bande = TAILLE_CASE * phase // NB_ETAPES_ANIMATION
+            marge = (TAILLE_CASE - hauteur_bande) // 2
+            for lig in self.lignes:
+                surface.fill(NOIR, (0, lig * TAILLE_CASE + marge, largeur * TAILLE_CASE, hauteur_bande))
+
+# Animation utilisée lorsqu'aucune n'est précisée
+ANIMATION_LIGNES = AnimationLignes(EFFET_FLASH)
 
 # =============================================================================
 # Fonctions de dessin et d'affichage du panneau latéral
@@ -292,13 +344,96 @@ def draw_grid(surface):
     for x in range(NB_COLONNES):
         pygame.draw.line(surface, GRIS_CLAIR, (x * TAILLE_CASE, 0), (x * TAILLE_CASE, HAUTEUR_FENETRE))
 
-def new_piece():
+def draw_piece(surface, piece, taille_case=TAILLE_CASE, decalage=0):
+    """
+    Dessine une pièce sur la surface donnée, en convertissant ses cases en pixels.
+
+    :param surface: Surface Pygame sur laquelle dessiner la pièce.
+    :param piece: Instance de Piece à dessiner.
+    :param taille_case: Taille d'une case en pixels.
+    :param decalage: Décalage vertical supplémentaire en pixels (chute interpolée).
+    """
+    sprite = atlas_blocs(taille_case).bloc(piece.couleur)
+    surface.blits([(sprite, (col * taille_case, lig * taille_case + decalage)) for col, lig in piece.get_cases()],
+                  doreturn=False)
+
+class SurfacePlateau:
+    """
+    Surface hors écran contenant les blocs posés d'un plateau (fond NOIR).
+    Elle n'est redessinée que lorsque plateau.version change, c'est-à-dire après
+    lock_piece, effacer_lignes ou une modification de case.
+    """
+
+    def __init__(self, plateau):
+        """
+        :param plateau: Instance de Plateau affichée.
+        """
+        self.surface = pygame.Surface((plateau.largeur * TAILLE_CASE, plateau.hauteur * TAILLE_CASE))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.version = None  # Version du plateau actuellement rendue
+
+    def actualiser(self, plateau):
+        """
+        Redessine la surface si le plateau a été modifié depuis le dernier rendu.
+
+        :param plateau: Instance de Plateau affichée.
+        :return: Surface Pygame du plateau.
+        """
+        if plateau.version != self.version:
+            self.version = plateau.version
+            self.surface.fill(NOIR)
+            atlas = atlas_blocs(TAILLE_CASE)
+            # Sprite de chaque indice de la palette (la palette peut s'enrichir en cours de partie)
+            sprites = [None] + [atlas.bloc(couleur) for couleur in PALETTE[1:]]
+            blocs = []
+            for lig in range(plateau.hauteur):
+                # Les lignes vides sont ignorées sans parcourir leurs cases
+                if not plateau.lignes[lig]:
+                    continue
+                rangee = plateau.couleurs[lig]
+                y = lig * TAILLE_CASE
+                blocs.extend((sprites[rangee[col]], (col * TAILLE_CASE, y))
+                             for col in range(plateau.largeur) if rangee[col])
+            # Tout le plateau est dessiné en un seul appel
+            self.surface.blits(blocs, doreturn=False)
+        return self.surface
+
+# Surface en cache de chaque plateau affiché (oubliée avec le plateau)
+_SURFACES_PLATEAU = weakref.WeakKeyDictionary()
+
+def draw_plateau(surface, plateau, lignes_animation=None, animation=None, progression=0.0):
+    """
+    Dessine la grille (les blocs déjà placés) sur la surface donnée, en recouvrant la zone
+    du plateau de NOIR. Les blocs posés proviennent d'une surface en cache ; l'effet
+    d'effacement est dessiné par-dessus les seules lignes animées.
+
+    :param surface: Surface Pygame sur laquelle dessiner la grille.
+    :param plateau: Instance de Plateau à dessiner.
+    :param lignes_animation: Liste d'indices de lignes (complètes) à animer (optionnel).
+    :param animation: Instance de AnimationLignes (ANIMATION_LIGNES par défaut).
+    :param progression: Avancement de l'animation, de 0.0 à 1.0 (fondu et effondrement).
+    """
+    cache = _SURFACES_PLATEAU.get(plateau)
+    if cache is None:
+        cache = _SURFACES_PLATEAU[plateau] = SurfacePlateau(plateau)
+    surface.blit(cache.actualiser(plateau), (0, 0))
+    if lignes_animation:
+        animation = animation or ANIMATION_LIGNES
+        animation.synchroniser(lignes_animation, plateau.hauteur)
+        animation.draw(surface, plateau.largeur, animation.phase(pygame.time.get_ticks(), progression))
+
+# Générateur de pièces partagé par new_piece() lorsqu'aucun générateur n'est fourni
+GENERATEUR_PIECES = GenerateurPieces()
+
+def new_piece(generateur=None):
     """
     Crée et retourne une nouvelle pièce placée en haut de la zone de jeu et centrée horizontalement.
     
+    :param generateur: Instance de GenerateurPieces fournissant la forme (optionnel).
     :return: Instance de Tetris représentant la nouvelle pièce.
     """
-    forme = random.choice(list(FORMES.keys()))
+    forme = (generateur or GENERATEUR_PIECES).suivante()
     x = LARGEUR_JEU // 2 - 2 * TAILLE_CASE  # Centrage approximatif de la pièce
     y = 0
     return Tetris(x, y, forme, TAILLE_CASE)
@@ -325,10 +460,9 @@ def draw_next_piece(surface, piece):
     offset_x = preview_x + (120 - largeur_piece) // 2 - min_x * TAILLE_CASE
     offset_y = preview_y + (120 - hauteur_piece) // 2 - min_y * TAILLE_CASE
     # Dessine chaque bloc de la pièce dans l'encadré
-    for dx, dy in blocs:
-        rect = pygame.Rect(offset_x + dx * TAILLE_CASE, offset_y + dy * TAILLE_CASE, TAILLE_CASE, TAILLE_CASE)
-        pygame.draw.rect(surface, piece.couleur, rect)
-        pygame.draw.rect(surface, NOIR, rect, 1)
+    sprite = atlas_blocs(TAILLE_CASE).bloc(piece.couleur)
+    surface.blits([(sprite, (offset_x + dx * TAILLE_CASE, offset_y + dy * TAILLE_CASE)) for dx, dy in blocs],
+                  doreturn=False)
 
 def draw_score(surface, score):
     """
@@ -337,9 +471,8 @@ def draw_score(surface, score):
     :param surface: Surface Pygame sur laquelle dessiner le score.
     :param score: Score actuel (entier).
     """
-    font = pygame.font.SysFont('Arial', 24)
-    texte_score = font.render("Score :", True, BLANC)
-    valeur_score = font.render(str(score), True, BLANC)
+    texte_score = CacheTextes().rendre("Score :", 'Arial', 24, BLANC)
+    valeur_score = CacheTextes().rendre(str(score), 'Arial', 24, BLANC)
     x = LARGEUR_JEU + 10
     surface.blit(texte_score, (x, 10))
     surface.blit(valeur_score, (x, 40))
@@ -350,7 +483,6 @@ def draw_controls(surface):
 
     :param surface: Surface Pygame sur laquelle dessiner les contrôles.
     """
-    font = pygame.font.SysFont('Arial', 14)
     controles = [
         "Contrôles :",
         "Flèche gauche : Gauche",
@@ -365,7 +497,7 @@ def draw_controls(surface):
     x = LARGEUR_JEU + 10
     y = 200  # Position verticale dans le panneau latéral
     for ligne in controles:
-        texte = font.render(ligne, True, BLANC)
+        texte = CacheTextes().rendre(ligne, 'Arial', 14, BLANC)
         surface.blit(texte, (x, y))
         y += 25
 
@@ -375,8 +507,7 @@ def draw_game_over(surface):
 
     :param surface: Surface Pygame sur laquelle dessiner le message.
     """
-    font = pygame.font.SysFont('Arial', 36)
-    texte = font.render("GAME OVER", True, BLANC)
+    texte = CacheTextes().rendre("GAME OVER", 'Arial', 36, BLANC)
     surface.blit(texte, (LARGEUR_JEU // 2 - texte.get_width() // 2,
                          HAUTEUR_FENETRE // 2 - texte.get_height() // 2))
 
@@ -386,186 +517,587 @@ def draw_pause(surface):
 
     :param surface: Surface Pygame sur laquelle dessiner le message.
     """
-    font = pygame.font.SysFont('Arial', 36)
-    texte = font.render("PAUSE", True, BLANC)
+    texte = CacheTextes().rendre("PAUSE", 'Arial', 36, BLANC)
     surface.blit(texte, (LARGEUR_JEU // 2 - texte.get_width() // 2,
                          HAUTEUR_FENETRE // 2 - texte.get_height() // 2))
 
+# =============================================================================
+# Couche statique pré-rendue (fond, grille, panneau latéral)
+# =============================================================================
+class CoucheStatique:
+    """
+    Regroupe les éléments de l'écran de jeu qui ne changent pas d'une frame à l'autre :
+    le fond et le panneau des contrôles sont rendus une seule fois sur une surface,
+    la grille sur un calque transparent (elle est dessinée par-dessus les blocs),
+    et le texte du score n'est rasterisé à nouveau que lorsque le score change.
+    """
+
+    def __init__(self):
+        self.fond = pygame.Surface((LARGEUR_FENETRE, HAUTEUR_FENETRE))
+        self.fond.fill(GRIS)
+        pygame.draw.rect(self.fond, NOIR, (0, 0, LARGEUR_JEU, HAUTEUR_FENETRE))
+        draw_controls(self.fond)
+        self.fond.blit(CacheTextes().rendre("Score :", 'Arial', 24, BLANC), (LARGEUR_JEU + 10, 10))
+
+        # Lignes de la grille sur un calque dont le noir est transparent
+        self.calque_grille = pygame.Surface((LARGEUR_JEU, HAUTEUR_FENETRE))
+        self.calque_grille.fill(NOIR)
+        draw_grid(self.calque_grille)
+        self.calque_grille.set_colorkey(NOIR)
+
+        # Conversion au format de l'écran pour des blits rapides (si une fenêtre existe)
+        if pygame.display.get_surface() is not None:
+            self.fond = self.fond.convert()
+            self.calque_grille = self.calque_grille.convert()
+
+        self.score = None
+        self.surface_score = None
+
+    def draw_fond(self, surface):
+        """
+        Dessine le fond, la zone de jeu vide, l'intitulé du score et les contrôles.
+
+        :param surface: Surface Pygame sur laquelle dessiner.
+        """
+        surface.blit(self.fond, (0, 0))
+
+    def draw_grille(self, surface):
+        """
+        Dessine les lignes de la grille par-dessus la zone de jeu.
+
+        :param surface: Surface Pygame sur laquelle dessiner.
+        """
+        surface.blit(self.calque_grille, (0, 0))
+
+    def draw_score(self, surface, score):
+        """
+        Affiche la valeur du score, rendue à nouveau uniquement si elle a changé.
+
+        :param surface: Surface Pygame sur laquelle dessiner.
+        :param score: Score actuel (entier).
+        """
+        if score != self.score:
+            self.score = score
+            # Rendu direct : chaque valeur n'est affichée qu'une fois, inutile d'encombrer le cache LRU
+            self.surface_score = CacheTextes().police('Arial', 24).render(str(score), True, BLANC)
+        surface.blit(self.surface_score, (LARGEUR_JEU + 10, 40))
+
+# =============================================================================
+# Dessin d'une frame complète
+# =============================================================================
+def progression_animation(etat):
+    """
+    Retourne l'avancement de l'animation d'effacement en cours.
+
+    :param etat: Instance de GameState.
+    :return: Nombre de 0.0 (début) à 1.0 (fin).
+    """
+    if not etat.duree_animation:
+        return 1.0
+    return min(1.0, max(0.0, 1.0 - etat.timer_animation / etat.duree_animation))
+
+def decalage_chute(etat, alpha=0.0):
+    """
+    Calcule le décalage vertical (en pixels) de la pièce active pour interpoler sa chute
+    jusqu'à la prochaine descente (une ou plusieurs lignes selon la gravité), d'après le
+    temps de chute accumulé et la fraction du tick en cours.
+
+    :param etat: Instance de GameState.
+    :param alpha: Fraction du tick logique suivant déjà écoulée (HorlogeFixe.alpha).
+    :return: Décalage en pixels, inférieur à la hauteur de la prochaine descente
+             (0 si la pièce ne peut pas descendre).
+    """
+    if etat.pause or etat.game_over or etat.en_animation:
+        return 0
+    lignes = min(etat.plateau.distance_chute(etat.piece_actuelle), etat.lignes_chute)
+    if not lignes:
+        return 0
+    fraction = (etat.fall_time + alpha * DUREE_TICK) / etat.fall_speed
+    return min(lignes * TAILLE_CASE - 1, int(fraction * lignes * TAILLE_CASE))
+
+def draw_etat(surface, etat, couche, animation=None, decalage=0):
+    """
+    Dessine une frame complète de la partie : fond, plateau, grille, pièces, score et messages.
+
+    :param surface: Surface Pygame sur laquelle dessiner.
+    :param etat: Instance de GameState à afficher.
+    :param couche: Instance de CoucheStatique (éléments pré-rendus).
+    :param animation: Instance de AnimationLignes (ANIMATION_LIGNES par défaut).
+    :param decalage: Décalage vertical de la pièce active en pixels (voir decalage_chute).
+    """
+    couche.draw_fond(surface)  # Efface l'écran avec le fond, les contrôles et l'intitulé du score
+
+    # Dessine la zone de jeu (le plateau)
+    if etat.en_animation:
+        draw_plateau(surface, etat.plateau, etat.lignes_animation, animation, progression_animation(etat))
+    else:
+        draw_plateau(surface, etat.plateau)
+    couche.draw_grille(surface)
+
+    # Affiche la pièce active ou le message Game Over
+    if not etat.game_over:
+        if not etat.en_animation:
+            draw_piece(surface, etat.piece_actuelle, TAILLE_CASE, decalage)
+        draw_next_piece(surface, etat.piece_suivante)
+    else:
+        draw_game_over(surface)
+
+    # Dessine la valeur du score (les contrôles font partie du fond)
+    couche.draw_score(surface, etat.score)
+
+    # Si le jeu est en pause, affiche le message "PAUSE"
+    if etat.pause and not etat.game_over:
+        draw_pause(surface)
+
+# =============================================================================
+# Rendu par rectangles modifiés
+# =============================================================================
+# Zones du panneau latéral redessinées lorsque leur contenu change
+# (la pièce I, centrée dans l'encadré de 120 px, dépasse de 10 px à droite ou en bas)
+ZONE_APERCU = pygame.Rect(LARGEUR_JEU + 40, 40, 130, 130)
+ZONE_SCORE = pygame.Rect(LARGEUR_JEU + 10, 40, LARGEUR_FENETRE - LARGEUR_JEU - 10, 30)
+
+class ZonesModifiees:
+    """
+    Compare ce qui est affiché à ce qui l'était à la frame précédente (cases du plateau,
+    empreinte de la pièce active, lignes animées, aperçu, score) et retourne les rectangles
+    de l'écran à redessiner et à transmettre à pygame.display.update(rects).
+    Une liste vide signifie que la frame peut être sautée.
+    """
+
+    def __init__(self, animation=None):
+        """
+        :param animation: Instance de AnimationLignes utilisée pour l'affichage (ANIMATION_LIGNES par défaut).
+        """
+        self.animation = animation or ANIMATION_LIGNES
+        self.invalider()
+
+    def invalider(self):
+        """Force le rendu complet de la prochaine frame (premier affichage, fenêtre réexposée)."""
+        self.rangees = None        # Copie des rangées de couleurs affichées
+        self.plateau = None        # Plateau et version correspondant à self.rangees
+        self.version = None
+        self.piece = (frozenset(), 0)  # Cases de la pièce active et décalage vertical en pixels
+        self.phase_animation = None  # (lignes animées, phase de l'effet) ou None
+        self.apercu = None         # (forme, rotation) de la pièce suivante affichée
+        self.score = None
+        self.messages = None       # (game_over, pause)
+
+    def calculer(self, etat, temps, decalage=0):
+        """
+        Met à jour l'état mémorisé et retourne les zones modifiées.
+
+        :param etat: Instance de GameState affichée.
+        :param temps: Temps courant en millisecondes (phase de l'effet sur les lignes animées).
+        :param decalage: Décalage vertical de la pièce active en pixels (voir decalage_chute).
+        :return: Liste de pygame.Rect.
+        """
+        plateau = etat.plateau
+        zones = []
+        messages = (etat.game_over, etat.pause)
+        complet = self.rangees is None or len(self.rangees) != plateau.hauteur or messages != self.messages
+        self.messages = messages
+
+        # Cases du plateau (comparées seulement si le plateau a changé) : seules les colonnes
+        # modifiées de chaque rangée sont retenues
+        if complet or plateau is not self.plateau or plateau.version != self.version:
+            # Les rangées du plateau sont immuables : la liste suffit comme copie
+            rangees = list(plateau.couleurs)
+            if not complet:
+                for lig, (ancienne, rangee) in enumerate(zip(self.rangees, rangees)):
+                    if ancienne != rangee:
+                        cols = [col for col in range(plateau.largeur) if ancienne[col] != rangee[col]]
+                        zones.append(pygame.Rect(cols[0] * TAILLE_CASE, lig * TAILLE_CASE,
+                                                 (cols[-1] - cols[0] + 1) * TAILLE_CASE, TAILLE_CASE))
+            self.rangees = rangees
+            self.plateau, self.version = plateau, plateau.version
+
+        # Lignes animées : redessinées à chaque changement de phase de l'effet
+        phase_animation = None
+        if etat.en_animation:
+            phase_animation = (tuple(etat.lignes_animation),
+                               self.animation.phase(temps, progression_animation(etat)))
+        if phase_animation != self.phase_animation:
+            for lignes in (self.phase_animation, phase_animation):
+                for lig in (lignes[0] if lignes else ()):
+                    zones.append(pygame.Rect(0, lig * TAILLE_CASE, LARGEUR_JEU, TAILLE_CASE))
+            self.phase_animation = phase_animation
+
+        # Pièce active : ancienne et nouvelle empreinte (décalage de la chute interpolée compris)
+        piece = (frozenset(), 0)
+        if not etat.game_over and not etat.en_animation:
+            piece = (frozenset(etat.piece_actuelle.get_cases()), decalage)
+        if piece != self.piece:
+            for cases, decalage_cases in (self.piece, piece):
+                if cases:
+                    cols = [col for col, _ in cases]
+                    ligs = [lig for _, lig in cases]
+                    zones.append(pygame.Rect(min(cols) * TAILLE_CASE, min(ligs) * TAILLE_CASE + decalage_cases,
+                                             (max(cols) - min(cols) + 1) * TAILLE_CASE,
+                                             (max(ligs) - min(ligs) + 1) * TAILLE_CASE))
+            self.piece = piece
+
+        # Panneau latéral : aperçu de la pièce suivante et score
+        apercu = None if etat.game_over else (etat.piece_suivante.forme, etat.piece_suivante.rotation)
+        if apercu != self.apercu:
+            zones.append(ZONE_APERCU)
+            self.apercu = apercu
+        if etat.score != self.score:
+            zones.append(ZONE_SCORE)
+            self.score = etat.score
+
+        if complet:
+            return [pygame.Rect(0, 0, LARGEUR_FENETRE, HAUTEUR_FENETRE)]
+        return zones
+
 # =============================================================================
 # Boucle principale du jeu
 # =============================================================================
-def main():
+# Correspondance entre les touches du clavier et les actions du moteur
+TOUCHES_ACTIONS = {
+    pygame.K_LEFT: ACTION_GAUCHE,
+    pygame.K_RIGHT: ACTION_DROITE,
+    pygame.K_UP: ACTION_ROTATION,
+    pygame.K_DOWN: ACTION_DESCENTE,
+    pygame.K_SPACE: ACTION_CHUTE,
+    pygame.K_p: ACTION_PAUSE,
+}
+
+def nouvelle_partie(enregistrer=False, courbe=COURBE_CLASSIQUE):
+    """
+    Crée une partie avec une graine tirée au hasard, et son enregistreur de replay si demandé.
+
+    :param enregistrer: Si True, la partie est enregistrée (courbe classique uniquement : avec
+                        une autre courbe, un avertissement est affiché et rien n'est enregistré).
+    :param courbe: Courbe de niveaux de la partie (engine.CourbeNiveaux).
+    :return: Couple (GameState, EnregistreurReplay ou None).
+    """
+    # Le format des replays ne décrit pas la courbe de niveaux (voir EnregistreurReplay)
+    if enregistrer and courbe is not COURBE_CLASSIQUE:
+        print("Attention: seules les parties jouées avec la courbe de niveaux classique sont enregistrées.")
+        enregistrer = False
+    graine = random.getrandbits(63)
+    etat = GameState(NB_COLONNES, NB_LIGNES, graine, courbe=courbe)
+    return etat, (EnregistreurReplay(etat, graine) if enregistrer else None)
+
+def afficher(screen, etat, couche, animation, suivi, rendu_partiel=RENDU_PARTIEL, decalage=0):
+    """
+    Dessine une frame de la partie et la transmet à l'écran ; en rendu partiel, seules les
+    zones modifiées sont redessinées et la frame est sautée si rien n'a changé.
+
+    :param screen: Surface de la fenêtre.
+    :param etat: Instance de GameState affichée (partie locale ou miroir d'une partie distante).
+    :param couche: Instance de CoucheStatique.
+    :param animation: Instance de AnimationLignes.
+    :param suivi: Instance de ZonesModifiees.
+    :param rendu_partiel: Voir main().
+    :param decalage: Décalage vertical de la pièce active en pixels (voir decalage_chute).
+    """
+    if rendu_partiel:
+        zones = suivi.calculer(etat, pygame.time.get_ticks(), decalage)
+        if not zones:
+            return  # Rien n'a changé : la frame est sautée
+        # Le dessin est limité au rectangle englobant les zones modifiées
+        screen.set_clip(zones[0].unionall(zones[1:]))
+
+    draw_etat(screen, etat, couche, animation, decalage)
+
+    if rendu_partiel:
+        screen.set_clip(None)
+        pygame.display.update(zones)  # Transmet uniquement les zones modifiées
+    else:
+        pygame.display.flip()  # Met à jour l'affichage
+
+def jouer_versus(screen, clock, couche, animation, suivi, adresse, rendu_partiel=RENDU_PARTIEL,
+                 images_par_seconde=IMAGES_PAR_SECONDE, autoplay=False):
+    """
+    Boucle d'une partie versus contre un autre joueur, en client du serveur (serveur_versus.py).
+    Les touches sont envoyées au serveur, qui applique les règles ; la partie affichée est
+    un miroir mis à jour par les messages reçus (versus.appliquer_vue), dessiné par les
+    mêmes fonctions que la partie locale. La situation de l'adversaire (score, déchets en
+    attente) s'affiche dans le titre de la fenêtre.
+
+    :param screen: Surface de la fenêtre.
+    :param clock: Horloge pygame de la boucle.
+    :param couche: Instance de CoucheStatique.
+    :param animation: Instance de AnimationLignes.
+    :param suivi: Instance de ZonesModifiees.
+    :param adresse: Adresse du serveur, "hôte" ou "hôte:port".
+    :param rendu_partiel: Voir main().
+    :param images_par_seconde: Voir main().
+    :param autoplay: Si True, le joueur automatique joue (touche A pour basculer).
+    :return: False si le serveur est injoignable (rien n'a été joué), sinon True.
+    """
+    hote, _, port = adresse.partition(":")
+    port = int(port) if port else PORT_DEFAUT
+    try:
+        client = ClientVersus(hote, port)
+    except OSError as e:
+        print(f"Erreur de connexion au serveur de versus '{adresse}': {e}")
+        return False
+    etat = None        # Miroir de la partie du joueur, créé au début du match
+    joueur = None      # Indice du joueur dans le match
+    resultat = None    # Titre affiché à la fin du match
+    pilote = PiloteAutomatique() if autoplay else None
+    titre = None
+
+    running = True
+    while running:
+        dt = clock.tick(images_par_seconde)
+        for event in pygame.event.get():
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                suivi.invalider()
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                # Après un match, la touche R cherche un nouvel adversaire
+                if event.key == pygame.K_r and resultat is not None:
+                    try:
+                        nouveau = ClientVersus(hote, port)
+                    except OSError as e:
+                        # Le match terminé reste affiché : R retente la connexion
+                        print(f"Erreur de connexion au serveur de versus '{adresse}': {e}")
+                        resultat = "serveur injoignable"
+                    else:
+                        client.fermer()
+                        client = nouveau
+                        etat = joueur = resultat = None
+                if event.key == pygame.K_a:
+                    pilote = None if pilote is not None else PiloteAutomatique()
+                # Pas de pause en versus : seules les actions de jeu sont envoyées
+                action = TOUCHES_ACTIONS.get(event.key)
+                if etat is not None and action not in (None, ACTION_PAUSE):
+                    client.envoyer_action(action)
+
+        for message in client.recevoir():
+            if message is None:
+                resultat = resultat or "connexion perdue"
+            elif message["type"] == "debut":
+                etat = creer_miroir(message)
+                joueur = message["joueur"]
+                suivi.invalider()
+            elif message["type"] == "etat":
+                for evenement in appliquer_vue(etat, message["joueurs"][joueur]):
+                    SoundManager().play_sound(evenement)
+                adversaire = message["joueurs"][1 - joueur]
+                titre = (f"Tetris - versus : adversaire {adversaire['score']} points, "
+                         f"{etat.attente} ligne(s) en attente")
+            elif message["type"] == "fin":
+                etat.game_over = True
+                resultat = "victoire" if message["gagnant"] == joueur else "défaite"
+        if resultat is not None:
+            titre = f"Tetris - versus : {resultat} (R : nouveau match, Echap : quitter)"
+        elif etat is None:
+            titre = "Tetris - versus : en attente d'un adversaire..."
+        if titre != pygame.display.get_caption()[0]:
+            pygame.display.set_caption(titre)
+        if etat is None:
+            continue
+
+        # Le joueur automatique n'agit que sur un miroir à jour (dernière action acquittée)
+        if pilote is not None and resultat is None and etat.actions_traitees == client.actions_envoyees:
+            action = pilote.action(etat)
+            if action != ACTION_AUCUNE:
+                client.envoyer_action(action)
+        # L'animation d'effacement avance localement entre deux messages
+        if etat.en_animation:
+            etat.timer_animation = max(0, etat.timer_animation - dt)
+        afficher(screen, etat, couche, animation, suivi, rendu_partiel)
+    client.fermer()
+    return True
+
+def regarder_partie(screen, clock, couche, animation, suivi, adresse, rendu_partiel=RENDU_PARTIEL,
+                    images_par_seconde=IMAGES_PAR_SECONDE):
+    """
+    Boucle d'un spectateur : la partie diffusée (spectateur.py) est reconstruite à partir des
+    trames reçues (spectateur.appliquer_trame) et dessinée par les mêmes fonctions que la
+    partie locale. Les touches ne servent qu'à quitter (Echap).
+
+    :param screen: Surface de la fenêtre.
+    :param clock: Horloge pygame de la boucle.
+    :param couche: Instance de CoucheStatique.
+    :param animation: Instance de AnimationLignes.
+    :param suivi: Instance de ZonesModifiees.
+    :param adresse: Adresse de la diffusion, "hôte" ou "hôte:port".
+    :param rendu_partiel: Voir main().
+    :param images_par_seconde: Voir main().
+    :return: False si la diffusion est injoignable (rien n'a été affiché), sinon True.
+    """
+    hote, _, port = adresse.partition(":")
+    try:
+        client = ClientSpectateur(hote, int(port) if port else PORT_SPECTATEURS)
+    except OSError as e:
+        print(f"Erreur de connexion à la diffusion '{adresse}': {e}")
+        return False
+    etat = None        # Partie reconstruite, créée à la première image clé
+    pygame.display.set_caption("Tetris - spectateur")
+
+    running = True
+    while running:
+        clock.tick(images_par_seconde)
+        for event in pygame.event.get():
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                suivi.invalider()
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        for trame in client.recevoir():
+            if trame is None:
+                pygame.display.set_caption("Tetris - spectateur : diffusion terminée")
+                continue
+            etat, evenements = appliquer_trame(etat, trame)
+            for evenement in evenements:
+                SoundManager().play_sound(evenement)
+        if etat is not None:
+            afficher(screen, etat, couche, animation, suivi, rendu_partiel)
+    client.fermer()
+    return True
+
+def main(rendu_partiel=RENDU_PARTIEL, effet_animation=EFFET_FLASH, images_par_seconde=IMAGES_PAR_SECONDE,
+         rendu=True, interpolation=True, dossier_replays=DOSSIER_REPLAYS, autoplay=False,
+         courbe=COURBE_CLASSIQUE, serveur=None, spectateur=None):
     """
     Point d'entrée du jeu Tetris.
     
-    Gère la boucle principale, le traitement des événements, la logique de jeu,
-    l'affichage de la grille, des pièces, du score, des animations et du panneau latéral.
+    Gère la boucle principale, le traitement des événements et l'affichage de la grille,
+    des pièces, du score, des animations et du panneau latéral. Les règles du jeu sont
+    déléguées au moteur sans affichage (engine.GameState), qui avance par ticks logiques de
+    durée fixe (DUREE_TICK) : après une frame lente, autant de ticks que nécessaire sont
+    exécutés, si bien que la chute ne dépend pas du rythme d'affichage.
+
+    :param rendu_partiel: Si True, seules les zones modifiées depuis la frame précédente sont
+                          redessinées et mises à jour ; les frames sans changement sont sautées.
+    :param effet_animation: Effet d'effacement des lignes (EFFET_FLASH, EFFET_FONDU ou EFFET_EFFONDREMENT).
+    :param images_par_seconde: Nombre maximal d'images par seconde (0 : pas de limite).
+    :param rendu: Si False, rien n'est dessiné (la fenêtre ne sert qu'à recevoir les touches).
+    :param interpolation: Si True, la pièce active descend de façon continue entre deux lignes.
+    :param dossier_replays: Dossier où enregistrer le replay de chaque partie (None : désactivé).
+                            Les replays se vérifient avec replay.py ; seules les parties jouées
+                            avec COURBE_CLASSIQUE sont enregistrées.
+    :param autoplay: Si True, la partie est jouée par le joueur automatique (bot.py) ;
+                     la touche A active ou désactive ce mode en cours de partie.
+    :param courbe: Courbe de niveaux et de gravité (engine.COURBE_CLASSIQUE, engine.COURBE_RAPIDE
+                   jusqu'à la gravité instantanée 20G, ou une CourbeNiveaux personnalisée).
+    :param serveur: Adresse d'un serveur de versus ("hôte" ou "hôte:port") : la partie se joue
+                    alors contre un autre joueur (voir jouer_versus) au lieu d'une partie locale
+                    (sauf si le serveur est injoignable).
+    :param spectateur: Adresse d'une diffusion ("hôte" ou "hôte:port", voir spectateur.py) :
+                       la partie diffusée est regardée (voir regarder_partie) au lieu d'être jouée
+                       (sauf si la diffusion est injoignable).
     """
     pygame.init()
+    SoundManager().demarrer()  # Sons chargés et joués par le thread audio : le jeu n'attend pas
     SoundManager().play_music()
     screen = pygame.display.set_mode((LARGEUR_FENETRE, HAUTEUR_FENETRE))
     pygame.display.set_caption("Tetris")
     clock = pygame.time.Clock()
+    horloge = HorlogeFixe()    # Ticks logiques de durée fixe
+    couche = CoucheStatique()  # Fond, grille et panneau latéral pré-rendus
+    animation = AnimationLignes(effet_animation)
+    suivi = ZonesModifiees(animation)  # Zones de l'écran modifiées d'une frame à l'autre
 
-    # Initialisation du plateau et des pièces
-    plateau = PlateauDeJeu(NB_COLONNES, NB_LIGNES)
-    piece_actuelle = new_piece()
-    piece_suivante = new_piece()
-    fall_speed = VITESSE_CHUTE_INIT   # Vitesse de chute initiale (en millisecondes)
-    fall_time = 0                     # Temps accumulé depuis la dernière descente
-    score = 0                         # Score du joueur
-    game_over = False                 # Indique si le jeu est terminé
-    pause = False                     # Indique si le jeu est en pause
-
-    # Variables pour gérer l'animation d'effacement des lignes
-    en_animation = False              # Indique si l'animation est en cours
-    lignes_animation = []             # Liste des indices de lignes à animer
-    timer_animation = 0               # Timer pour l'animation d'effacement
-    
+    if serveur is not None or spectateur is not None:
+        if serveur is not None:
+            connecte = jouer_versus(screen, clock, couche, animation, suivi, serveur, rendu_partiel,
+                                    images_par_seconde, autoplay)
+        else:
+            connecte = regarder_partie(screen, clock, couche, animation, suivi, spectateur, rendu_partiel,
+                                       images_par_seconde)
+        if connecte:
+            SoundManager().stop_music()
+            SoundManager().arreter()
+            pygame.quit()
+            return
+        # Serveur ou diffusion injoignable : une partie locale est lancée à la place
+        pygame.display.set_caption("Tetris")
+
+    # Initialisation de la partie (plateau, pièces, score, vitesse de chute)
+    etat, enregistreur = nouvelle_partie(dossier_replays is not None, courbe)
+    pilote = PiloteAutomatique() if autoplay else None
+    bilan_affiche = False
 
     running = True
     while running:
         # dt correspond au temps écoulé en millisecondes depuis la dernière itération de la boucle
-        dt = clock.tick(60)  # Limite le jeu à 60 FPS
-
-        # Incrémente le temps de chute seulement si le jeu n'est pas en pause et qu'aucune animation n'est en cours
-        if not pause and not en_animation:
-            fall_time += dt
+        dt = clock.tick(images_par_seconde)  # Limite le nombre d'images par seconde
 
         # =============================================================================
         # Traitement des événements
         # =============================================================================
         for event in pygame.event.get():
+            # La fenêtre a été recouverte ou restaurée : tout doit être redessiné
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                suivi.invalider()
+
             if event.type == pygame.QUIT:
                 SoundManager().stop_music()
                 running = False
+                if enregistreur is not None:
+                    enregistreur.sauvegarder(dossier_replays)
+                    enregistreur = None
 
             # Gestion des événements clavier
             if event.type == pygame.KEYDOWN:
                 # Si la touche R est pressée après un Game Over, redémarre le jeu
-                if event.key == pygame.K_r and game_over:
-                    plateau = PlateauDeJeu(NB_COLONNES, NB_LIGNES)
-                    piece_actuelle = new_piece()
-                    piece_suivante = new_piece()
-                    score = 0
-                    fall_speed = VITESSE_CHUTE_INIT
-                    game_over = False
-                    fall_time = 0
-                    pause = False
-                    en_animation = False
+                if event.key == pygame.K_r and etat.game_over:
+                    etat, enregistreur = nouvelle_partie(dossier_replays is not None, courbe)
+                    bilan_affiche = False
                 # Si la touche Echap est pressée après un Game Over, renvoie sur le home_screen
                 if event.key == pygame.K_ESCAPE:
+                        if enregistreur is not None:
+                            enregistreur.sauvegarder(dossier_replays)
                         SoundManager().stop_music()
+                        SoundManager().arreter()
                         pygame.quit()
                         import home_screen
                         menu = home_screen.TetrisMenu()
                         menu.run()
                         sys.exit()
-                # Bascule le mode pause avec la touche P (si le jeu n'est pas en animation)
-                if event.key == pygame.K_p and not game_over and not en_animation:
-                    pause = not pause
-                # Si le jeu n'est pas en pause, en animation ou terminé, on gère les déplacements et la rotation
-                if not pause and not en_animation and not game_over:
-                    if event.key == pygame.K_LEFT:
-                        if plateau.is_valid_move(piece_actuelle, dx=-TAILLE_CASE):
-                            piece_actuelle.move_side(-TAILLE_CASE)
-                    elif event.key == pygame.K_RIGHT:
-                        if plateau.is_valid_move(piece_actuelle, dx=TAILLE_CASE):
-                            piece_actuelle.move_side(TAILLE_CASE)
-                    elif event.key == pygame.K_DOWN:
-                        if plateau.is_valid_move(piece_actuelle, dy=TAILLE_CASE):
-                            piece_actuelle.move_down()
-                    elif event.key == pygame.K_UP:
-                        # Effectue la rotation ; en cas d'invalidité, annule la rotation
-                        old_rot = piece_actuelle.rotate()
-                        if not plateau.is_valid_move(piece_actuelle):
-                            piece_actuelle.rotate_back(old_rot)
-                    elif event.key == pygame.K_SPACE:
-                        # Descente rapide (hard drop) : la pièce descend jusqu'à ce qu'elle ne puisse plus se déplacer
-                        while plateau.is_valid_move(piece_actuelle, dy=TAILLE_CASE):
-                            piece_actuelle.move_down()
-                        # Force le verrouillage immédiat en réinitialisant le timer de chute
-                        fall_time = fall_speed
+                # La touche A active ou désactive le joueur automatique
+                if event.key == pygame.K_a:
+                    pilote = None if pilote is not None else PiloteAutomatique()
+                # Déplacements, rotation, descente et pause sont appliqués par le moteur
+                action = TOUCHES_ACTIONS.get(event.key)
+                if action is not None:
+                    etat.appliquer(action)
+                    if enregistreur is not None:
+                        enregistreur.action(action)
 
         # =============================================================================
-        # Logique de mise à jour du jeu
+        # Logique de mise à jour du jeu : autant de ticks fixes que le temps écoulé en contient
         # =============================================================================
-        if not pause and not game_over:
-            if not en_animation:
-                # Vérifie si le temps écoulé est suffisant pour faire descendre la pièce d'une case
-                if fall_time >= fall_speed:
-                    if plateau.is_valid_move(piece_actuelle, dy=TAILLE_CASE):
-                        # La pièce descend normalement
-                        piece_actuelle.move_down()
-                    else:
-                        # La pièce ne peut plus descendre et est verrouillée sur le plateau
-                        plateau.lock_piece(piece_actuelle)
-                        SoundManager().play_sound('piece_drop')
-                        # Vérifie la présence de lignes complètes
-                        lignes_completes = plateau.get_lignes_completes()
-                        if lignes_completes:
-                            # Lance l'animation d'effacement des lignes
-                            en_animation = True
-                            lignes_animation = lignes_completes
-                            timer_animation = DUREE_ANIMATION_LIGNE
-                            SoundManager().play_sound('line_clear')
-                        else:
-                            # Passe à la pièce suivante
-                            piece_actuelle = piece_suivante
-                            piece_suivante = new_piece()
-                            # Si la nouvelle pièce ne peut pas être placée, le jeu est terminé
-                            if not plateau.is_valid_move(piece_actuelle):
-                                game_over = True
-                    # Réinitialise le compteur de temps de chute
-                    fall_time = 0
-            else:
-                # Si une animation d'effacement est en cours, on décrémente le timer d'animation
-                timer_animation -= dt
-                if timer_animation <= 0:
-                    # Une fois l'animation terminée, efface les lignes et met à jour le score
-                    nb_lignes = len(lignes_animation)
-                    plateau.effacer_lignes(lignes_animation)
-                    score += nb_lignes * 100
-                    # Ajuste la vitesse de chute en fonction du score (plancher à 100 ms)
-                    fall_speed = max(100, VITESSE_CHUTE_INIT - (score // 500) * 20)
-                    en_animation = False
-                    lignes_animation = []
-                    # Passe à la pièce suivante
-                    piece_actuelle = piece_suivante
-                    piece_suivante = new_piece()
-                    # Si la nouvelle pièce ne peut pas être placée, le jeu est terminé
-                    if not plateau.is_valid_move(piece_actuelle):
-                        game_over = True
-                    fall_time = 0
+        for _ in range(horloge.avancer(dt)):
+            # Le joueur automatique agit comme le clavier : une action par tick, enregistrée
+            if pilote is not None:
+                action = pilote.action(etat)
+                if action != ACTION_AUCUNE:
+                    etat.appliquer(action)
+                    if enregistreur is not None:
+                        enregistreur.action(action)
+            for evenement in etat.step(dt=horloge.duree_tick):
+                SoundManager().play_sound(evenement)
+            if enregistreur is not None:
+                enregistreur.tick()
+        # Le replay d'une partie terminée est écrit une seule fois
+        if enregistreur is not None and etat.game_over:
+            enregistreur.sauvegarder(dossier_replays)
+            enregistreur = None
+        # Performances du joueur automatique, affichées une fois par partie terminée
+        if pilote is not None and etat.game_over and not bilan_affiche:
+            print(f"Joueur automatique : {pilote.recherche.noeuds} nœuds, "
+                  f"{pilote.recherche.noeuds_par_seconde:.0f} nœuds/s")
+            bilan_affiche = True
 
         # =============================================================================
         # Phase de dessin / affichage
         # =============================================================================
-        screen.fill(GRIS)  # Efface l'écran avec la couleur de fond
-
-        # Dessine la zone de jeu (le plateau)
-        pygame.draw.rect(screen, NOIR, (0, 0, LARGEUR_JEU, HAUTEUR_FENETRE))
-        plateau.draw(screen, lignes_animation if en_animation else None)
-        draw_grid(screen)
-
-        # Affiche la pièce active ou le message Game Over
-        if not game_over:
-            if not en_animation:
-                piece_actuelle.draw(screen)
-            draw_next_piece(screen, piece_suivante)
-        else:
-            draw_game_over(screen)
-
-        # Dessine le score et les contrôles dans le panneau latéral
-        draw_score(screen, score)
-        draw_controls(screen)
-
-        # Si le jeu est en pause, affiche le message "PAUSE"
-        if pause and not game_over:
-            draw_pause(screen)
-
-        pygame.display.flip()  # Met à jour l'affichage
+        if not rendu:
+            continue
+        decalage = decalage_chute(etat, horloge.alpha) if interpolation else 0
+        afficher(screen, etat, couche, animation, suivi, rendu_partiel, decalage)
 
+    SoundManager().arreter()
     pygame.quit()
 
 # =============================================================================
@@ -0,0 +1,121 @@
+"""
+Politiques de placement pour les parties sans affichage.
+Une politique est construite par une fabrique à partir d'une graine (fabrique(graine)),
+puis appelée à chaque pièce avec l'état de la partie (engine.GameState) ; elle retourne
+le placement choisi sous la forme (col, rotation), parmi ceux de Plateau.placements().
+"""
+
+import importlib
+import random
+
+from engine import FORMES, PROFILS
+
+# =============================================================================
+# Poids de l'heuristique d'évaluation d'un placement
+# =============================================================================
+POIDS_HAUTEUR = -0.51      # Somme des hauteurs de colonnes
+POIDS_LIGNES = 0.76        # Lignes complétées par le placement
+POIDS_TROUS = -0.36        # Cases vides recouvertes par la pièce
+POIDS_BOSSES = -0.18       # Somme des écarts de hauteur entre colonnes voisines
+
+# =============================================================================
+# Évaluation d'un placement sans copier le plateau
+# =============================================================================
+def evaluer_placement(plateau, forme, col, rotation, lig):
+    """
+    Évalue un placement à partir des masques de lignes et des hauteurs de colonnes du
+    plateau, sans le modifier.
+
+    :param plateau: Instance de engine.Plateau.
+    :param forme: Identifiant de la forme.
+    :param col: Colonne du coin supérieur gauche de la pièce posée.
+    :param rotation: Indice de rotation de la pièce.
+    :param lig: Ligne du coin supérieur gauche de la pièce posée.
+    :return: Score du placement (plus il est élevé, meilleur est le placement).
+    """
+    hauteur = plateau.hauteur
+    hauteurs = list(plateau.hauteurs)
+    # Lignes complétées : la ligne du plateau plus les blocs de la pièce forment une ligne pleine
+    nb_lignes = 0
+    col_min, masques_par_colonne = plateau.masques[forme][rotation]
+    for dy, masque in masques_par_colonne[col - col_min]:
+        lig_bloc = lig + dy
+        if lig_bloc >= 0 and plateau.lignes[lig_bloc] | masque == plateau.ligne_pleine:
+            nb_lignes += 1
+    # Trous créés sous la pièce dans chaque colonne qu'elle couvre
+    nb_trous = 0
+    for dx, dy in PROFILS[forme][rotation]:
+        nb_trous += hauteur - 1 - (lig + dy) - hauteurs[col + dx]
+    for dx, dy in FORMES[forme][rotation]:
+        hauteurs[col + dx] = max(hauteurs[col + dx], hauteur - (lig + dy))
+    hauteur_totale = sum(hauteurs) - nb_lignes * plateau.largeur
+    bosses = sum(abs(a - b) for a, b in zip(hauteurs, hauteurs[1:]))
+    return (POIDS_HAUTEUR * hauteur_totale + POIDS_LIGNES * nb_lignes
+            + POIDS_TROUS * nb_trous + POIDS_BOSSES * bosses)
+
+# =============================================================================
+# Politiques disponibles
+# =============================================================================
+def politique_aleatoire(graine=None):
+    """
+    Fabrique une politique qui choisit un placement au hasard.
+
+    :param graine: Graine du générateur aléatoire de la politique.
+    :return: Fonction etat -> (col, rotation).
+    """
+    rng = random.Random(graine)
+
+    def choisir(etat):
+        col, rotation, _ = rng.choice(etat.plateau.placements(etat.piece_actuelle.forme))
+        return col, rotation
+    return choisir
+
+def politique_heuristique(graine=None):
+    """
+    Fabrique une politique gloutonne qui choisit le placement le mieux évalué
+    par evaluer_placement.
+
+    :param graine: Ignorée (politique déterministe), présente pour l'interface commune.
+    :return: Fonction etat -> (col, rotation).
+    """
+    def choisir(etat):
+        plateau = etat.plateau
+        forme = etat.piece_actuelle.forme
+        col, rotation, _ = max(plateau.placements(forme),
+                               key=lambda placement: evaluer_placement(plateau, forme, *placement))
+        return col, rotation
+    return choisir
+
+def politique_recherche(graine=None):
+    """
+    Fabrique une politique qui choisit ses placements par une recherche en faisceau sur la
+    pièce courante et la pièce suivante (voir bot.RechercheFaisceau).
+
+    :param graine: Ignorée (politique déterministe), présente pour l'interface commune.
+    :return: Fonction etat -> (col, rotation).
+    """
+    # Import différé : le module bot dépend des poids définis ici
+    from bot import politique_recherche as fabrique
+    return fabrique(graine)
+
+# Politiques accessibles par leur nom (options en ligne de commande)
+POLITIQUES = {
+    "aleatoire": politique_aleatoire,
+    "heuristique": politique_heuristique,
+    "recherche": politique_recherche,
+}
+
+def charger_politique(nom):
+    """
+    Retourne la fabrique de politique correspondant à un nom : soit une clé de POLITIQUES,
+    soit un chemin "module:fonction" vers une fabrique définie ailleurs.
+
+    :param nom: Nom de la politique.
+    :return: Fabrique graine -> politique.
+    """
+    if nom in POLITIQUES:
+        return POLITIQUES[nom]
+    module, _, attribut = nom.partition(":")
+    if not attribut:
+        raise ValueError(f"Politique inconnue : '{nom}' (choix : {', '.join(POLITIQUES)} ou module:fonction)")
+    return getattr(importlib.import_module(module), attribut)
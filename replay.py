@@ -0,0 +1,334 @@
+"""
+Enregistrement et vérification des parties (replays).
+
+Un replay contient la graine et le mode du générateur de pièces, la suite des formes
+jouées et les actions du joueur avec le tick logique auquel elles ont été appliquées,
+ainsi que le résultat annoncé (score, lignes, pièces). La vérification rejoue la partie
+sans affichage avec les règles du moteur (engine.GameState, partagées par PlateauDeJeu et
+Tetris) et compare le résultat obtenu au résultat annoncé.
+
+Format binaire (petit-boutiste) :
+    en-tête  ENTETE (voir ci-dessous)
+    formes   indices dans LISTE_FORMES, deux par octet (4 bits chacun)
+    actions  un entier variable (LEB128) par action : (écart en ticks << 3) | action
+
+Utilisation en ligne de commande :
+    python replay.py replays/*.trpl --processus 4
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (GameState, GenerateurPieces, LISTE_FORMES, MODE_ALEATOIRE, MODE_SAC, DUREE_TICK,
+                    DUREE_ANIMATION_LIGNE, NB_COLONNES, NB_LIGNES, COURBE_CLASSIQUE)
+
+# =============================================================================
+# Format du fichier
+# =============================================================================
+MAGIQUE = b"TRPL"
+VERSION = 1
+EXTENSION = ".trpl"
+# magique, version, mode, largeur, hauteur, durée d'animation, durée d'un tick, graine,
+# nb_ticks, score, nb_lignes, nb_pieces, nb_formes, nb_actions
+ENTETE = struct.Struct("<4sBBBHHBQIIIIII")
+MODES = (MODE_ALEATOIRE, MODE_SAC)
+INDICES_FORMES = {forme: indice for indice, forme in enumerate(LISTE_FORMES)}
+
+def _ecrire_varint(sortie, valeur):
+    """Ajoute un entier positif encodé sur un nombre variable d'octets (7 bits par octet)."""
+    while valeur >= 0x80:
+        sortie.append(valeur & 0x7F | 0x80)
+        valeur >>= 7
+    sortie.append(valeur)
+
+def _lire_varint(donnees, position):
+    """Lit un entier encodé par _ecrire_varint ; retourne (valeur, position suivante)."""
+    valeur = 0
+    decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return valeur, position
+        decalage += 7
+
+# =============================================================================
+# Classe Replay (contenu d'un replay et (dé)sérialisation)
+# =============================================================================
+class Replay:
+    def __init__(self, graine, mode_pieces=MODE_ALEATOIRE, largeur=NB_COLONNES, hauteur=NB_LIGNES,
+                 duree_animation=DUREE_ANIMATION_LIGNE, duree_tick=DUREE_TICK):
+        """
+        Initialise un replay vide.
+
+        :param graine: Graine entière du générateur de pièces de la partie.
+        :param mode_pieces: MODE_ALEATOIRE ou MODE_SAC.
+        :param largeur: Nombre de colonnes de la grille.
+        :param hauteur: Nombre de lignes de la grille.
+        :param duree_animation: Durée de l'animation d'effacement en millisecondes.
+        :param duree_tick: Durée d'un tick logique en millisecondes.
+        """
+        self.graine = graine
+        self.mode_pieces = mode_pieces
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.duree_animation = duree_animation
+        self.duree_tick = duree_tick
+        self.formes = bytearray()   # Indices (LISTE_FORMES) des pièces mises en jeu, dans l'ordre
+        self.actions = []           # Couples (tick, action), ticks croissants
+        self.nb_ticks = 0
+        # Résultat annoncé
+        self.score = 0
+        self.nb_lignes = 0
+        self.nb_pieces = 0
+
+    def encoder(self):
+        """
+        :return: Représentation binaire du replay (bytes).
+        """
+        sortie = bytearray(ENTETE.pack(
+            MAGIQUE, VERSION, MODES.index(self.mode_pieces), self.largeur, self.hauteur,
+            self.duree_animation, self.duree_tick, self.graine, self.nb_ticks, self.score,
+            self.nb_lignes, self.nb_pieces, len(self.formes), len(self.actions)))
+        formes = self.formes
+        for i in range(0, len(formes), 2):
+            sortie.append(formes[i] | (formes[i + 1] << 4 if i + 1 < len(formes) else 0))
+        tick_precedent = 0
+        for tick, action in self.actions:
+            _ecrire_varint(sortie, (tick - tick_precedent) << 3 | action)
+            tick_precedent = tick
+        return bytes(sortie)
+
+    @classmethod
+    def decoder(cls, donnees):
+        """
+        :param donnees: Représentation binaire produite par encoder().
+        :return: Instance de Replay.
+        """
+        (magique, version, mode, largeur, hauteur, duree_animation, duree_tick, graine, nb_ticks,
+         score, nb_lignes, nb_pieces, nb_formes, nb_actions) = ENTETE.unpack_from(donnees)
+        if magique != MAGIQUE or version != VERSION:
+            raise ValueError("Fichier de replay invalide ou de version non prise en charge")
+        replay = cls(graine, MODES[mode], largeur, hauteur, duree_animation, duree_tick)
+        replay.nb_ticks, replay.score, replay.nb_lignes, replay.nb_pieces = nb_ticks, score, nb_lignes, nb_pieces
+        position = ENTETE.size
+        fin_formes = position + (nb_formes + 1) // 2
+        formes = replay.formes
+        for octet in donnees[position:fin_formes]:
+            formes.append(octet & 0x0F)
+            formes.append(octet >> 4)
+        del formes[nb_formes:]
+        position = fin_formes
+        tick = 0
+        actions = replay.actions
+        for _ in range(nb_actions):
+            valeur, position = _lire_varint(donnees, position)
+            tick += valeur >> 3
+            actions.append((tick, valeur & 0x07))
+        return replay
+
+    def sauvegarder(self, chemin):
+        """
+        Écrit le replay dans un fichier.
+
+        :param chemin: Chemin du fichier.
+        """
+        with open(chemin, "wb") as fichier:
+            fichier.write(self.encoder())
+
+    @classmethod
+    def charger(cls, chemin):
+        """
+        :param chemin: Chemin d'un fichier écrit par sauvegarder().
+        :return: Instance de Replay.
+        """
+        with open(chemin, "rb") as fichier:
+            return cls.decoder(fichier.read())
+
+# =============================================================================
+# Enregistrement d'une partie en cours
+# =============================================================================
+class EnregistreurReplay:
+    def __init__(self, etat, graine, mode_pieces=MODE_ALEATOIRE):
+        """
+        Enregistre une partie jouée tick par tick (voir la boucle de main.py) : les actions
+        sont notées avec le nombre de ticks déjà exécutés au moment où elles sont appliquées.
+
+        :param etat: Instance de GameState créée avec cette graine et ce mode de pièces.
+        :param graine: Graine entière du générateur de pièces de la partie.
+        :param mode_pieces: Mode du générateur de pièces.
+        """
+        # Le format ne décrit pas la courbe de niveaux : seule la courbe classique est rejouable
+        if etat.courbe is not COURBE_CLASSIQUE:
+            raise ValueError("Seules les parties jouées avec la courbe de niveaux classique peuvent être enregistrées")
+        self.etat = etat
+        self.replay = Replay(graine, mode_pieces, etat.largeur, etat.hauteur, etat.duree_animation,
+                             etat.duree_tick)
+        self._piece = None
+        self._noter_piece()
+
+    def _noter_piece(self):
+        """Ajoute la forme de la pièce courante si elle vient d'être mise en jeu."""
+        if self.etat.piece_actuelle is not self._piece:
+            self._piece = self.etat.piece_actuelle
+            self.replay.formes.append(INDICES_FORMES[self._piece.forme])
+
+    def action(self, action):
+        """
+        Note une action appliquée avant le prochain tick.
+
+        :param action: Une des constantes ACTION_*.
+        """
+        self.replay.actions.append((self.replay.nb_ticks, action))
+
+    def tick(self):
+        """Note l'exécution d'un tick logique."""
+        self.replay.nb_ticks += 1
+        self._noter_piece()
+
+    def terminer(self):
+        """
+        Fixe le résultat annoncé d'après l'état courant de la partie.
+
+        :return: Instance de Replay.
+        """
+        self._noter_piece()
+        etat = self.etat
+        self.replay.score, self.replay.nb_lignes, self.replay.nb_pieces = etat.score, etat.nb_lignes, etat.nb_pieces
+        return self.replay
+
+    def sauvegarder(self, dossier):
+        """
+        Termine l'enregistrement et l'écrit dans un dossier.
+
+        :param dossier: Dossier de destination (créé si nécessaire).
+        :return: Chemin du fichier écrit.
+        """
+        replay = self.terminer()
+        os.makedirs(dossier, exist_ok=True)
+        chemin = os.path.join(dossier, f"{replay.graine:016x}_{replay.score}{EXTENSION}")
+        replay.sauvegarder(chemin)
+        return chemin
+
+# =============================================================================
+# Vérification sans affichage
+# =============================================================================
+def _controler(replay):
+    """
+    Contrôles préalables à la simulation : suite de pièces et ordre des actions.
+
+    :param replay: Instance de Replay.
+    :return: Raison du rejet, ou une chaîne vide si le replay peut être rejoué.
+    """
+    generateur = GenerateurPieces(replay.graine, replay.mode_pieces)
+    if generateur.generer_indices(len(replay.formes)) != list(replay.formes):
+        return "suite de pièces incompatible avec la graine"
+    tick = 0
+    for tick_action, _ in replay.actions:
+        if tick_action < tick or tick_action > replay.nb_ticks:
+            return "actions hors de la partie ou dans le désordre"
+        tick = tick_action
+    return ""
+
+def _comparer(replay, score, nb_lignes, nb_pieces):
+    """Construit le résultat de la vérification à partir du résultat rejoué."""
+    valide = (score, nb_lignes, nb_pieces) == (replay.score, replay.nb_lignes, replay.nb_pieces)
+    return {"valide": valide, "raison": "" if valide else "résultat différent du résultat annoncé",
+            "score": score, "score_annonce": replay.score}
+
+def verifier(replay):
+    """
+    Rejoue une partie et compare son résultat au résultat annoncé. Les périodes sans
+    action sont simulées par GameState.avancer, d'une descente à la suivante.
+
+    :param replay: Instance de Replay.
+    :return: Dictionnaire (valide, raison, score, score_annonce).
+    """
+    raison = _controler(replay)
+    if raison:
+        return {"valide": False, "raison": raison, "score": 0, "score_annonce": replay.score}
+
+    etat = GameState(replay.largeur, replay.hauteur, replay.graine, replay.duree_animation, replay.mode_pieces,
+                     duree_tick=replay.duree_tick)
+    dt = replay.duree_tick
+    tick = 0
+    for tick_action, action in replay.actions:
+        if tick_action != tick:
+            etat.avancer(tick_action - tick, dt)
+            etat.evenements.clear()
+            tick = tick_action
+        etat.appliquer(action)
+    etat.avancer(replay.nb_ticks - tick, dt)
+    return _comparer(replay, etat.score, etat.nb_lignes, etat.nb_pieces)
+
+def verifier_fichier(chemin):
+    """
+    Charge et vérifie un replay ; un fichier illisible est déclaré invalide.
+
+    :param chemin: Chemin du fichier.
+    :return: Dictionnaire de verifier(), complété par le chemin.
+    """
+    try:
+        resultat = verifier(Replay.charger(chemin))
+    except (OSError, ValueError, IndexError, struct.error) as erreur:
+        resultat = {"valide": False, "raison": f"fichier illisible ({erreur})", "score": 0, "score_annonce": 0}
+    resultat["chemin"] = chemin
+    return resultat
+
+def verifier_fichiers(chemins, processus=None):
+    """
+    Vérifie un lot de replays, réparti sur plusieurs processus.
+
+    :param chemins: Liste de chemins de fichiers.
+    :param processus: Nombre de processus (None : nombre de cœurs, 1 : dans ce processus).
+    :return: Liste des résultats de verifier_fichier, dans l'ordre des chemins.
+    """
+    if processus == 1:
+        return [verifier_fichier(chemin) for chemin in chemins]
+    nb_processus = processus or os.cpu_count() or 1
+    taille_lot = max(1, len(chemins) // (nb_processus * 4))
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        return list(pool.map(verifier_fichier, chemins, chunksize=taille_lot))
+
+# =============================================================================
+# Point d'entrée en ligne de commande
+# =============================================================================
+def main(argv=None):
+    """
+    Vérifie les replays passés en argument et affiche un bilan.
+
+    :param argv: Arguments de la ligne de commande (sys.argv[1:] par défaut).
+    :return: Code de sortie (0 si tous les replays sont valides).
+    """
+    parser = argparse.ArgumentParser(description="Vérification de replays Tetris sans affichage.")
+    parser.add_argument("chemins", nargs="+", help="Fichiers de replay (ou dossiers) à vérifier")
+    parser.add_argument("--processus", type=int, default=None,
+                        help="Nombre de processus (par défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+
+    chemins = []
+    for chemin in args.chemins:
+        if os.path.isdir(chemin):
+            chemins.extend(sorted(os.path.join(chemin, nom) for nom in os.listdir(chemin) if nom.endswith(EXTENSION)))
+        else:
+            chemins.append(chemin)
+
+    debut = time.perf_counter()
+    resultats = verifier_fichiers(chemins, args.processus)
+    duree = time.perf_counter() - debut
+
+    invalides = [resultat for resultat in resultats if not resultat["valide"]]
+    for resultat in invalides:
+        print(f"INVALIDE {resultat['chemin']} : {resultat['raison']} "
+              f"(score annoncé {resultat['score_annonce']}, rejoué {resultat['score']})")
+    print(f"{len(resultats) - len(invalides)}/{len(resultats)} replays valides "
+          f"en {duree:.2f} s ({len(resultats) / max(duree, 1e-9):.0f} replays/s)")
+    return 1 if invalides else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Script de parties automatiques (self-play) sans affichage.
+Joue un nombre configurable de parties selon les règles du jeu (moteur engine.py),
+réparties sur plusieurs processus. Chaque partie a une graine déterministe et utilise
+une politique de placement interchangeable ; les statistiques agrégées sont affichées
+à la fin, ce qui permet de tester à grande échelle l'effet d'une modification des règles.
+
+Exemple : python run_selfplay.py --parties 200 --politique heuristique --processus 4
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import GameState, MODE_ALEATOIRE, MODE_SAC, NB_COLONNES, NB_LIGNES
+from politiques import POLITIQUES, charger_politique
+
+# =============================================================================
+# Exécution d'une partie
+# =============================================================================
+def jouer_partie(graine, politique="aleatoire", max_pieces=500, mode_pieces=MODE_ALEATOIRE,
+                 largeur=NB_COLONNES, hauteur=NB_LIGNES):
+    """
+    Joue une partie complète sans affichage, placement par placement.
+
+    :param graine: Graine de la partie (suite de pièces et politique).
+    :param politique: Nom de la politique (voir politiques.charger_politique).
+    :param max_pieces: Nombre maximal de pièces posées avant d'arrêter la partie.
+    :param mode_pieces: Mode de génération des pièces (MODE_ALEATOIRE ou MODE_SAC).
+    :param largeur: Nombre de colonnes de la grille.
+    :param hauteur: Nombre de lignes de la grille.
+    :return: Dictionnaire des résultats de la partie.
+    """
+    etat = GameState(largeur, hauteur, graine=graine, mode_pieces=mode_pieces)
+    choisir = charger_politique(politique)(graine)
+    while not etat.game_over and etat.nb_pieces < max_pieces:
+        col, rotation = choisir(etat)
+        etat.jouer_placement(col, rotation)
+    return {
+        "graine": graine,
+        "score": etat.score,
+        "lignes": etat.nb_lignes,
+        "pieces": etat.nb_pieces,
+        "game_over": etat.game_over,
+    }
+
+# =============================================================================
+# Exécution d'une série de parties et agrégation des statistiques
+# =============================================================================
+def executer(nb_parties, graine=0, politique="aleatoire", processus=None, max_pieces=500,
+             mode_pieces=MODE_ALEATOIRE, largeur=NB_COLONNES, hauteur=NB_LIGNES):
+    """
+    Joue nb_parties parties (graines graine, graine + 1, ...) sur un pool de processus.
+
+    :param nb_parties: Nombre de parties à jouer.
+    :param graine: Graine de la première partie.
+    :param politique: Nom de la politique de placement.
+    :param processus: Nombre de processus (None = nombre de cœurs, 1 = dans le processus courant).
+    :param max_pieces: Nombre maximal de pièces par partie.
+    :param mode_pieces: Mode de génération des pièces (MODE_ALEATOIRE ou MODE_SAC).
+    :param largeur: Nombre de colonnes de chaque grille.
+    :param hauteur: Nombre de lignes de chaque grille.
+    :return: Dictionnaire des statistiques agrégées (avec la liste des résultats par partie).
+    """
+    # Vérifie le nom de la politique avant de lancer les processus
+    charger_politique(politique)
+    graines = range(graine, graine + nb_parties)
+    debut = time.perf_counter()
+    if processus == 1:
+        resultats = [jouer_partie(g, politique, max_pieces, mode_pieces, largeur, hauteur) for g in graines]
+    else:
+        nb_processus = processus or os.cpu_count() or 1
+        taille_lot = max(1, nb_parties // (nb_processus * 4))
+        with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+            resultats = list(pool.map(jouer_partie, graines, itertools.repeat(politique),
+                                      itertools.repeat(max_pieces), itertools.repeat(mode_pieces),
+                                      itertools.repeat(largeur), itertools.repeat(hauteur),
+                                      chunksize=taille_lot))
+    duree = time.perf_counter() - debut
+    return agreger(resultats, duree)
+
+def agreger(resultats, duree):
+    """
+    Calcule les statistiques agrégées d'une série de parties.
+
+    :param resultats: Liste des dictionnaires retournés par jouer_partie.
+    :param duree: Durée totale en secondes.
+    :return: Dictionnaire des statistiques.
+    """
+    nb = len(resultats)
+    scores = [r["score"] for r in resultats]
+    lignes = sum(r["lignes"] for r in resultats)
+    pieces = sum(r["pieces"] for r in resultats)
+    return {
+        "parties": nb,
+        "score_total": sum(scores),
+        "score_moyen": sum(scores) / nb if nb else 0.0,
+        "score_max": max(scores, default=0),
+        "lignes": lignes,
+        "lignes_moyennes": lignes / nb if nb else 0.0,
+        "pieces": pieces,
+        "pieces_moyennes": pieces / nb if nb else 0.0,
+        "game_over": sum(r["game_over"] for r in resultats),
+        "duree": duree,
+        "parties_par_seconde": nb / duree if duree else 0.0,
+        "pieces_par_seconde": pieces / duree if duree else 0.0,
+        "resultats": resultats,
+    }
+
+# =============================================================================
+# Point d'entrée du script
+# =============================================================================
+def main(argv=None):
+    """
+    Lit les options de la ligne de commande, joue les parties et affiche les statistiques.
+
+    :param argv: Arguments de la ligne de commande (sys.argv par défaut).
+    """
+    parser = argparse.ArgumentParser(description="Parties de Tetris automatiques sans affichage.")
+    parser.add_argument("--parties", type=int, default=100, help="nombre de parties à jouer")
+    parser.add_argument("--graine", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--politique", default="heuristique",
+                        help=f"politique de placement ({', '.join(POLITIQUES)} ou module:fonction)")
+    parser.add_argument("--processus", type=int, default=None, help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--max-pieces", type=int, default=500, help="nombre maximal de pièces par partie")
+    parser.add_argument("--mode-pieces", choices=(MODE_ALEATOIRE, MODE_SAC), default=MODE_ALEATOIRE,
+                        help="génération des pièces : tirage indépendant ou sacs de 7 (7-bag)")
+    parser.add_argument("--largeur", type=int, default=NB_COLONNES, help="nombre de colonnes de la grille")
+    parser.add_argument("--hauteur", type=int, default=NB_LIGNES, help="nombre de lignes de la grille")
+    args = parser.parse_args(argv)
+
+    stats = executer(args.parties, args.graine, args.politique, args.processus, args.max_pieces,
+                     args.mode_pieces, args.largeur, args.hauteur)
+    print(f"Parties jouées      : {stats['parties']} ({stats['game_over']} terminées par un Game Over)")
+    print(f"Score moyen / max   : {stats['score_moyen']:.1f} / {stats['score_max']}")
+    print(f"Lignes (moyenne)    : {stats['lignes']} ({stats['lignes_moyennes']:.1f})")
+    print(f"Pièces (moyenne)    : {stats['pieces']} ({stats['pieces_moyennes']:.1f})")
+    print(f"Durée               : {stats['duree']:.2f} s")
+    print(f"Parties par seconde : {stats['parties_par_seconde']:.1f}")
+    print(f"Pièces par seconde  : {stats['pieces_par_seconde']:.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Serveur de parties versus (asyncio).
+
+Une seule boucle d'évènements fait jouer tous les matchs : les connexions sont appariées
+dans l'ordre d'arrivée, puis une tâche unique avance tous les matchs d'un tick toutes les
+DUREE_TICK millisecondes avec les règles du moteur (engine.GameState, celles de
+PlateauDeJeu), qui font autorité ; les clients n'envoient que leurs actions. Chaque
+message "etat" est encodé une fois et écrit tel quel aux deux joueurs, sans attendre
+l'envoi : un client trop lent dont le tampon d'écriture déborde est déconnecté.
+
+Exemple : python serveur_versus.py --port 7777
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from engine import DUREE_TICK, NB_COLONNES, NB_LIGNES, RETARD_MAX
+from versus import MatchVersus, PORT_DEFAUT, decoder
+
+# =============================================================================
+# Configuration du serveur
+# =============================================================================
+TAMPON_MAX = 1 << 20       # Octets en attente d'envoi au-delà desquels un client est déconnecté
+LIGNE_MAX = 1 << 12        # Taille maximale d'un message client (octets)
+
+class ConnexionJoueur:
+    """Connexion d'un client, et sa place dans un match une fois apparié."""
+
+    __slots__ = ("lecteur", "ecrivain", "match", "joueur")
+
+    def __init__(self, lecteur, ecrivain):
+        self.lecteur = lecteur
+        self.ecrivain = ecrivain
+        self.match = None
+        self.joueur = None
+
+    def envoyer(self, donnees):
+        """
+        Écrit un message sans attendre ; retourne False si le client ne suit plus.
+
+        :param donnees: Message encodé (bytes).
+        :return: True si le message a été mis en tampon.
+        """
+        transport = self.ecrivain.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > TAMPON_MAX:
+            return False
+        self.ecrivain.write(donnees)
+        return True
+
+    def fermer(self):
+        """Ferme la connexion (les données en tampon sont encore envoyées)."""
+        if not self.ecrivain.transport.is_closing():
+            self.ecrivain.close()
+
+# =============================================================================
+# Serveur
+# =============================================================================
+class ServeurVersus:
+    def __init__(self, hote="127.0.0.1", port=PORT_DEFAUT, largeur=NB_COLONNES, hauteur=NB_LIGNES,
+                 cadence=DUREE_TICK, graine=None):
+        """
+        :param hote: Adresse d'écoute.
+        :param port: Port d'écoute (0 : choisi par le système, voir self.port après demarrer()).
+        :param largeur: Nombre de colonnes des grilles.
+        :param hauteur: Nombre de lignes des grilles.
+        :param cadence: Temps réel en millisecondes entre deux ticks ; les règles avancent
+                        toujours de DUREE_TICK par tick (une cadence plus courte accélère les tests).
+        :param graine: Graine des graines de matchs (optionnel).
+        """
+        self.hote = hote
+        self.port = port
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.cadence = cadence
+        self.rng = random.Random(graine)
+        self.attente = None            # Connexion en attente d'un adversaire
+        self.matchs = {}               # Match -> [connexion du joueur 0, connexion du joueur 1]
+        self._serveur = None
+        self._boucle = None
+        # Statistiques
+        self.nb_matchs = 0             # Matchs commencés
+        self.nb_termines = 0           # Matchs terminés
+        self.ticks = 0                 # Ticks de la boucle de jeu
+        self.ticks_en_retard = 0       # Ticks commencés après leur échéance
+        self.temps_ticks = 0.0         # Temps de calcul cumulé des ticks (secondes)
+        self.tick_max = 0.0            # Tick le plus long (secondes)
+        self.octets_envoyes = 0
+        self.deconnexions_lentes = 0   # Clients déconnectés faute de lire assez vite
+        self.deconnexions_inondation = 0   # Clients déconnectés pour trop d'actions en attente
+
+    async def demarrer(self):
+        """Ouvre le port d'écoute et lance la boucle de jeu."""
+        self._serveur = await asyncio.start_server(self._connexion, self.hote, self.port, limit=LIGNE_MAX)
+        self.port = self._serveur.sockets[0].getsockname()[1]
+        self._boucle = asyncio.create_task(self._jouer())
+
+    async def arreter(self):
+        """Arrête la boucle de jeu et ferme toutes les connexions."""
+        self._boucle.cancel()
+        self._serveur.close()
+        for connexions in self.matchs.values():
+            for connexion in connexions:
+                connexion.fermer()
+        if self.attente is not None:
+            self.attente.fermer()
+        await self._serveur.wait_closed()
+
+    def statistiques(self):
+        """
+        Retourne les statistiques du serveur.
+
+        :return: Dictionnaire (matchs, ticks, temps moyen et maximal d'un tick en ms, ...).
+        """
+        return {
+            "matchs": self.nb_matchs,
+            "matchs_termines": self.nb_termines,
+            "matchs_en_cours": len(self.matchs),
+            "ticks": self.ticks,
+            "ticks_en_retard": self.ticks_en_retard,
+            "tick_moyen_ms": 1000 * self.temps_ticks / self.ticks if self.ticks else 0.0,
+            "tick_max_ms": 1000 * self.tick_max,
+            "octets_envoyes": self.octets_envoyes,
+            "deconnexions_lentes": self.deconnexions_lentes,
+            "deconnexions_inondation": self.deconnexions_inondation,
+        }
+
+    def _apparier(self, connexion):
+        """Place une nouvelle connexion face à celle qui attend, ou la met en attente."""
+        adversaire = self.attente
+        if adversaire is None or adversaire.ecrivain.transport.is_closing():
+            self.attente = connexion
+            return
+        self.attente = None
+        match = MatchVersus(self.rng.getrandbits(63), self.largeur, self.hauteur)
+        self.matchs[match] = [adversaire, connexion]
+        self.nb_matchs += 1
+        message = match.message_etat(complet=True)
+        for joueur, client in enumerate((adversaire, connexion)):
+            client.match = match
+            client.joueur = joueur
+            client.envoyer(match.message_debut(joueur))
+            client.envoyer(message)
+
+    async def _connexion(self, lecteur, ecrivain):
+        """Gère une connexion : appariement puis réception des actions jusqu'à la déconnexion."""
+        connexion = ConnexionJoueur(lecteur, ecrivain)
+        self._apparier(connexion)
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                message = decoder(ligne)
+                if not isinstance(message, dict):
+                    break  # Message invalide : le joueur abandonne
+                if connexion.match is not None and message.get("type") == "action":
+                    if not connexion.match.ajouter_action(connexion.joueur, message["action"]):
+                        # Le client envoie plus d'actions que le match n'en applique
+                        self.deconnexions_inondation += 1
+                        break
+        except (ValueError, KeyError, ConnectionError):
+            pass  # Message invalide ou connexion coupée : le joueur abandonne
+        finally:
+            if self.attente is connexion:
+                self.attente = None
+            if connexion.match is not None and connexion.match in self.matchs:
+                connexion.match.abandonner(connexion.joueur)
+            connexion.fermer()
+
+    async def _jouer(self):
+        """Boucle de jeu : un tick de tous les matchs toutes les `cadence` millisecondes."""
+        boucle = asyncio.get_running_loop()
+        echeance = boucle.time()
+        while True:
+            debut = time.perf_counter()
+            self._tick()
+            duree = time.perf_counter() - debut
+            self.ticks += 1
+            self.temps_ticks += duree
+            self.tick_max = max(self.tick_max, duree)
+            echeance += self.cadence / 1000
+            attente = echeance - boucle.time()
+            if attente < 0:
+                self.ticks_en_retard += 1
+                # Retard plafonné comme HorlogeFixe : au-delà, les ticks manqués sont abandonnés
+                if -attente > RETARD_MAX / 1000:
+                    echeance = boucle.time()
+                attente = 0
+            await asyncio.sleep(attente)
+
+    def _tick(self):
+        """Avance tous les matchs d'un tick et diffuse les messages produits."""
+        termines = []
+        for match, connexions in self.matchs.items():
+            message = match.avancer_tick()
+            if message is not None:
+                for connexion in connexions:
+                    if connexion.envoyer(message):
+                        self.octets_envoyes += len(message)
+                    elif not connexion.ecrivain.transport.is_closing():
+                        # Le client ne lit plus assez vite : il perd la partie
+                        self.deconnexions_lentes += 1
+                        match.abandonner(connexion.joueur)
+                        connexion.fermer()
+            if match.termine:
+                termines.append(match)
+        for match in termines:
+            fin = match.message_fin()
+            for connexion in self.matchs.pop(match):
+                connexion.envoyer(fin)
+                connexion.fermer()
+            self.nb_termines += 1
+
+# =============================================================================
+# Point d'entrée en ligne de commande
+# =============================================================================
+async def servir(hote, port, duree=None):
+    """
+    Lance un serveur et l'arrête après `duree` secondes (jamais si None).
+
+    :return: Statistiques du serveur à l'arrêt.
+    """
+    serveur = ServeurVersus(hote, port)
+    await serveur.demarrer()
+    print(f"Serveur de versus sur {serveur.hote}:{serveur.port}", flush=True)
+    try:
+        if duree is None:
+            await asyncio.Event().wait()
+        else:
+            await asyncio.sleep(duree)
+    finally:
+        await serveur.arreter()
+    return serveur.statistiques()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de parties versus Tetris.")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse d'écoute")
+    parser.add_argument("--port", type=int, default=PORT_DEFAUT, help="port d'écoute")
+    parser.add_argument("--duree", type=float, default=None, help="arrêt après ce nombre de secondes")
+    args = parser.parse_args(argv)
+    try:
+        statistiques = asyncio.run(servir(args.hote, args.port, args.duree))
+    except KeyboardInterrupt:
+        return 0
+    for nom, valeur in statistiques.items():
+        print(f"{nom} : {valeur:.3f}" if isinstance(valeur, float) else f"{nom} : {valeur}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
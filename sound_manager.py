@@ -1,5 +1,26 @@
 import pygame
 import os
+import queue
+import struct
+import threading
+
+# =============================================================================
+# Cache disque des effets sonores décodés
+# =============================================================================
+# Un fichier de cache contient l'échantillonnage PCM brut d'un son (Sound.get_raw) précédé
+# d'un en-tête : il n'est valable que pour la même source (date de modification et taille)
+# et le même format de mixer (fréquence, taille d'échantillon, canaux).
+MAGIE_CACHE = b"TPCM"
+FORMAT_ENTETE_CACHE = "<4sqqiii"
+
+def dossier_cache_defaut():
+    """
+    Retourne le dossier de cache des sons décodés ($XDG_CACHE_HOME/tetris, ou ~/.cache/tetris).
+
+    :return: Chemin du dossier (il n'est pas créé).
+    """
+    racine = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(racine, "tetris")
 
 # =============================================================================
 # Classe SoundManager (gestionnaire de son pour le jeu Tetris)
@@ -40,25 +61,133 @@ class SoundManager:
         sounds_dir = 'sound'
         self.music_path = os.path.join(sounds_dir, 'tetris_theme.mp3')
         
-        # Dictionnaire pour stocker les effets sonores (son → objet Sound)
+        # Dictionnaire pour stocker les effets sonores (son → objet Sound), rempli par
+        # charger_sons() : en arrière-plan après demarrer(), les sons arrivent quand ils sont
+        # prêts ; sans thread audio, au premier effet sonore demandé
         self.sound_effects = {}
-        
-        # Chargement des effets sonores
-        self._load_sound_effects()
+        self._sons_charges = False  # Indique si charger_sons() a déjà été lancé
+        self.dossier_cache = dossier_cache_defaut()
         
         # État initial du son
         self.music_playing = False  # Indique si la musique est en cours de lecture
         self.sound_enabled = True   # Indique si les effets sonores sont activés
         
+        # Thread audio : chargement des sons puis exécution des commandes dans l'ordre
+        self._file = queue.SimpleQueue()
+        self._thread = None
+        
         # Marquer comme initialisé
         self._initialized = True
     
-    def _load_sound_effects(self):
+    def demarrer(self):
+        """
+        Lance le thread audio : il charge les effets sonores puis exécute, dans l'ordre,
+        les commandes (lecture des sons, musique) que les autres méthodes lui confient.
+        Le jeu n'attend ni le décodage des fichiers ni les appels au mixer ; sans demarrer(),
+        ces appels sont faits directement par le thread appelant, et les effets sonores sont
+        chargés par ce thread au premier effet demandé.
         """
-        Charge les effets sonores dans le dictionnaire.
-        Cette méthode privée est appelée lors de l'initialisation
-        et recherche les fichiers audio dans le dossier 'sound'.
+        if self._thread_actif():
+            return
+        # Le mixer a pu être fermé (pygame.quit) : les sons déjà chargés ne sont plus valables
+        self.sound_effects = {}
+        self._sons_charges = False
+        # File neuve : rien ne reste d'un thread précédent arrêté prématurément
+        self._file = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._servir, name="audio", daemon=True)
+        self._thread.start()
+    
+    def arreter(self):
         """
+        Arrête le thread audio après l'exécution des commandes déjà confiées.
+        À appeler avant pygame.quit().
+        """
+        if self._thread is not None:
+            # Un thread déjà terminé (mixer indisponible) ne lirait jamais le signal d'arrêt
+            if self._thread_actif():
+                self._file.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def _thread_actif(self):
+        """Retourne True si le thread audio tourne (voir demarrer)."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _servir(self):
+        """Boucle du thread audio : chargement des sons, puis commandes jusqu'à arreter()."""
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            except pygame.error as e:
+                # Sans thread audio, les commandes sont exécutées (et signalées) directement
+                print(f"Erreur lors de l'initialisation du son: {e}")
+                return
+        self.charger_sons()
+        while True:
+            commande = self._file.get()
+            if commande is None:
+                return
+            self._appeler(*commande)
+    
+    def _executer(self, fonction, *args):
+        """
+        Confie un appel au thread audio s'il tourne, sinon l'exécute immédiatement.
+        
+        :param fonction: Fonction à appeler (méthode du mixer ou d'un Sound).
+        :param args: Arguments de la fonction.
+        """
+        if self._thread_actif():
+            self._file.put((fonction, args))
+        else:
+            self._appeler(fonction, args)
+    
+    @staticmethod
+    def _appeler(fonction, args):
+        """Exécute une commande audio ; une erreur est signalée sans interrompre le jeu."""
+        try:
+            fonction(*args)
+        except Exception as e:
+            print(f"Erreur audio: {e}")
+    
+    def _charger_son(self, path):
+        """
+        Charge un effet sonore, depuis le cache disque des sons décodés s'il est valable ;
+        sinon le fichier est décodé puis son PCM est écrit dans le cache.
+        
+        :param path: Chemin du fichier audio.
+        :return: Objet pygame.mixer.Sound.
+        """
+        source = os.stat(path)
+        entete = struct.pack(FORMAT_ENTETE_CACHE, MAGIE_CACHE, source.st_mtime_ns, source.st_size,
+                             *pygame.mixer.get_init())
+        cache = os.path.join(self.dossier_cache, os.path.basename(path) + ".pcm")
+        try:
+            with open(cache, "rb") as fichier:
+                donnees = fichier.read()
+            if donnees.startswith(entete):
+                return pygame.mixer.Sound(buffer=donnees[len(entete):])
+        except OSError:
+            pass  # Pas encore de cache
+        son = pygame.mixer.Sound(path)
+        try:
+            os.makedirs(self.dossier_cache, exist_ok=True)
+            # Écriture dans un fichier temporaire : un cache n'est jamais lu à moitié écrit
+            temporaire = cache + ".tmp"
+            with open(temporaire, "wb") as fichier:
+                fichier.write(entete)
+                fichier.write(son.get_raw())
+            os.replace(temporaire, cache)
+        except OSError as e:
+            print(f"Attention: cache des sons non écrit ({e}).")
+        return son
+    
+    def charger_sons(self):
+        """
+        Charge les effets sonores absents du dictionnaire.
+        Appelée par le thread audio (voir demarrer), ou sans thread audio au premier effet
+        sonore demandé ; les fichiers audio sont recherchés dans le dossier 'sound'.
+        """
+        self._sons_charges = True
         try:
             # Définir les chemins des effets sonores
             sounds_dir = 'sound'
@@ -69,13 +198,24 @@ class SoundManager:
             
             # Charger chaque effet sonore s'il existe
             for name, path in sound_files.items():
+                if name in self.sound_effects:
+                    continue
                 if os.path.exists(path):
-                    self.sound_effects[name] = pygame.mixer.Sound(path)
+                    self.sound_effects[name] = self._charger_son(path)
                 else:
                     print(f"Attention: Le fichier son '{path}' n'existe pas.")
         except Exception as e:
             print(f"Erreur lors du chargement des effets sonores: {e}")
     
+    def _effets(self):
+        """
+        Retourne le dictionnaire des effets sonores, chargés d'abord par le thread appelant
+        s'ils ne l'ont jamais été et qu'aucun thread audio ne s'en charge.
+        """
+        if not self._sons_charges and not self._thread_actif():
+            self.charger_sons()
+        return self.sound_effects
+    
     def play_music(self):
         """
         Démarre la musique en boucle.
@@ -83,12 +223,17 @@ class SoundManager:
         Met à jour l'état de lecture de la musique.
         """
         if not self.music_playing:
-            try:
-                pygame.mixer.music.load(self.music_path)
-                pygame.mixer.music.play(loops=-1)  # Joue la musique en boucle infinie
-                self.music_playing = True
-            except Exception as e:
-                print(f"Erreur lors du chargement de la musique: {e}")
+            self.music_playing = True
+            self._executer(self._lancer_musique)
+    
+    def _lancer_musique(self):
+        """Charge et lance la musique de fond (dans le thread audio s'il tourne)."""
+        try:
+            pygame.mixer.music.load(self.music_path)
+            pygame.mixer.music.play(loops=-1)  # Joue la musique en boucle infinie
+        except Exception as e:
+            self.music_playing = False
+            print(f"Erreur lors du chargement de la musique: {e}")
     
     def stop_music(self):
         """
@@ -97,7 +242,7 @@ class SoundManager:
         et met à jour l'état de lecture.
         """
         if self.music_playing:
-            pygame.mixer.music.stop()
+            self._executer(pygame.mixer.music.stop)
             self.music_playing = False
     
     def pause_music(self):
@@ -107,7 +252,7 @@ class SoundManager:
         sans changer le point de lecture.
         """
         if self.music_playing:
-            pygame.mixer.music.pause()
+            self._executer(pygame.mixer.music.pause)
     
     def unpause_music(self):
         """
@@ -115,7 +260,7 @@ class SoundManager:
         Reprend la lecture de la musique à partir du point
         où elle a été mise en pause.
         """
-        pygame.mixer.music.unpause()
+        self._executer(pygame.mixer.music.unpause)
     
     def set_volume(self, volume):
         """
@@ -123,19 +268,18 @@ class SoundManager:
         
         :param volume: Niveau de volume entre 0.0 (silencieux) et 1.0 (maximum).
         """
-        pygame.mixer.music.set_volume(volume)
+        self._executer(pygame.mixer.music.set_volume, volume)
     
     def play_sound(self, sound_name):
         """
-        Joue un effet sonore par son nom.
+        Joue un effet sonore par son nom. Avec le thread audio, un son pas encore chargé
+        est ignoré ; sans lui, le premier appel charge les effets sonores.
         
         :param sound_name: Nom de l'effet sonore à jouer (clé dans le dictionnaire sound_effects).
         """
-        if self.sound_enabled and sound_name in self.sound_effects:
-            try:
-                self.sound_effects[sound_name].play()
-            except Exception as e:
-                print(f"Erreur lors de la lecture de l'effet sonore '{sound_name}': {e}")
+        son = self._effets().get(sound_name)
+        if self.sound_enabled and son is not None:
+            self._executer(son.play)
     
     def set_sound_volume(self, sound_name, volume):
         """
@@ -144,8 +288,9 @@ class SoundManager:
         :param sound_name: Nom de l'effet sonore à modifier.
         :param volume: Niveau de volume entre 0.0 (silencieux) et 1.0 (maximum).
         """
-        if sound_name in self.sound_effects:
-            self.sound_effects[sound_name].set_volume(volume)
+        son = self._effets().get(sound_name)
+        if son is not None:
+            self._executer(son.set_volume, volume)
     
     def enable_sounds(self, enabled=True):
         """
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Diffusion d'une partie à des spectateurs.
+
+Le flux est une suite de trames binaires (petit-boutiste), chacune précédée de sa taille
+(ENCADREMENT) :
+    image clé  ENTETE(TRAME_CLE, tick) DIMENSIONS PIECE SUIVANTE SCORE DRAPEAUX lignes animées
+               puis les largeur x hauteur indices de palette du plateau (un octet par case)
+    delta      ENTETE(TRAME_DELTA, tick) octet des parties présentes, puis dans l'ordre :
+               cases modifiées (nombre, puis CELLULE par case), PIECE, SUIVANTE, SCORE,
+               DRAPEAUX et lignes animées
+Un delta ne contient que ce qui a changé depuis la trame précédente ; un tick sans
+changement ne produit pas de trame. Les cases modifiées se trouvent en comparant les
+rangées du plateau par identité (elles sont immuables et partagées tant qu'elles ne
+changent pas) : seules les rangées remplacées sont examinées case par case. Une image
+clé est émise toutes les INTERVALLE_IMAGES_CLES ticks, et à la place d'un delta plus
+gros qu'elle (effacement de lignes) ; un spectateur qui arrive reçoit la dernière image
+clé et les deltas qui la suivent.
+
+Les indices de palette sont ceux de engine.PALETTE : seules les couleurs enregistrées
+d'office (pièces et déchets) ont le même indice chez l'émetteur et chez les spectateurs.
+
+Utilisation en ligne de commande (la partie diffusée est un replay ou un joueur automatique) :
+    python spectateur.py --port 7778 --replay replays/partie.trpl
+    python -c "import main; main.main(spectateur='127.0.0.1:7778')"    (pour regarder)
+"""
+
+import argparse
+import asyncio
+import queue
+import socket
+import struct
+import threading
+import time
+from types import SimpleNamespace
+
+from engine import (GameState, Piece, PALETTE, LISTE_FORMES, DUREE_TICK, ACTION_AUCUNE,
+                    EVENEMENT_POSE, EVENEMENT_LIGNES)
+
+# =============================================================================
+# Format des trames
+# =============================================================================
+TRAME_CLE = 1
+TRAME_DELTA = 2
+ENCADREMENT = struct.Struct("<I")      # Taille de la trame qui suit
+ENTETE = struct.Struct("<BI")          # Type de trame, tick
+DIMENSIONS = struct.Struct("<HH")      # Largeur, hauteur
+CELLULE = struct.Struct("<HHB")        # Ligne, colonne, indice de palette
+NB_CELLULES = struct.Struct("<H")
+PIECE = struct.Struct("<BhhB")         # Forme (indice dans LISTE_FORMES), colonne, ligne, rotation
+SUIVANTE = struct.Struct("<B")         # Forme de la pièce suivante
+SCORE = struct.Struct("<IIH")          # Score, lignes effacées, niveau
+DRAPEAUX = struct.Struct("<BHB")       # Drapeaux, minuteur de l'animation (ms), nombre de lignes animées
+LIGNE_ANIMEE = struct.Struct("<H")
+
+# Parties présentes dans un delta
+PARTIE_CELLULES = 1
+PARTIE_PIECE = 2
+PARTIE_SUIVANTE = 4
+PARTIE_SCORE = 8
+PARTIE_DRAPEAUX = 16
+
+# Drapeaux
+DRAPEAU_GAME_OVER = 1
+DRAPEAU_PAUSE = 2
+DRAPEAU_ANIMATION = 4
+
+INTERVALLE_IMAGES_CLES = 300    # Ticks entre deux images clés (environ 5 s)
+INDICES_FORMES = {forme: indice for indice, forme in enumerate(LISTE_FORMES)}
+PORT_SPECTATEURS = 7778         # Port TCP par défaut de la diffusion
+TAMPON_MAX = 1 << 20            # Octets en attente au-delà desquels un spectateur est déconnecté
+
+# =============================================================================
+# Encodage (côté diffusion)
+# =============================================================================
+class EncodeurSpectateur:
+    def __init__(self, intervalle_images_cles=INTERVALLE_IMAGES_CLES):
+        """
+        Produit les trames d'une partie en mémorisant ce qui a déjà été transmis.
+
+        :param intervalle_images_cles: Nombre maximal de ticks entre deux images clés.
+        """
+        self.intervalle_images_cles = intervalle_images_cles
+        self._plateau = None        # Plateau transmis (une nouvelle partie impose une image clé)
+        self._version = None        # Version du plateau à la dernière trame
+        self._rangees = None        # Rangées du plateau à la dernière trame
+        self._parties = {}          # Dernière valeur transmise de chaque partie (octets)
+        self._tick_cle = None       # Tick de la dernière image clé
+        # Statistiques
+        self.nb_images_cles = 0
+        self.nb_deltas = 0
+        self.octets_deltas = 0
+
+    def _encoder_parties(self, etat):
+        """Retourne les parties hors plateau (octets) de l'état, par drapeau de partie."""
+        piece = etat.piece_actuelle
+        drapeaux = (DRAPEAU_GAME_OVER * etat.game_over | DRAPEAU_PAUSE * etat.pause
+                    | DRAPEAU_ANIMATION * etat.en_animation)
+        animation = etat.lignes_animation if etat.en_animation else []
+        return {
+            PARTIE_PIECE: PIECE.pack(INDICES_FORMES[piece.forme], piece.col, piece.lig, piece.rotation),
+            PARTIE_SUIVANTE: SUIVANTE.pack(INDICES_FORMES[etat.piece_suivante.forme]),
+            PARTIE_SCORE: SCORE.pack(etat.score, etat.nb_lignes, min(etat.niveau, 0xFFFF)),
+            PARTIE_DRAPEAUX: DRAPEAUX.pack(drapeaux, max(0, min(int(etat.timer_animation), 0xFFFF)), len(animation))
+                             + b"".join(LIGNE_ANIMEE.pack(lig) for lig in animation),
+        }
+
+    def image_cle(self, etat, tick):
+        """
+        Produit une image clé de l'état complet.
+
+        :param etat: Instance de GameState diffusée.
+        :param tick: Tick logique de la partie.
+        :return: Trame (bytes).
+        """
+        plateau = etat.plateau
+        self._plateau, self._version = plateau, plateau.version
+        self._rangees = list(plateau.couleurs)
+        self._parties = self._encoder_parties(etat)
+        self._tick_cle = tick
+        self.nb_images_cles += 1
+        return b"".join([ENTETE.pack(TRAME_CLE, tick), DIMENSIONS.pack(plateau.largeur, plateau.hauteur),
+                         self._parties[PARTIE_PIECE], self._parties[PARTIE_SUIVANTE],
+                         self._parties[PARTIE_SCORE], self._parties[PARTIE_DRAPEAUX]] + self._rangees)
+
+    def trame(self, etat, tick):
+        """
+        Produit la trame d'un tick : image clé si nécessaire, sinon delta des changements.
+
+        :param etat: Instance de GameState diffusée.
+        :param tick: Tick logique de la partie.
+        :return: Trame (bytes), ou None si rien n'a changé.
+        """
+        plateau = etat.plateau
+        if plateau is not self._plateau or tick - self._tick_cle >= self.intervalle_images_cles:
+            return self.image_cle(etat, tick)
+        sortie = [ENTETE.pack(TRAME_DELTA, tick), None]
+        presentes = 0
+        if plateau.version != self._version:
+            # Seules les rangées remplacées depuis la dernière trame sont comparées case par case
+            cellules = []
+            for lig, (ancienne, rangee) in enumerate(zip(self._rangees, plateau.couleurs)):
+                if ancienne is not rangee and ancienne != rangee:
+                    cellules.extend(CELLULE.pack(lig, col, rangee[col])
+                                    for col in range(plateau.largeur) if ancienne[col] != rangee[col])
+            if len(cellules) * CELLULE.size >= plateau.largeur * plateau.hauteur or len(cellules) > 0xFFFF:
+                return self.image_cle(etat, tick)
+            self._version = plateau.version
+            self._rangees = list(plateau.couleurs)
+            if cellules:
+                presentes |= PARTIE_CELLULES
+                sortie.append(NB_CELLULES.pack(len(cellules)))
+                sortie.extend(cellules)
+        for partie, donnees in self._encoder_parties(etat).items():
+            if donnees != self._parties[partie]:
+                self._parties[partie] = donnees
+                presentes |= partie
+                sortie.append(donnees)
+        if not presentes:
+            return None
+        sortie[1] = bytes([presentes])
+        trame = b"".join(sortie)
+        self.nb_deltas += 1
+        self.octets_deltas += len(trame)
+        return trame
+
+# =============================================================================
+# Décodage (côté spectateur)
+# =============================================================================
+def _lire_parties(etat, donnees, position, presentes):
+    """Applique les parties hors plateau d'une trame ; retourne (position suivante, évènements)."""
+    evenements = []
+    if presentes & PARTIE_PIECE:
+        forme, col, lig, rotation = PIECE.unpack_from(donnees, position)
+        position += PIECE.size
+        etat.piece_actuelle = Piece(LISTE_FORMES[forme], col, lig, rotation)
+    if presentes & PARTIE_SUIVANTE:
+        etat.piece_suivante = Piece(LISTE_FORMES[SUIVANTE.unpack_from(donnees, position)[0]])
+        position += SUIVANTE.size
+    if presentes & PARTIE_SCORE:
+        etat.score, etat.nb_lignes, etat.niveau = SCORE.unpack_from(donnees, position)
+        position += SCORE.size
+    if presentes & PARTIE_DRAPEAUX:
+        drapeaux, etat.timer_animation, nb_lignes = DRAPEAUX.unpack_from(donnees, position)
+        position += DRAPEAUX.size
+        en_animation = bool(drapeaux & DRAPEAU_ANIMATION)
+        if en_animation and not etat.en_animation:
+            evenements.append(EVENEMENT_LIGNES)
+        etat.game_over = bool(drapeaux & DRAPEAU_GAME_OVER)
+        etat.pause = bool(drapeaux & DRAPEAU_PAUSE)
+        etat.en_animation = en_animation
+        etat.lignes_animation = [LIGNE_ANIMEE.unpack_from(donnees, position + i * LIGNE_ANIMEE.size)[0]
+                                 for i in range(nb_lignes)]
+        position += nb_lignes * LIGNE_ANIMEE.size
+    return position, evenements
+
+def appliquer_trame(etat, trame):
+    """
+    Applique une trame à la partie miroir d'un spectateur.
+
+    :param etat: Instance de GameState (None avant la première image clé).
+    :param trame: Trame reçue (bytes).
+    :return: Couple (partie miroir, évènements déduits : EVENEMENT_POSE, EVENEMENT_LIGNES) ;
+             la partie miroir est recréée si les dimensions changent.
+    """
+    type_trame, _ = ENTETE.unpack_from(trame)
+    position = ENTETE.size
+    if type_trame == TRAME_CLE:
+        largeur, hauteur = DIMENSIONS.unpack_from(trame, position)
+        position += DIMENSIONS.size
+        if etat is None or (etat.largeur, etat.hauteur) != (largeur, hauteur):
+            etat = GameState(largeur, hauteur)
+        tout = PARTIE_PIECE | PARTIE_SUIVANTE | PARTIE_SCORE | PARTIE_DRAPEAUX
+        position, evenements = _lire_parties(etat, trame, position, tout)
+        if bytes(trame[position:]) != b"".join(etat.plateau.couleurs):
+            etat.plateau.charger_rangees(trame[lig:lig + largeur]
+                                         for lig in range(position, position + largeur * hauteur, largeur))
+        return etat, evenements
+    if etat is None:
+        return None, []     # Delta reçu avant toute image clé : ignoré
+    presentes = trame[position]
+    position += 1
+    evenements = []
+    if presentes & PARTIE_CELLULES:
+        nb_cellules, = NB_CELLULES.unpack_from(trame, position)
+        position += NB_CELLULES.size
+        plateau = etat.plateau
+        for _ in range(nb_cellules):
+            lig, col, indice = CELLULE.unpack_from(trame, position)
+            position += CELLULE.size
+            plateau.set_case(lig, col, PALETTE[indice])
+        evenements.append(EVENEMENT_POSE)
+    position, autres = _lire_parties(etat, trame, position, presentes)
+    return etat, evenements + autres
+
+# =============================================================================
+# Diffusion à de nombreux spectateurs (asyncio)
+# =============================================================================
+class DiffuseurSpectateurs:
+    def __init__(self, tampon_max=TAMPON_MAX):
+        """
+        Envoie chaque trame à tous les spectateurs connectés : elle est encadrée une seule
+        fois et le même objet bytes est écrit sur chaque connexion, sans attendre l'envoi.
+        Un spectateur dont le tampon d'écriture dépasse tampon_max est déconnecté.
+
+        :param tampon_max: Octets en attente d'envoi tolérés par spectateur.
+        """
+        self.tampon_max = tampon_max
+        self.abonnes = set()
+        self._depuis_cle = []       # Trames encadrées depuis la dernière image clé
+        self._serveur = None
+        self.port = None
+        # Statistiques
+        self.octets_envoyes = 0
+        self.deconnexions_lentes = 0
+
+    async def demarrer(self, hote="127.0.0.1", port=PORT_SPECTATEURS):
+        """Ouvre le port d'écoute des spectateurs (port 0 : choisi par le système)."""
+        self._serveur = await asyncio.start_server(self._abonner, hote, port)
+        self.port = self._serveur.sockets[0].getsockname()[1]
+
+    async def arreter(self):
+        """Ferme le port d'écoute et toutes les connexions des spectateurs."""
+        self._serveur.close()
+        for ecrivain in self.abonnes:
+            ecrivain.close()
+        self.abonnes.clear()
+        await self._serveur.wait_closed()
+
+    def publier(self, trame):
+        """
+        Diffuse une trame produite par EncodeurSpectateur.
+
+        :param trame: Trame (bytes).
+        """
+        donnees = ENCADREMENT.pack(len(trame)) + trame
+        if trame[0] == TRAME_CLE:
+            self._depuis_cle = [donnees]
+        else:
+            self._depuis_cle.append(donnees)
+        for ecrivain in list(self.abonnes):
+            transport = ecrivain.transport
+            if transport.is_closing():
+                self.abonnes.discard(ecrivain)
+            elif transport.get_write_buffer_size() > self.tampon_max:
+                self.deconnexions_lentes += 1
+                self.abonnes.discard(ecrivain)
+                ecrivain.close()
+            else:
+                ecrivain.write(donnees)
+                self.octets_envoyes += len(donnees)
+
+    async def _abonner(self, lecteur, ecrivain):
+        """Envoie à un nouveau spectateur de quoi reconstruire l'état, puis l'abonne au flux."""
+        if self._depuis_cle:
+            ecrivain.write(b"".join(self._depuis_cle))
+        self.abonnes.add(ecrivain)
+        try:
+            # Les spectateurs n'envoient rien : la lecture ne sert qu'à détecter la déconnexion
+            while await lecteur.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.abonnes.discard(ecrivain)
+            ecrivain.close()
+
+async def diffuser_partie(diffuseur, etat, choisir_action, cadence=DUREE_TICK, nb_ticks=None,
+                          encodeur=None):
+    """
+    Joue une partie en temps réel et en diffuse les trames jusqu'à la fin de la partie.
+
+    :param diffuseur: Instance de DiffuseurSpectateurs.
+    :param etat: Instance de GameState à jouer.
+    :param choisir_action: Fonction (etat, tick) -> action appliquée avant chaque tick.
+    :param cadence: Temps réel en millisecondes entre deux ticks.
+    :param nb_ticks: Nombre maximal de ticks (None : jusqu'à la fin de la partie).
+    :param encodeur: Instance de EncodeurSpectateur (nouvelle instance par défaut).
+    :return: L'encodeur (ses statistiques).
+    """
+    encodeur = encodeur or EncodeurSpectateur()
+    boucle = asyncio.get_running_loop()
+    echeance = boucle.time()
+    tick = 0
+    diffuseur.publier(encodeur.image_cle(etat, tick))
+    while not etat.game_over and (nb_ticks is None or tick < nb_ticks):
+        action = choisir_action(etat, tick)
+        if action != ACTION_AUCUNE:
+            etat.appliquer(action)
+        etat.step(dt=etat.duree_tick)
+        tick += 1
+        trame = encodeur.trame(etat, tick)
+        if trame is not None:
+            diffuseur.publier(trame)
+        echeance += cadence / 1000
+        await asyncio.sleep(max(0.0, echeance - boucle.time()))
+    return encodeur
+
+def actions_replay(replay):
+    """
+    Fabrique la fonction d'actions qui rejoue un replay tick par tick.
+
+    :param replay: Instance de replay.Replay.
+    :return: Fonction (etat, tick) -> action.
+    """
+    actions = {}
+    for tick, action in replay.actions:
+        actions.setdefault(tick, []).append(action)
+
+    def choisir(etat, tick):
+        # Toutes les actions du tick sont appliquées ; la dernière est retournée à l'appelant
+        en_attente = actions.get(tick, [ACTION_AUCUNE])
+        for action in en_attente[:-1]:
+            etat.appliquer(action)
+        return en_attente[-1]
+    return choisir
+
+# =============================================================================
+# Client spectateur bloquant (boucle pygame de main.py)
+# =============================================================================
+class ClientSpectateur:
+    def __init__(self, hote, port=PORT_SPECTATEURS):
+        """
+        Se connecte à une diffusion ; les trames sont lues par un thread et mises en file.
+
+        :param hote: Adresse de la diffusion.
+        :param port: Port TCP de la diffusion.
+        """
+        self.connexion = socket.create_connection((hote, port))
+        self.trames = queue.Queue()
+        self._lecteur = threading.Thread(target=self._lire, daemon=True)
+        self._lecteur.start()
+
+    def _lire(self):
+        """Lit les trames jusqu'à la fermeture de la connexion (trame None)."""
+        try:
+            with self.connexion.makefile("rb") as flux:
+                while True:
+                    entete = flux.read(ENCADREMENT.size)
+                    if len(entete) < ENCADREMENT.size:
+                        break
+                    taille, = ENCADREMENT.unpack(entete)
+                    trame = flux.read(taille)
+                    if len(trame) < taille:
+                        break
+                    self.trames.put(trame)
+        except OSError:
+            pass
+        self.trames.put(None)
+
+    def recevoir(self):
+        """
+        Retourne les trames reçues depuis le dernier appel, sans attendre.
+
+        :return: Liste de trames (None signale la fin de la diffusion).
+        """
+        trames = []
+        while True:
+            try:
+                trames.append(self.trames.get_nowait())
+            except queue.Empty:
+                return trames
+
+    def fermer(self):
+        """Ferme la connexion."""
+        try:
+            self.connexion.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connexion.close()
+
+# =============================================================================
+# Point d'entrée en ligne de commande
+# =============================================================================
+async def diffuser(hote, port, replay=None, politique="heuristique", graine=0, attente=0.0):
+    """
+    Diffuse une partie (replay, ou partie du joueur automatique) puis ferme la diffusion.
+
+    :return: Couple (encodeur, diffuseur) pour leurs statistiques.
+    """
+    from bot import PiloteAutomatique
+    from politiques import charger_politique
+
+    diffuseur = DiffuseurSpectateurs()
+    await diffuseur.demarrer(hote, port)
+    print(f"Diffusion sur {hote}:{diffuseur.port}", flush=True)
+    await asyncio.sleep(attente)   # Laisse aux premiers spectateurs le temps de se connecter
+    if replay is not None:
+        etat = GameState(replay.largeur, replay.hauteur, replay.graine, replay.duree_animation,
+                         replay.mode_pieces, duree_tick=replay.duree_tick)
+        choisir_action, nb_ticks = actions_replay(replay), replay.nb_ticks
+    else:
+        etat = GameState(graine=graine)
+        pilote = PiloteAutomatique(SimpleNamespace(choisir=charger_politique(politique)(graine)))
+        choisir_action, nb_ticks = (lambda etat, tick: pilote.action(etat)), None
+    try:
+        encodeur = await diffuser_partie(diffuseur, etat, choisir_action, nb_ticks=nb_ticks)
+    finally:
+        await diffuseur.arreter()
+    return encodeur, diffuseur
+
+def main(argv=None):
+    from replay import Replay
+
+    parser = argparse.ArgumentParser(description="Diffusion d'une partie de Tetris aux spectateurs.")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse d'écoute")
+    parser.add_argument("--port", type=int, default=PORT_SPECTATEURS, help="port d'écoute")
+    parser.add_argument("--replay", default=None, help="replay à diffuser (sinon partie du joueur automatique)")
+    parser.add_argument("--politique", default="heuristique", help="politique du joueur automatique")
+    parser.add_argument("--graine", type=int, default=0, help="graine de la partie du joueur automatique")
+    parser.add_argument("--attente", type=float, default=0.0, help="secondes d'attente avant le début")
+    args = parser.parse_args(argv)
+
+    replay = Replay.charger(args.replay) if args.replay else None
+    debut = time.perf_counter()
+    try:
+        encodeur, diffuseur = asyncio.run(diffuser(args.hote, args.port, replay, args.politique,
+                                                   args.graine, args.attente))
+    except KeyboardInterrupt:
+        return 0
+    print(f"Durée : {time.perf_counter() - debut:.1f} s")
+    print(f"Images clés : {encodeur.nb_images_cles}, deltas : {encodeur.nb_deltas} "
+          f"({encodeur.octets_deltas / max(1, encodeur.nb_deltas):.1f} octets en moyenne)")
+    print(f"Octets envoyés : {diffuseur.octets_envoyes}, spectateurs trop lents : {diffuseur.deconnexions_lentes}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,7 +11,9 @@ sys.path.append('.')
 # Import des modules à tester
 try:
     from home_screen import TetrisMenu
-    from main import Tetris, PlateauDeJeu, new_piece, FORMES, TAILLE_CASE
+    from main import (Tetris, Piece, PlateauDeJeu, new_piece, FORMES, TAILLE_CASE, CoucheStatique, ZonesModifiees,
+                      atlas_blocs, draw_plateau, AnimationLignes, EFFET_FLASH, EFFET_FONDU, EFFET_EFFONDREMENT,
+                      decalage_chute)
     from sound_manager import SoundManager
 except ImportError:
     # Mocks pour les tests si les modules ne sont pas disponibles
@@ -21,10 +23,35 @@ except ImportError:
         pass
     class PlateauDeJeu:
         pass
+    class Piece:
+        pass
     def new_piece():
         pass
+    CoucheStatique = ZonesModifiees = atlas_blocs = draw_plateau = AnimationLignes = decalage_chute = None
+    EFFET_FLASH, EFFET_FONDU, EFFET_EFFONDREMENT = "flash", "fondu", "effondrement"
     FORMES = {}
     TAILLE_CASE = 30
+from engine import (GameState, GenerateurPieces, MODE_SAC, Plateau, LISTE_FORMES, ACTION_CHUTE, ACTION_GAUCHE,
+                    ACTION_PAUSE, EVENEMENT_POSE, EVENEMENT_LIGNES, HorlogeFixe, CourbeNiveaux, COURBE_CLASSIQUE,
+                    COURBE_RAPIDE, GRAVITE_20G)
+import run_selfplay
+from replay import EnregistreurReplay, Replay, verifier
+from politiques import charger_politique
+from caracteristiques import (NOMS_CARACTERISTIQUES, caracteristiques, caracteristiques_placement,
+                              trous_par_colonne)
+import bot
+from bot import RechercheFaisceau, PiloteAutomatique
+import versus
+import serveur_versus
+import charge_versus
+import spectateur
+from font_cache import CacheTextes
+# Les plateaux vectorisés nécessitent NumPy (dépendance optionnelle pour les tests)
+try:
+    import numpy as np
+    import batch
+except ImportError:
+    np = None
 
 # ==============================================================================
 # Tests unitaires pour la classe Tetris
@@ -91,6 +118,35 @@ class TestTetris(unittest.TestCase):
         self.tetris.move_side(-TAILLE_CASE)  # Déplacement à gauche
         self.assertEqual(self.tetris.x, initial_x)
 
+    def test_coordonnees_grille(self):
+        """Vérification de la conversion entre pixels et coordonnées de grille."""
+        self.tetris.x = 4 * TAILLE_CASE
+        self.tetris.move_down()
+        self.assertEqual((self.tetris.col, self.tetris.lig), (4, 1))
+        self.assertEqual(self.tetris.get_cases(), [(4, 2), (5, 2), (6, 2), (7, 2)])
+
+# ==============================================================================
+# Tests unitaires pour la classe Piece
+# ==============================================================================
+class TestPiece(unittest.TestCase):
+    def test_copie_independante(self):
+        """Vérification qu'une copie de pièce n'est pas affectée par les déplacements de l'originale."""
+        piece = Piece("T", 3, 0)
+        copie = piece.copie()
+        piece.descendre(2)
+        piece.decaler(-1)
+        piece.tourner()
+        self.assertEqual((copie.col, copie.lig, copie.rotation), (3, 0, 0))
+        self.assertEqual((piece.col, piece.lig, piece.rotation), (2, 2, 1))
+
+    def test_position_valide(self):
+        """Vérification des déplacements exprimés en cases sur le plateau."""
+        plateau = PlateauDeJeu(10, 20)
+        piece = Piece("O", 8, 18)
+        self.assertTrue(plateau.position_valide(piece))
+        self.assertFalse(plateau.position_valide(piece, dcol=1))
+        self.assertFalse(plateau.position_valide(piece, dlig=1))
+
 # ==============================================================================
 # Tests unitaires pour la classe PlateauDeJeu
 # ==============================================================================
@@ -178,6 +234,936 @@ class TestPlateauDeJeu(unittest.TestCase):
         # Vérifier que la cellule marquée a été décalée vers le bas
         self.assertEqual(self.plateau.grille[ligne_a_remplir][0], (255, 0, 0))
 
+    def test_bitboard_lock_piece(self):
+        """Vérification des masques de lignes après verrouillage d'une pièce."""
+        self.tetris.y = 18 * TAILLE_CASE
+        self.plateau.lock_piece(self.tetris)
+        # Forme I horizontale en colonnes 3 à 6 de la ligne 19
+        self.assertEqual(self.plateau.lignes[19], 0b1111 << 3)
+        self.assertEqual(self.plateau.grille[19][3], self.tetris.couleur)
+        self.assertIsNone(self.plateau.grille[19][2])
+
+    def test_lock_piece_lignes_completees(self):
+        """Vérification que lock_piece retourne les seules lignes complétées par la pièce."""
+        for col in range(6):
+            self.plateau.grille[19][col] = (255, 255, 255)
+            self.plateau.grille[17][col] = (255, 255, 255)
+        self.assertEqual(self.plateau.lock_piece(Piece("I", 4, 18)), [])
+        self.assertEqual(self.plateau.lock_piece(Piece("I", 6, 18)), [19])
+
+    def test_taille_case_du_plateau(self):
+        """Vérification que les déplacements en pixels utilisent la taille de case du plateau."""
+        plateau = PlateauDeJeu(12, 30, taille_case=16)
+        tetris = Tetris(7 * 16, 0, "I", 16)
+        self.assertTrue(plateau.is_valid_move(tetris, dx=16))
+        self.assertFalse(plateau.is_valid_move(tetris, dx=2 * 16))
+        self.assertEqual(len(plateau.grille), 30)
+
+    def test_bitboard_effacer_lignes(self):
+        """Vérification du décalage des masques et des couleurs lors d'un effacement multiple."""
+        for col in range(self.largeur):
+            self.plateau.grille[18][col] = (255, 255, 255)
+            self.plateau.grille[19][col] = (255, 255, 255)
+        self.plateau.grille[17][4] = (255, 0, 0)
+        self.assertEqual(self.plateau.get_lignes_completes(), [18, 19])
+        self.assertEqual(self.plateau.clear_lines(), 2)
+        self.assertEqual(self.plateau.lignes[19], 1 << 4)
+        self.assertEqual(self.plateau.grille[19][4], (255, 0, 0))
+        self.assertEqual(self.plateau.lignes[:19], [0] * 19)
+
+    def test_collision_masques(self):
+        """Vérification que les masques précalculés donnent le même résultat qu'un test case par case."""
+        self.plateau.grille[15][4] = (255, 0, 0)
+        self.plateau.grille[19][0] = (255, 0, 0)
+        for forme, rotations in FORMES.items():
+            for rotation, blocs in enumerate(rotations):
+                for col in range(-3, self.largeur + 1):
+                    for lig in range(-2, self.hauteur + 1):
+                        attendu = any(
+                            not 0 <= col + dx < self.largeur or lig + dy >= self.hauteur
+                            or (lig + dy >= 0 and self.plateau.grille[lig + dy][col + dx] is not None)
+                            for dx, dy in blocs)
+                        self.assertEqual(self.plateau.collision(forme, rotation, col, lig), attendu)
+
+    def test_hauteurs_colonnes(self):
+        """Vérification du maintien des hauteurs de colonnes lors du verrouillage et de l'effacement."""
+        for col in range(self.largeur):
+            self.plateau.grille[19][col] = (255, 255, 255)
+        self.plateau.grille[17][0] = (255, 0, 0)  # Bloc au-dessus d'un trou en ligne 18
+        self.plateau.grille[18][1] = (255, 0, 0)
+        self.assertEqual(self.plateau.hauteurs[:3], [3, 2, 1])
+        self.plateau.clear_lines()
+        self.assertEqual(self.plateau.hauteurs[:3], [2, 1, 0])
+        self.plateau.grille[18][0] = None
+        self.assertEqual(self.plateau.hauteurs[0], 0)
+
+    def test_distance_chute(self):
+        """Vérification de la distance de chute, y compris sous un surplomb."""
+        piece = Piece("O", 0, 0)
+        self.assertEqual(self.plateau.distance_chute(piece), 18)
+        self.plateau.grille[10][0] = (255, 0, 0)
+        self.assertEqual(self.plateau.distance_chute(piece), 8)
+        # Pièce glissée sous le surplomb : la chute est testée ligne par ligne
+        self.plateau.grille[10][0] = None
+        self.plateau.grille[10][1] = (255, 0, 0)
+        self.plateau.grille[5][0] = (255, 0, 0)
+        self.assertEqual(self.plateau.distance_chute(Piece("I", -2, 6, 1)), 10)
+
+    def test_placements(self):
+        """Vérification des placements énumérés par rapport à une descente case par case."""
+        for col, lig in [(0, 19), (1, 19), (1, 18), (5, 15), (9, 10)]:
+            self.plateau.grille[lig][col] = (255, 0, 0)
+        self.assertEqual(len(self.plateau.placements("O")), 9)
+        self.assertEqual(len(self.plateau.placements("I")), 17)
+        for forme in FORMES:
+            for col, rotation, lig in self.plateau.placements(forme):
+                piece = Piece(forme, col, -4, rotation)
+                while self.plateau.position_valide(piece, dlig=1):
+                    piece.descendre()
+                self.assertEqual(piece.lig, lig)
+
+    def test_vider_case(self):
+        """Vérification qu'une case remise à None libère le bit correspondant."""
+        self.plateau.grille[5][2] = (255, 0, 0)
+        self.plateau.grille[5][2] = None
+        self.assertEqual(self.plateau.lignes[5], 0)
+        self.assertIsNone(self.plateau.grille[5][2])
+
+    def test_version(self):
+        """Vérification que chaque modification des cases change la version du plateau."""
+        versions = [self.plateau.version]
+        self.plateau.lock_piece(Piece("O", 0, 18))
+        versions.append(self.plateau.version)
+        self.plateau.effacer_lignes([19])
+        versions.append(self.plateau.version)
+        self.plateau.grille[0][0] = (255, 0, 0)
+        versions.append(self.plateau.version)
+        self.assertEqual(len(set(versions)), 4)
+        self.plateau.get_lignes_completes()
+        self.assertEqual(self.plateau.version, versions[-1])
+
+    def test_remplissage_colonnes(self):
+        """Vérification du nombre de cases occupées par colonne après poses, écritures et effacements."""
+        plateau = Plateau(10, 20)
+        plateau.lock_piece(Piece("I", 0, 18))
+        plateau.lock_piece(Piece("I", 4, 18))
+        plateau.set_case(19, 8, (255, 0, 0))
+        plateau.set_case(19, 9, (255, 0, 0))
+        plateau.set_case(17, 9, (255, 0, 0))
+        plateau.set_case(17, 9, None)
+        self.assertEqual(plateau.remplies, [1] * 10)
+        plateau.set_case(18, 2, (255, 0, 0))
+        plateau.effacer_lignes([19])
+        self.assertEqual(plateau.remplies, [0, 0, 1] + [0] * 7)
+        plateau.effacer_lignes([19])
+        self.assertEqual(plateau.remplies, [0] * 10)
+
+    def test_effacer_lignes_non_pleines(self):
+        """Vérification des hauteurs après l'effacement de lignes vides ou partielles."""
+        couleur = (255, 0, 0)
+        plateau = Plateau(10, 20)
+        plateau.set_case(19, 0, couleur)
+        plateau.set_case(10, 1, couleur)
+        plateau.effacer_lignes([5])                # Ligne vide au-dessus des sommets
+        self.assertEqual(plateau.hauteurs[:3], [1, 10, 0])
+        plateau.effacer_lignes([3, 4])             # Plus de lignes que la hauteur de la colonne 0
+        self.assertEqual(plateau.hauteurs[:3], [1, 10, 0])
+        plateau.set_case(15, 1, couleur)
+        plateau.effacer_lignes([10, 12, 19])       # Sommet de la colonne 1 et base de la colonne 0
+        self.assertEqual(plateau.hauteurs[:3], [0, 4, 0])
+        for lig in range(20):
+            for col in range(10):
+                plateau.set_case(lig, col, couleur if (lig * 7 + col * 3) % 5 < 2 else None)
+        plateau.effacer_lignes([0, 6, 7, 13, 18])
+        attendu = [next((20 - lig for lig in range(20) if plateau.lignes[lig] >> col & 1), 0)
+                   for col in range(10)]
+        self.assertEqual(plateau.hauteurs, attendu)
+
+# ==============================================================================
+# Tests unitaires pour le moteur sans affichage (GameState)
+# ==============================================================================
+class TestGameState(unittest.TestCase):
+    def test_sans_pygame(self):
+        """Vérification que le moteur de jeu n'importe pas pygame."""
+        import subprocess
+        code = "import sys, engine; sys.exit('pygame' in sys.modules)"
+        self.assertEqual(subprocess.call([sys.executable, "-c", code]), 0)
+
+    def test_grandes_grilles(self):
+        """Vérification des règles sur une grille de 64 x 256 et du refus d'une grille trop petite."""
+        etat = GameState(64, 256, graine=4)
+        # Quatre lignes du bas pleines sauf la dernière colonne, complétées par un I vertical
+        for lig in range(252, 256):
+            for col in range(63):
+                etat.plateau.grille[lig][col] = (255, 0, 0)
+        etat.piece_actuelle = Piece("I", 0, 0)
+        self.assertEqual(etat.jouer_placement(61, 1), 4)
+        self.assertEqual(etat.plateau.hauteurs, [0] * 64)
+        choisir = charger_politique("heuristique")()
+        for _ in range(100):
+            etat.jouer_placement(*choisir(etat))
+        self.assertFalse(etat.game_over)
+        self.assertTrue(all(masque < 1 << 64 for masque in etat.plateau.lignes))
+        with self.assertRaises(ValueError):
+            GameState(3, 20)
+
+    def test_parties_reproductibles(self):
+        """Vérification que deux parties de même graine sont identiques."""
+        etats = [GameState(graine=42), GameState(graine=42)]
+        for etat in etats:
+            for tick in range(3000):
+                etat.step(ACTION_CHUTE if tick % 7 == 0 else ACTION_GAUCHE if tick % 11 == 0 else 0)
+        self.assertEqual(etats[0].plateau.lignes, etats[1].plateau.lignes)
+        self.assertEqual(etats[0].nb_pieces, etats[1].nb_pieces)
+        self.assertGreater(etats[0].nb_pieces, 0)
+
+    def test_chute_verrouille(self):
+        """Vérification qu'une descente rapide verrouille la pièce dans le même tick."""
+        etat = GameState(graine=1)
+        evenements = etat.step(ACTION_CHUTE)
+        self.assertEqual(evenements, [EVENEMENT_POSE])
+        self.assertEqual(etat.nb_pieces, 1)
+        self.assertNotEqual(etat.plateau.lignes[-1], 0)
+
+    def test_effacement_apres_animation(self):
+        """Vérification que les lignes sont effacées et comptées à la fin de l'animation."""
+        etat = GameState(graine=3)
+        for col in range(etat.largeur):
+            if col not in range(3, 7):
+                etat.plateau.grille[19][col] = (255, 0, 0)
+        etat.piece_actuelle.forme = "I"
+        self.assertIn(EVENEMENT_LIGNES, etat.step(ACTION_CHUTE))
+        self.assertTrue(etat.en_animation)
+        while etat.en_animation:
+            etat.step()
+        self.assertEqual(etat.score, 100)
+        self.assertEqual(etat.plateau.lignes[19], 0)
+
+    def test_pause(self):
+        """Vérification que la gravité est suspendue pendant la pause."""
+        etat = GameState(graine=5)
+        etat.step(ACTION_PAUSE)
+        lig = etat.piece_actuelle.lig
+        for _ in range(200):
+            etat.step()
+        self.assertEqual(etat.piece_actuelle.lig, lig)
+
+    def test_avancer_equivaut_aux_ticks(self):
+        """avancer(n) donne le même état que n appels à step(), animations comprises."""
+        import random
+        rng = random.Random(4)
+        pas_a_pas = GameState(graine=8, duree_animation=100)
+        rapide = GameState(graine=8, duree_animation=100)
+        for _ in range(400):
+            nb_ticks = rng.choice([0, 1, 7, 40, 150])
+            for _ in range(nb_ticks):
+                pas_a_pas.step()
+            rapide.avancer(nb_ticks)
+            action = rng.choice([ACTION_GAUCHE, ACTION_CHUTE, ACTION_CHUTE, ACTION_PAUSE, 0])
+            for etat in (pas_a_pas, rapide):
+                etat.appliquer(action)
+            self.assertEqual((rapide.score, rapide.nb_pieces, rapide.fall_time, rapide.timer_animation),
+                             (pas_a_pas.score, pas_a_pas.nb_pieces, pas_a_pas.fall_time, pas_a_pas.timer_animation))
+            self.assertEqual(rapide.plateau.lignes, pas_a_pas.plateau.lignes)
+
+    def test_horloge_fixe(self):
+        """Le temps écoulé est converti en ticks fixes ; le reste est conservé, le retard plafonné."""
+        horloge = HorlogeFixe(duree_tick=16, retard_max=1000)
+        self.assertEqual(horloge.avancer(40), 2)
+        self.assertAlmostEqual(horloge.alpha, 0.5)
+        self.assertEqual(horloge.avancer(8), 1)
+        # Une frame bloquée pendant 5 s ne rattrape qu'une seconde
+        self.assertEqual(horloge.avancer(5000), 1000 // 16)
+
+    def test_courbes_niveaux(self):
+        """La courbe classique reproduit l'ancienne accélération ; les gravités invalides sont refusées."""
+        self.assertEqual(COURBE_CLASSIQUE.chute(0), (512, 1))
+        self.assertEqual(COURBE_CLASSIQUE.chute(20), (112, 1))
+        self.assertEqual(COURBE_CLASSIQUE.chute(500), (112, 1))
+        self.assertEqual(COURBE_CLASSIQUE.niveau(1499, 0), 2)
+        self.assertEqual(COURBE_RAPIDE.niveau(10 ** 6, 25), 2)
+        self.assertEqual(COURBE_RAPIDE.chute(19), (16, GRAVITE_20G))
+        self.assertEqual(CourbeNiveaux([1.5], lignes_par_niveau=1).chute(0), (32, 3))
+        with self.assertRaises(ValueError):
+            CourbeNiveaux([0], lignes_par_niveau=10)
+        with self.assertRaises(ValueError):
+            CourbeNiveaux([1], points_par_niveau=500, lignes_par_niveau=10)
+
+    def test_gravite_20g(self):
+        """En 20G, la pièce atteint sa ligne de repos dès le premier tick, puis se pose."""
+        etat = GameState(graine=6, courbe=CourbeNiveaux([GRAVITE_20G], lignes_par_niveau=10))
+        repos = etat.piece_actuelle.lig + etat.plateau.distance_chute(etat.piece_actuelle)
+        etat.step(ACTION_GAUCHE)
+        self.assertEqual(etat.piece_actuelle.lig, repos)
+        self.assertEqual(etat.nb_pieces, 0)
+        self.assertEqual(etat.step(), [EVENEMENT_POSE])
+
+    def test_avancer_gravite_rapide(self):
+        """avancer(n) reste équivalent à n ticks avec des descentes de plusieurs lignes."""
+        import random
+        rng = random.Random(9)
+        for courbe in (COURBE_RAPIDE, CourbeNiveaux([1.5, 5, GRAVITE_20G], lignes_par_niveau=1)):
+            pas_a_pas = GameState(graine=2, duree_animation=100, courbe=courbe)
+            rapide = GameState(graine=2, duree_animation=100, courbe=courbe)
+            for _ in range(300):
+                nb_ticks = rng.choice([0, 1, 5, 17, 60])
+                for _ in range(nb_ticks):
+                    pas_a_pas.step()
+                rapide.avancer(nb_ticks)
+                action = rng.choice([ACTION_GAUCHE, ACTION_CHUTE, 2, 3, 0, 0])
+                for etat in (pas_a_pas, rapide):
+                    etat.appliquer(action)
+                self.assertEqual((rapide.score, rapide.nb_pieces, rapide.niveau, rapide.fall_time,
+                                  rapide.piece_actuelle.lig, rapide.plateau.lignes),
+                                 (pas_a_pas.score, pas_a_pas.nb_pieces, pas_a_pas.niveau, pas_a_pas.fall_time,
+                                  pas_a_pas.piece_actuelle.lig, pas_a_pas.plateau.lignes))
+
+    def test_instantane_restaurer(self):
+        """Une partie restaurée rejoue exactement la même suite, y compris au-delà d'un lot de pièces."""
+        politique = charger_politique("heuristique")()
+
+        def jouer(etat):
+            for _ in range(400):
+                etat.step(ACTION_GAUCHE)
+                etat.jouer_placement(*politique(etat))
+            return (etat.plateau.lignes, etat.plateau.couleurs, etat.plateau.hauteurs,
+                    etat.piece_actuelle.forme, etat.score, etat.nb_pieces, etat.game_over)
+
+        etat = GameState(graine=5)
+        for _ in range(20):
+            etat.jouer_placement(*politique(etat))
+        for _ in range(40):
+            etat.step()
+        instantane = etat.instantane()
+        # Les rangées du plateau sont partagées avec l'instantané, pas copiées
+        self.assertIs(instantane.plateau[1][-1], etat.plateau.couleurs[-1])
+        attendu = jouer(etat)
+        self.assertGreater(etat.nb_pieces, 300)
+        self.assertFalse(etat.game_over)
+        for _ in range(2):
+            etat.restaurer(instantane)
+            self.assertEqual(jouer(etat), attendu)
+
+# ==============================================================================
+# Tests unitaires pour la classe GenerateurPieces
+# ==============================================================================
+class TestGenerateurPieces(unittest.TestCase):
+    def test_suite_independante_du_decoupage(self):
+        """Vérification que la suite ne dépend que de la graine, pas de la taille des demandes."""
+        for mode in ("aleatoire", MODE_SAC):
+            en_bloc = GenerateurPieces(11, mode).generer(1000)
+            generateur = GenerateurPieces(11, mode)
+            une_par_une = [generateur.suivante() for _ in range(300)] + generateur.generer(700)
+            self.assertEqual(en_bloc, une_par_une)
+            self.assertNotEqual(en_bloc, GenerateurPieces(12, mode).generer(1000))
+
+    def test_mode_sac(self):
+        """Vérification que chaque sac de 7 pièces contient toutes les formes."""
+        suite = GenerateurPieces(3, MODE_SAC).generer(70)
+        for i in range(0, 70, 7):
+            self.assertEqual(sorted(suite[i:i + 7]), sorted(FORMES))
+
+    def test_instantane_avant_remplissage(self):
+        """Un instantané pris avant un nouveau lot replace aussi le générateur aléatoire."""
+        generateur = GenerateurPieces(8, MODE_SAC)
+        generateur.generer(5)
+        instantane = generateur.instantane()
+        suite = generateur.generer(30)
+        generateur.restaurer(instantane)
+        self.assertEqual(generateur.generer(30), suite)
+
+    def test_mode_inconnu(self):
+        """Vérification qu'un mode de génération inconnu est refusé."""
+        with self.assertRaises(ValueError):
+            GenerateurPieces(0, "inconnu")
+
+# ==============================================================================
+# Tests des replays (replay.py)
+# ==============================================================================
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        """Enregistre une partie jouée tick par tick avec des actions pseudo-aléatoires."""
+        import random
+        rng = random.Random(3)
+        etat = GameState(graine=12345, duree_animation=100)
+        enregistreur = EnregistreurReplay(etat, 12345)
+        for _ in range(3000):
+            if rng.random() < 0.1:
+                action = rng.choice([ACTION_GAUCHE, ACTION_CHUTE, ACTION_PAUSE, 2, 3, 4])
+                etat.appliquer(action)
+                enregistreur.action(action)
+            etat.step()
+            enregistreur.tick()
+        self.replay = enregistreur.terminer()
+        self.assertGreater(self.replay.nb_pieces, 10)
+
+    def test_aller_retour_binaire(self):
+        """Le format binaire conserve toutes les informations du replay."""
+        copie = Replay.decoder(self.replay.encoder())
+        self.assertEqual((copie.graine, copie.nb_ticks, copie.score, copie.nb_pieces),
+                         (self.replay.graine, self.replay.nb_ticks, self.replay.score, self.replay.nb_pieces))
+        self.assertEqual(copie.actions, self.replay.actions)
+        self.assertEqual(copie.formes, self.replay.formes)
+
+    def test_verification(self):
+        """Un replay fidèle est valide ; un score falsifié ou une graine modifiée sont détectés."""
+        self.replay.actions.insert(0, (0, ACTION_PAUSE))
+        self.replay.actions.insert(1, (0, ACTION_PAUSE))
+        self.assertTrue(verifier(self.replay)["valide"])
+        self.replay.score += 100
+        self.assertFalse(verifier(self.replay)["valide"])
+        self.replay.score -= 100
+        self.replay.graine += 1
+        self.assertIn("graine", verifier(self.replay)["raison"])
+
+    def test_courbe_non_classique_refusee(self):
+        """Le format de replay ne décrit que la courbe classique : les autres sont refusées."""
+        with self.assertRaises(ValueError):
+            EnregistreurReplay(GameState(graine=1, courbe=COURBE_RAPIDE), 1)
+
+    def test_nouvelle_partie_courbe_rapide(self):
+        """main.nouvelle_partie ne fait pas planter le jeu : la partie est jouée sans enregistrement."""
+        from main import nouvelle_partie
+        with patch('builtins.print') as avertissement:
+            etat, enregistreur = nouvelle_partie(True, COURBE_RAPIDE)
+        self.assertIs(etat.courbe, COURBE_RAPIDE)
+        self.assertIsNone(enregistreur)
+        avertissement.assert_called_once()
+        self.assertIsNotNone(nouvelle_partie(True)[1])
+
+# ==============================================================================
+# Tests des parties automatiques (run_selfplay.py)
+# ==============================================================================
+class TestSelfPlay(unittest.TestCase):
+    def test_partie_deterministe(self):
+        """Vérification que deux parties de même graine donnent le même résultat."""
+        self.assertEqual(run_selfplay.jouer_partie(7, "aleatoire"), run_selfplay.jouer_partie(7, "aleatoire"))
+
+    def test_politique_heuristique(self):
+        """Vérification que la politique heuristique efface des lignes."""
+        resultat = run_selfplay.jouer_partie(1, "heuristique", max_pieces=100)
+        self.assertGreater(resultat["lignes"], 10)
+
+    def test_executer_processus(self):
+        """Vérification de l'agrégation des statistiques sur un pool de processus."""
+        stats = run_selfplay.executer(6, graine=3, politique="aleatoire", processus=2)
+        sequentiel = run_selfplay.executer(6, graine=3, politique="aleatoire", processus=1)
+        self.assertEqual(stats["parties"], 6)
+        self.assertEqual(stats["resultats"], sequentiel["resultats"])
+        self.assertEqual(stats["pieces"], sum(r["pieces"] for r in stats["resultats"]))
+
+    def test_politique_inconnue(self):
+        """Vérification qu'un nom de politique inconnu est refusé."""
+        with self.assertRaises(ValueError):
+            charger_politique("inexistante")
+        self.assertIs(charger_politique("politiques:politique_aleatoire"), charger_politique("aleatoire"))
+
+# ==============================================================================
+# Tests unitaires pour les caractéristiques de plateau
+# ==============================================================================
+class TestCaracteristiques(unittest.TestCase):
+    def test_valeurs(self):
+        """Vérification des caractéristiques d'un plateau construit à la main."""
+        plateau = Plateau(10, 20)
+        plateau.lock_piece(Piece("O", 0, 18))
+        plateau.set_case(19, 3, (255, 0, 0))
+        plateau.set_case(17, 3, (255, 0, 0))
+        self.assertEqual(trous_par_colonne(plateau), [0, 0, 0, 1] + [0] * 6)
+        valeurs = dict(zip(NOMS_CARACTERISTIQUES, caracteristiques(plateau)))
+        self.assertEqual(valeurs, {"hauteur_totale": 7, "trous": 1, "bosses": 8, "transitions_lignes": 44,
+                                   "transitions_colonnes": 12, "puits": 3})
+
+    @unittest.skipIf(np is None, "NumPy n'est pas installé")
+    def test_placements_vectorises(self):
+        """Le calcul vectorisé de tous les placements donne les valeurs du calcul placement par placement."""
+        etat = GameState(graine=9)
+        choisir = charger_politique("aleatoire")(9)
+        for _ in range(25):
+            etat.jouer_placement(*choisir(etat))
+        plateau = etat.plateau
+        lignes = list(plateau.lignes)
+        for forme in LISTE_FORMES:
+            placements, nb_lignes, valeurs = batch.caracteristiques_placements(plateau, forme)
+            for k, (col, rotation, lig) in enumerate(placements):
+                attendu = caracteristiques_placement(plateau, forme, col, rotation, lig)
+                self.assertEqual((int(nb_lignes[k]), tuple(int(v) for v in valeurs[k])), attendu)
+        self.assertEqual(plateau.lignes, lignes)
+
+# ==============================================================================
+# Tests unitaires pour le joueur automatique (recherche en faisceau)
+# ==============================================================================
+class TestBot(unittest.TestCase):
+    def test_hachage_incremental(self):
+        """Le hachage mis à jour par les cases posées est celui du plateau recalculé."""
+        recherche = RechercheFaisceau()
+        etat = GameState(graine=2)
+        plateau, h = etat.plateau, bot.hacher(etat.plateau)
+        for _ in range(60):
+            forme = etat.piece_actuelle.forme
+            col, rotation = recherche.choisir(etat)
+            lig = plateau.ligne_atterrissage(forme, rotation, col)
+            h, _ = recherche._poser(plateau, h, forme, col, rotation, lig)
+            self.assertEqual(h, bot.hacher(plateau))
+            etat._piece_suivante()
+
+    def test_table_bornee(self):
+        """La table de transposition ne dépasse pas sa taille et sert d'un coup à l'autre."""
+        stats = bot.mesurer(1, graine=4, taille_table=500, max_pieces=150)
+        self.assertFalse(stats["resultats"][0]["game_over"])
+        self.assertEqual(stats["entrees_table"], 500)
+        self.assertGreater(stats["taux_succes"], 0)
+        self.assertGreater(stats["noeuds_par_seconde"], 0)
+
+    def test_politique_recherche(self):
+        """La recherche est disponible comme politique et joue mieux que le hasard."""
+        resultat = run_selfplay.jouer_partie(3, "recherche", max_pieces=200)
+        self.assertFalse(resultat["game_over"])
+        self.assertGreater(resultat["lignes"], 60)
+
+    def test_pilote_automatique(self):
+        """Le pilote amène chaque pièce au placement choisi avec les actions du clavier."""
+        etat = GameState(graine=6)
+        pilote = PiloteAutomatique()
+        for _ in range(3000):
+            etat.step(pilote.action(etat))
+        self.assertFalse(etat.game_over)
+        self.assertGreater(etat.nb_lignes, 20)
+
+# ==============================================================================
+# Tests des parties versus (versus.py, serveur_versus.py)
+# ==============================================================================
+class TestVersus(unittest.TestCase):
+    def test_inserer_lignes(self):
+        """Les déchets remontent la pile ; hauteurs et remplissages restent ceux du plateau recalculé."""
+        etat = GameState(graine=3)
+        choisir = charger_politique("heuristique")()
+        for _ in range(15):
+            etat.jouer_placement(*choisir(etat))
+        plateau = etat.plateau
+        self.assertFalse(plateau.inserer_lignes(3, 4))
+        self.assertEqual(plateau.lignes[-1], plateau.ligne_pleine & ~(1 << 4))
+        attendu = Plateau(10, 20)
+        attendu.charger_rangees(plateau.couleurs)
+        self.assertEqual((plateau.lignes, plateau.hauteurs, plateau.remplies),
+                         (attendu.lignes, attendu.hauteurs, attendu.remplies))
+        self.assertTrue(plateau.inserer_lignes(20, 0))
+        self.assertEqual(plateau.hauteurs, [0] + [20] * 9)
+
+    def test_dechets_envoyes(self):
+        """Un Tetris envoie quatre lignes, insérées chez l'adversaire à sa pièce suivante ; les miroirs suivent."""
+        match = versus.MatchVersus(7)
+        miroirs = [versus.creer_miroir(versus.decoder(match.message_debut(i))) for i in range(2)]
+        etat = match.joueurs[0].etat
+        for lig in range(16, 20):
+            for col in range(9):
+                etat.plateau.grille[lig][col] = (255, 0, 0)
+        etat.piece_actuelle = Piece("I", 7, 0, 1)
+        match.ajouter_action(0, ACTION_CHUTE)
+        for _ in range(40):
+            match.avancer_tick()
+        self.assertEqual(match.joueurs[1].nb_attente(), 4)
+        match.ajouter_action(1, ACTION_CHUTE)
+        message = match.avancer_tick()
+        adversaire = match.joueurs[1].etat
+        self.assertEqual(adversaire.plateau.lignes[-4:].count(adversaire.plateau.lignes[-1]), 4)
+        self.assertEqual(bin(adversaire.plateau.lignes[-1]).count("1"), 9)
+        self.assertEqual(match.joueurs[1].nb_attente(), 0)
+        # Les miroirs reconstruits à partir d'un message complet sont identiques aux parties du serveur
+        donnees = versus.decoder(match.message_etat(complet=True))
+        for miroir, vue, joueur in zip(miroirs, donnees["joueurs"], match.joueurs):
+            versus.appliquer_vue(miroir, vue)
+            self.assertEqual(miroir.plateau.lignes, joueur.etat.plateau.lignes)
+            self.assertEqual(miroir.plateau.hauteurs, joueur.etat.plateau.hauteurs)
+            self.assertEqual(miroir.piece_actuelle.get_cases(), joueur.etat.piece_actuelle.get_cases())
+        self.assertIsNotNone(message)
+        self.assertIsNone(match.avancer_tick())
+
+    def test_serveur_local(self):
+        """Deux clients sont appariés ; l'abandon de l'un termine le match du client automatique."""
+        import asyncio
+        import time
+
+        async def scenario():
+            serveur = serveur_versus.ServeurVersus(port=0, cadence=2)
+            await serveur.demarrer()
+            statistiques = charge_versus.StatistiquesClients()
+            bot_client = asyncio.create_task(charge_versus.client(
+                "127.0.0.1", serveur.port, "heuristique", statistiques, time.monotonic() + 0.5, 0))
+            lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", serveur.port)
+            debut = versus.decoder(await lecteur.readline())
+            premier_etat = versus.decoder(await lecteur.readline())
+            await asyncio.sleep(0.2)
+            ecrivain.close()
+            await bot_client
+            await serveur.arreter()
+            return debut, premier_etat, statistiques, serveur.statistiques()
+
+        debut, premier_etat, statistiques, resultats = asyncio.run(scenario())
+        self.assertEqual(debut["type"], "debut")
+        self.assertIn("plateau", premier_etat["joueurs"][1 - debut["joueur"]])
+        self.assertGreaterEqual(statistiques.matchs, 1)
+        self.assertGreater(statistiques.actions, 0)
+        self.assertEqual(resultats["deconnexions_lentes"], 0)
+
+    def test_actions_refusees(self):
+        """La file d'actions est bornée ; un message invalide ou une inondation fait abandonner le client."""
+        import asyncio
+        match = versus.MatchVersus(3)
+        for _ in range(versus.ACTIONS_EN_ATTENTE_MAX):
+            self.assertTrue(match.ajouter_action(0, ACTION_GAUCHE))
+        self.assertFalse(match.ajouter_action(0, ACTION_GAUCHE))
+        self.assertEqual(len(match.joueurs[0].actions), versus.ACTIONS_EN_ATTENTE_MAX)
+        for action in (7, -1, True, "1", None):
+            with self.assertRaises(ValueError):
+                match.ajouter_action(1, action)
+
+        async def partie(messages):
+            """Apparie deux clients ; le premier envoie `messages` et doit être déconnecté."""
+            serveur = serveur_versus.ServeurVersus(port=0, cadence=2)
+            await serveur.demarrer()
+            connexions = [await asyncio.open_connection("127.0.0.1", serveur.port) for _ in range(2)]
+            lecteur, ecrivain = connexions[0]
+            ecrivain.write(b"".join(messages))
+            # Le client fautif est déconnecté sans message "fin"
+            while (ligne := await lecteur.readline()) and versus.decoder(ligne)["type"] != "fin":
+                pass
+            for _, autre in connexions:
+                autre.close()
+            await serveur.arreter()
+            return serveur.statistiques()
+
+        action = versus.encoder({"type": "action", "action": ACTION_GAUCHE})
+        for messages in ([b"[1]\n"], [b"3\n"], [versus.encoder({"type": "action", "action": 42})]):
+            self.assertEqual(asyncio.run(partie(messages))["deconnexions_inondation"], 0)
+        resultats = asyncio.run(partie([action] * (versus.ACTIONS_EN_ATTENTE_MAX + 50)))
+        self.assertEqual(resultats["deconnexions_inondation"], 1)
+
+    def test_charge_port_occupe(self):
+        """Le test de charge s'arrête en erreur si son serveur ne démarre pas (port déjà pris)."""
+        import io
+        import socket
+        with socket.socket() as ecoute, patch('sys.stderr', io.StringIO()) as erreurs:
+            ecoute.bind(("127.0.0.1", 0))
+            ecoute.listen()
+            port = ecoute.getsockname()[1]
+            self.assertEqual(charge_versus.main(["--port", str(port), "--duree", "1", "--matchs", "1"]), 1)
+        self.assertIn(str(port), erreurs.getvalue())
+
+    def test_client_message_invalide(self):
+        """Un message invalide du serveur termine la connexion du client (message None)."""
+        import socket
+        import time
+        for invalide in (b'{"type": "etat", "tick\n', b'[1]\n'):
+            with socket.socket() as ecoute:
+                ecoute.bind(("127.0.0.1", 0))
+                ecoute.listen()
+                client = versus.ClientVersus("127.0.0.1", ecoute.getsockname()[1])
+                serveur, _ = ecoute.accept()
+                with serveur:
+                    serveur.sendall(versus.encoder({"type": "fin", "gagnant": None}) + invalide)
+                    messages = []
+                    limite = time.monotonic() + 5
+                    while None not in messages and time.monotonic() < limite:
+                        messages += client.recevoir()
+                        time.sleep(0.01)
+                client.fermer()
+            self.assertEqual(messages, [{"type": "fin", "gagnant": None}, None])
+
+    def test_serveur_injoignable(self):
+        """Un serveur ou une diffusion injoignable ne fait pas planter le client pygame."""
+        import socket
+        import main as jeu
+        with socket.socket() as ecoute:
+            ecoute.bind(("127.0.0.1", 0))
+            adresse = "127.0.0.1:%d" % ecoute.getsockname()[1]
+        # Port libéré : la connexion est refusée avant toute utilisation de la fenêtre
+        self.assertFalse(jeu.jouer_versus(None, None, None, None, None, adresse))
+        self.assertFalse(jeu.regarder_partie(None, None, None, None, None, adresse))
+
+# ==============================================================================
+# Tests de la diffusion aux spectateurs (spectateur.py)
+# ==============================================================================
+class TestSpectateur(unittest.TestCase):
+    def _jouer(self, etat, pilote, rng, nb_ticks):
+        """Avance la partie de nb_ticks ticks et retourne la liste des états diffusables."""
+        for _ in range(nb_ticks):
+            action = pilote.action(etat) if rng.random() < 0.5 else rng.choice([0, 0, 1, 2, 3])
+            etat.step(action)
+            if rng.random() < 0.005:
+                etat.recevoir_lignes(rng.randint(1, 3), rng.randrange(etat.largeur))
+            yield etat
+
+    def assertMiroir(self, miroir, etat):
+        self.assertEqual(miroir.plateau.couleurs, etat.plateau.couleurs)
+        self.assertEqual((miroir.plateau.lignes, miroir.plateau.hauteurs, miroir.plateau.remplies),
+                         (etat.plateau.lignes, etat.plateau.hauteurs, etat.plateau.remplies))
+        self.assertEqual(miroir.piece_actuelle.get_cases(), etat.piece_actuelle.get_cases())
+        self.assertEqual((miroir.score, miroir.game_over, miroir.en_animation, miroir.piece_suivante.forme),
+                         (etat.score, etat.game_over, etat.en_animation, etat.piece_suivante.forme))
+
+    def test_deltas(self):
+        """Les deltas reconstruisent la partie à chaque tick et restent bien plus petits qu'une image clé."""
+        import random
+        rng = random.Random(1)
+        etat = GameState(graine=11, duree_animation=100)
+        encodeur = spectateur.EncodeurSpectateur(intervalle_images_cles=200)
+        miroir, _ = spectateur.appliquer_trame(None, encodeur.image_cle(etat, 0))
+        for tick, etat in enumerate(self._jouer(etat, PiloteAutomatique(), rng, 1500), 1):
+            trame = encodeur.trame(etat, tick)
+            if trame is not None:
+                miroir, _ = spectateur.appliquer_trame(miroir, trame)
+            self.assertMiroir(miroir, etat)
+        self.assertGreater(encodeur.nb_deltas, 100)
+        self.assertGreaterEqual(encodeur.nb_images_cles, 1500 // 200)
+        self.assertLess(encodeur.octets_deltas / encodeur.nb_deltas, 40)
+
+    def test_diffusion(self):
+        """Tous les spectateurs, y compris un spectateur arrivé en cours de partie, reconstruisent la partie."""
+        import asyncio
+        import random
+
+        async def lire_flux(lecteur):
+            donnees = await lecteur.read()
+            trames = []
+            position = 0
+            while position < len(donnees):
+                taille, = spectateur.ENCADREMENT.unpack_from(donnees, position)
+                position += spectateur.ENCADREMENT.size
+                trames.append(donnees[position:position + taille])
+                position += taille
+            return trames
+
+        async def scenario():
+            rng = random.Random(2)
+            diffuseur = spectateur.DiffuseurSpectateurs()
+            await diffuseur.demarrer(port=0)
+            encodeur = spectateur.EncodeurSpectateur(intervalle_images_cles=150)
+            etat = GameState(graine=12, duree_animation=100)
+            parties = self._jouer(etat, PiloteAutomatique(), rng, 400)
+            diffuseur.publier(encodeur.image_cle(etat, 0))
+            connexions = []
+            for tick in range(1, 401):
+                if tick in (1, 230):
+                    connexions.append(await asyncio.open_connection("127.0.0.1", diffuseur.port))
+                    await asyncio.sleep(0.05)
+                next(parties)
+                trame = encodeur.trame(etat, tick)
+                if trame is not None:
+                    diffuseur.publier(trame)
+                await asyncio.sleep(0)
+            await diffuseur.arreter()
+            flux = [await lire_flux(lecteur) for lecteur, _ in connexions]
+            for _, ecrivain in connexions:
+                ecrivain.close()
+            return etat, flux
+
+        etat, flux = asyncio.run(scenario())
+        self.assertGreater(len(flux[0]), len(flux[1]))
+        for trames in flux:
+            self.assertEqual(trames[0][0], spectateur.TRAME_CLE)
+            miroir = None
+            for trame in trames:
+                miroir, _ = spectateur.appliquer_trame(miroir, trame)
+            self.assertMiroir(miroir, etat)
+
+# ==============================================================================
+# Tests unitaires pour les plateaux vectorisés (batch.py)
+# ==============================================================================
+@unittest.skipIf(np is None, "NumPy n'est pas installé")
+class TestBatch(unittest.TestCase):
+    def test_collisions_identiques(self):
+        """Vérification que les collisions vectorisées correspondent à celles du moteur."""
+        rng = np.random.default_rng(0)
+        lot = batch.PlateauxBatch(50)
+        lot.cases[rng.random(lot.cases.shape) < 0.2] = 1
+        formes = rng.integers(0, 7, 50)
+        rotations = rng.integers(0, 4, 50) % batch.NB_ROTATIONS[formes]
+        cols = rng.integers(-3, 11, 50)
+        ligs = rng.integers(-2, 21, 50)
+        valides = lot.is_valid_move(formes, rotations, cols, ligs)
+        for i in range(50):
+            plateau = Plateau(10, 20)
+            for lig, col in zip(*np.nonzero(lot.cases[i])):
+                plateau.grille[lig][col] = (255, 0, 0)
+            attendu = not plateau.collision(LISTE_FORMES[formes[i]], rotations[i], cols[i], ligs[i])
+            self.assertEqual(valides[i], attendu)
+
+    def test_effacer_lignes(self):
+        """Vérification de l'effacement simultané de lignes différentes sur plusieurs plateaux."""
+        lot = batch.PlateauxBatch(2)
+        lot.cases[0, 19] = 1
+        lot.cases[0, 18, 0] = 2
+        lot.cases[1, 17:19] = 3
+        lot.cases[1, 16, 5] = 4
+        nb = lot.effacer_lignes(lot.get_lignes_completes())
+        self.assertEqual(list(nb), [1, 2])
+        self.assertEqual(lot.cases[0, 19, 0], 2)
+        self.assertEqual(lot.cases[1, 18, 5], 4)
+        self.assertEqual(int(np.count_nonzero(lot.cases)), 2)
+
+    def test_regles_identiques(self):
+        """Vérification que le lot suit les mêmes règles que GameState pour une même graine."""
+        lot = batch.BatchGameState(3, graine=10, duree_animation=100)
+        etats = [GameState(graine=10 + i, duree_animation=100) for i in range(3)]
+        for etat in etats:
+            for col in range(9):
+                etat.plateau.grille[18][col] = (255, 0, 0)
+                etat.plateau.grille[19][col] = (255, 0, 0)
+        lot.plateaux.cases[:, 18:, :9] = 1
+        motif = (2, 2, 2, 2, 2, 5, 3, 1)
+        for tick in range(3000):
+            actions = np.array([motif[(tick // 3 + i) % len(motif)] if tick % 3 == 0 else 0 for i in range(3)])
+            lot.step(actions)
+            for i, etat in enumerate(etats):
+                etat.step(int(actions[i]))
+                occupees = [int(sum(1 << int(c) for c in np.flatnonzero(ligne))) for ligne in lot.plateaux.cases[i]]
+                self.assertEqual(occupees, etat.plateau.lignes)
+                self.assertEqual((lot.score[i], lot.game_over[i]), (etat.score, etat.game_over))
+                self.assertEqual(LISTE_FORMES[lot.forme[i]], etat.piece_actuelle.forme)
+        # Le scénario doit inclure au moins un effacement de lignes
+        self.assertGreater(lot.score.sum(), 0)
+
+# ==============================================================================
+# Tests unitaires pour l'affichage pré-rendu
+# ==============================================================================
+class TestAffichage(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.couche = CoucheStatique()
+        self.ecran = pygame.Surface((500, 600))
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_score_rendu_si_change(self):
+        """Le texte du score n'est rasterisé à nouveau que si le score change."""
+        self.couche.draw_score(self.ecran, 100)
+        rendu = self.couche.surface_score
+        self.couche.draw_score(self.ecran, 100)
+        self.assertIs(self.couche.surface_score, rendu)
+        self.couche.draw_score(self.ecran, 200)
+        self.assertIsNot(self.couche.surface_score, rendu)
+
+    def test_cache_textes(self):
+        """Un même texte n'est rendu qu'une fois ; le moins récemment utilisé est évincé."""
+        cache = CacheTextes()
+        cache.vider()
+        taille_max, cache.taille_max = cache.taille_max, 2
+        try:
+            pause = cache.rendre("PAUSE", None, 36, (255, 255, 255))
+            self.assertIs(cache.rendre("PAUSE", None, 36, (255, 255, 255)), pause)
+            cache.rendre("GAME OVER", None, 36, (255, 255, 255))
+            cache.rendre("PAUSE", None, 36, (255, 255, 255))
+            cache.rendre("Score :", None, 24, (255, 255, 255))
+            self.assertEqual(set(texte for _, _, texte, _ in cache.textes), {"PAUSE", "Score :"})
+        finally:
+            cache.taille_max = taille_max
+
+    def test_cache_vide_a_la_sortie(self):
+        """Les polices ne survivent pas à pygame.quit()."""
+        CacheTextes().police(None, 20)
+        pygame.quit()
+        self.assertEqual(CacheTextes().polices, {})
+
+    def test_zones_modifiees(self):
+        """Seules les zones modifiées sont redessinées ; une frame inchangée est sautée."""
+        etat = GameState(graine=1)
+        suivi = ZonesModifiees()
+        self.assertEqual(suivi.calculer(etat, 0), [pygame.Rect(0, 0, 500, 600)])
+        self.assertEqual(suivi.calculer(etat, 0), [])
+        etat.appliquer(ACTION_GAUCHE)
+        zones = suivi.calculer(etat, 0)
+        self.assertEqual(len(zones), 2)  # Ancienne et nouvelle empreinte de la pièce
+        for col, lig in etat.piece_actuelle.get_cases():
+            self.assertTrue(any(zone.collidepoint(col * TAILLE_CASE, lig * TAILLE_CASE) for zone in zones))
+        etat.appliquer(ACTION_CHUTE)
+        etat.mettre_a_jour(0)
+        zones = suivi.calculer(etat, 0)
+        self.assertTrue(all(zone.width < 500 for zone in zones))
+        self.assertTrue(any(zone.bottom == 600 for zone in zones))  # Pièce posée en bas du plateau
+
+    def test_atlas_blocs(self):
+        """Chaque bloc est un sprite unique : couleur de fond et contour noir."""
+        atlas = atlas_blocs(TAILLE_CASE)
+        self.assertIs(atlas_blocs(TAILLE_CASE), atlas)
+        sprite = atlas.bloc((0, 255, 255))
+        self.assertIs(atlas.bloc((0, 255, 255)), sprite)
+        self.assertEqual(sprite.get_size(), (TAILLE_CASE, TAILLE_CASE))
+        self.assertEqual(sprite.get_at((0, 0))[:3], (0, 0, 0))
+        self.assertEqual(sprite.get_at((TAILLE_CASE // 2, TAILLE_CASE // 2))[:3], (0, 255, 255))
+
+    def test_dessin_plateau_par_sprites(self):
+        """Le plateau dessiné par blits reproduit les blocs posés."""
+        plateau = PlateauDeJeu(10, 20)
+        plateau.grille[19][2] = (255, 0, 0)
+        plateau.draw(self.ecran)
+        self.assertEqual(self.ecran.get_at((2 * TAILLE_CASE + 5, 19 * TAILLE_CASE + 5))[:3], (255, 0, 0))
+        self.assertEqual(self.ecran.get_at((2 * TAILLE_CASE, 19 * TAILLE_CASE))[:3], (0, 0, 0))
+
+    def test_surface_plateau_en_cache(self):
+        """Le plateau n'est redessiné qu'après une modification ; le flash ne couvre que les lignes animées."""
+        plateau = PlateauDeJeu(10, 20)
+        plateau.grille[19][2] = (255, 0, 0)
+        plateau.grille[18][2] = (255, 0, 0)
+        with patch('pygame.time.get_ticks', return_value=0):
+            # L'atlas n'est consulté que pour redessiner la surface du plateau
+            with patch('main.atlas_blocs', wraps=atlas_blocs) as atlas:
+                draw_plateau(self.ecran, plateau)
+                draw_plateau(self.ecran, plateau)
+                self.assertEqual(atlas.call_count, 1)
+                plateau.effacer_lignes([19])
+                draw_plateau(self.ecran, plateau)
+                self.assertEqual(atlas.call_count, 2)
+            plateau.grille[18][3] = (0, 255, 0)
+            draw_plateau(self.ecran, plateau, lignes_animation=[19])
+            self.assertEqual(self.ecran.get_at((2 * TAILLE_CASE + 5, 19 * TAILLE_CASE + 5))[:3], (255, 255, 255))
+            self.assertEqual(self.ecran.get_at((3 * TAILLE_CASE + 5, 18 * TAILLE_CASE + 5))[:3], (0, 255, 0))
+
+    def test_animation_lignes(self):
+        """Drapeaux des lignes animées et phase de chaque effet."""
+        animation = AnimationLignes(EFFET_FLASH)
+        animation.synchroniser([18, 19], 20)
+        self.assertTrue(animation.est_animee(19))
+        self.assertFalse(animation.est_animee(5))
+        self.assertEqual([animation.phase(temps) for temps in (0, 149, 150, 300)], [0, 0, 1, 0])
+        fondu = AnimationLignes(EFFET_FONDU)
+        self.assertLess(fondu.phase(0, 0.25), fondu.phase(0, 0.75))
+        with self.assertRaises(ValueError):
+            AnimationLignes("inconnu")
+
+    def test_effets_animation(self):
+        """Chaque effet modifie uniquement les lignes animées."""
+        plateau = PlateauDeJeu(10, 20)
+        for lig in (18, 19):
+            for col in range(10):
+                plateau.grille[lig][col] = (255, 0, 0)
+        centre_18 = (5 * TAILLE_CASE + 5, 18 * TAILLE_CASE + TAILLE_CASE // 2)
+        centre_19 = (5 * TAILLE_CASE + 5, 19 * TAILLE_CASE + TAILLE_CASE // 2)
+        attendus = {EFFET_FLASH: (255, 255, 255), EFFET_FONDU: (0, 0, 0), EFFET_EFFONDREMENT: (0, 0, 0)}
+        with patch('pygame.time.get_ticks', return_value=0):
+            for effet, couleur in attendus.items():
+                draw_plateau(self.ecran, plateau, [19], AnimationLignes(effet), progression=1.0)
+                self.assertEqual(self.ecran.get_at(centre_19)[:3], couleur)
+                self.assertEqual(self.ecran.get_at(centre_18)[:3], (255, 0, 0))
+
+    def test_decalage_chute(self):
+        """La chute interpolée progresse avec le temps de chute et reste sous une case."""
+        etat = GameState(graine=2)
+        self.assertEqual(decalage_chute(etat), 0)
+        etat.fall_time = etat.fall_speed // 2
+        self.assertEqual(decalage_chute(etat), TAILLE_CASE // 2)
+        etat.fall_time = etat.fall_speed * 2
+        self.assertEqual(decalage_chute(etat, 1.0), TAILLE_CASE - 1)
+        etat.appliquer(ACTION_CHUTE)  # Posée au fond : la pièce ne peut plus descendre
+        self.assertEqual(decalage_chute(etat), 0)
+
+    def test_grille_transparente(self):
+        """Le calque de grille ne recouvre que les lignes, pas l'intérieur des cases."""
+        self.ecran.fill((255, 0, 0))
+        self.couche.draw_grille(self.ecran)
+        self.assertEqual(self.ecran.get_at((TAILLE_CASE // 2, TAILLE_CASE // 2))[:3], (255, 0, 0))
+        self.assertEqual(self.ecran.get_at((TAILLE_CASE, TAILLE_CASE // 2))[:3], (60, 60, 60))
+
 # ==============================================================================
 # Tests unitaires pour la classe SoundManager
 # ==============================================================================
@@ -225,6 +1211,87 @@ class TestSoundManager(unittest.TestCase):
         self.sound_manager.play_sound('nonexistent')
         # Aucune erreur ne devrait être levée
 
+    def test_cache_pcm(self):
+        """Un son décodé est relu depuis le cache disque tant que sa source ne change pas."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as dossier, patch('sound_manager.pygame.mixer') as mixer:
+            mixer.get_init.return_value = (44100, -16, 2)
+            mixer.Sound.return_value.get_raw.return_value = b'\x01\x02\x03\x04'
+            source = os.path.join(dossier, 'son.mp3')
+            with open(source, 'wb') as fichier:
+                fichier.write(b'mp3')
+            self.sound_manager.dossier_cache = os.path.join(dossier, 'cache')
+            self.sound_manager._charger_son(source)
+            mixer.Sound.assert_called_once_with(source)
+            # Second chargement : PCM lu depuis le cache, sans décodage
+            self.sound_manager._charger_son(source)
+            mixer.Sound.assert_called_with(buffer=b'\x01\x02\x03\x04')
+            # Source modifiée ou autre format de mixer : le fichier est décodé à nouveau
+            with open(source, 'ab') as fichier:
+                fichier.write(b'!')
+            self.sound_manager._charger_son(source)
+            mixer.Sound.assert_called_with(source)
+            mixer.get_init.return_value = (22050, -16, 2)
+            self.sound_manager._charger_son(source)
+            mixer.Sound.assert_called_with(source)
+        self.sound_manager.dossier_cache = os.path.join(os.path.expanduser('~'), '.cache', 'tetris')
+
+    def test_thread_audio(self):
+        """Après demarrer(), les commandes sont exécutées par le thread audio, dans l'ordre."""
+        appels = []
+        son = MagicMock()
+        son.play.side_effect = lambda: appels.append('son')
+        with patch('sound_manager.pygame.mixer') as mixer, \
+             patch.object(SoundManager, 'charger_sons', lambda gestionnaire: None):
+            mixer.music.load.side_effect = lambda chemin: appels.append('load')
+            mixer.music.stop.side_effect = lambda: appels.append('stop')
+            self.sound_manager.music_playing = False
+            self.sound_manager.demarrer()
+            self.sound_manager.sound_effects['piece_drop'] = son
+            self.sound_manager.play_music()
+            self.sound_manager.play_sound('piece_drop')
+            self.sound_manager.play_sound('line_clear')  # Pas encore chargé : ignoré
+            self.sound_manager.stop_music()
+            self.sound_manager.arreter()
+        self.assertEqual(appels, ['load', 'son', 'stop'])
+        self.assertFalse(self.sound_manager.music_playing)
+        self.assertIsNone(self.sound_manager._thread)
+
+    def test_redemarrage_apres_echec(self):
+        """Un thread audio mort au démarrage ne laisse pas de signal d'arrêt au thread suivant."""
+        import threading
+        threads = []
+        son = MagicMock()
+        son.play.side_effect = lambda: threads.append(threading.current_thread().name)
+        with patch('sound_manager.pygame.mixer') as mixer, patch('builtins.print'), \
+             patch.object(SoundManager, 'charger_sons', lambda gestionnaire: None):
+            mixer.get_init.return_value = None
+            mixer.init.side_effect = pygame.error("pas de périphérique audio")
+            self.sound_manager.demarrer()
+            self.sound_manager._thread.join()
+            self.sound_manager.arreter()
+            mixer.init.side_effect = None
+            self.sound_manager.demarrer()
+            self.sound_manager.sound_effects['piece_drop'] = son
+            self.sound_manager.play_sound('piece_drop')
+            thread = self.sound_manager._thread
+            self.assertTrue(thread.is_alive())
+            self.sound_manager.arreter()
+        self.assertEqual(threads, ['audio'])
+        self.assertFalse(thread.is_alive())
+
+    def test_chargement_sans_thread(self):
+        """Sans demarrer(), le premier effet sonore demandé charge les sons dans le thread appelant."""
+        son = MagicMock()
+        self.sound_manager.sound_effects = {}
+        self.sound_manager._sons_charges = False
+        with patch('sound_manager.os.path.exists', return_value=True), \
+             patch.object(SoundManager, '_charger_son', return_value=son) as charger:
+            self.sound_manager.play_sound('piece_drop')
+            self.sound_manager.play_sound('line_clear')
+        self.assertEqual(charger.call_count, 2)  # Un seul chargement des deux effets
+        self.assertEqual(son.play.call_count, 2)
+
 # ==============================================================================
 # Tests pour les fichiers et ressources du jeu
 # ==============================================================================
@@ -0,0 +1,366 @@
+"""
+Parties à deux joueurs (versus) : règles, protocole et client.
+
+Les deux joueurs reçoivent la même suite de pièces (même graine). Chaque effacement
+envoie des lignes de déchets à l'adversaire (voir LIGNES_ENVOYEES) ; elles s'ajoutent à
+sa file d'attente et sont insérées en bas de son plateau à l'apparition de sa pièce
+suivante, sauf si ses propres effacements les annulent d'ici là.
+
+Protocole : une ligne JSON par message, sur une connexion TCP.
+    client -> serveur  {"type": "action", "action": ACTION_*}
+    serveur -> client  {"type": "debut", "joueur": 0 ou 1, "graine", "largeur", "hauteur"}
+                       {"type": "etat", "tick", "joueurs": [vue du joueur 0, vue du joueur 1]}
+                       {"type": "fin", "gagnant": 0, 1 ou None}
+Un message "etat" n'est envoyé qu'aux ticks où l'une des vues change ; le contenu du
+plateau (rangées d'indices de palette, en base64) n'y figure que s'il a été modifié.
+
+Ce module n'importe ni pygame ni asyncio : le serveur est dans serveur_versus.py,
+le test de charge dans charge_versus.py.
+"""
+
+import base64
+import json
+import queue
+import random
+import socket
+import threading
+from collections import deque
+
+from engine import (GameState, Piece, NB_COLONNES, NB_LIGNES, DUREE_TICK, ACTION_AUCUNE, ACTION_PAUSE,
+                    EVENEMENT_POSE, EVENEMENT_LIGNES)
+
+# =============================================================================
+# Règles du versus
+# =============================================================================
+LIGNES_ENVOYEES = (0, 0, 1, 2, 4)    # Déchets envoyés selon le nombre de lignes effacées d'un coup
+ACTIONS_MAX_PAR_TICK = 8             # Actions d'un joueur appliquées au plus par tick (le reste attend)
+ACTIONS_EN_ATTENTE_MAX = 64          # Actions en file d'un joueur au-delà desquelles il est refusé
+ACTIONS_VALIDES = frozenset(range(ACTION_AUCUNE, ACTION_PAUSE + 1))   # Constantes ACTION_*
+PORT_DEFAUT = 7777                   # Port TCP du serveur de versus
+
+class JoueurVersus:
+    """Partie d'un joueur dans un match, avec ses actions reçues et ses déchets en attente."""
+
+    def __init__(self, etat):
+        """
+        :param etat: Instance de GameState du joueur.
+        """
+        self.etat = etat
+        self.actions = deque()       # Actions reçues, pas encore appliquées
+        self.actions_traitees = 0    # Nombre d'actions appliquées (acquittement pour le client)
+        self.attente = []            # Déchets en attente : listes [nb_lignes, trou]
+        self.lignes_envoyees = 0     # Total des lignes de déchets envoyées à l'adversaire
+
+    def nb_attente(self):
+        """Retourne le nombre de lignes de déchets en attente."""
+        return sum(nb for nb, _ in self.attente)
+
+class MatchVersus:
+    def __init__(self, graine, largeur=NB_COLONNES, hauteur=NB_LIGNES, duree_tick=DUREE_TICK):
+        """
+        Crée un match entre deux joueurs sur la même suite de pièces.
+
+        :param graine: Graine de la suite de pièces et des trous des déchets.
+        :param largeur: Nombre de colonnes de la grille.
+        :param hauteur: Nombre de lignes de la grille.
+        :param duree_tick: Durée d'un tick logique en millisecondes.
+        """
+        self.graine = graine
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.duree_tick = duree_tick
+        self.joueurs = [JoueurVersus(GameState(largeur, hauteur, graine, duree_tick=duree_tick)) for _ in range(2)]
+        self.rng = random.Random(graine)
+        self.tick = 0
+        self.termine = False
+        self.gagnant = None
+        self._signatures = None          # Signature des vues lors du dernier message
+        self._versions = [None, None]    # Version de chaque plateau lors de sa dernière diffusion
+
+    def ajouter_action(self, joueur, action):
+        """
+        Met une action du joueur en file ; elle sera appliquée au prochain tick.
+        La pause n'existe pas en versus : elle est ignorée (mais acquittée).
+
+        :param joueur: Indice du joueur (0 ou 1).
+        :param action: Une des constantes ACTION_*.
+        :return: False si la file du joueur est pleine (ACTIONS_EN_ATTENTE_MAX) : l'action
+                 n'est pas mise en file, et le serveur déconnecte le client.
+        :raises ValueError: Si l'action n'est pas une constante ACTION_*.
+        """
+        # bool est un int : True et False ne sont pas des actions
+        if type(action) is not int or action not in ACTIONS_VALIDES:
+            raise ValueError(f"Action inconnue : {action!r}")
+        actions = self.joueurs[joueur].actions
+        if len(actions) >= ACTIONS_EN_ATTENTE_MAX:
+            return False
+        actions.append(action)
+        return True
+
+    def abandonner(self, joueur):
+        """
+        Fait perdre un joueur (déconnexion).
+
+        :param joueur: Indice du joueur (0 ou 1).
+        """
+        self.joueurs[joueur].etat.game_over = True
+
+    def _envoyer(self, joueur, nb_lignes):
+        """Annule les déchets en attente du joueur, puis envoie le reste à l'adversaire."""
+        envoi = self.joueurs[joueur]
+        attente = envoi.attente
+        while nb_lignes and attente:
+            annulees = min(nb_lignes, attente[0][0])
+            attente[0][0] -= annulees
+            nb_lignes -= annulees
+            if not attente[0][0]:
+                attente.pop(0)
+        if nb_lignes:
+            envoi.lignes_envoyees += nb_lignes
+            self.joueurs[1 - joueur].attente.append([nb_lignes, self.rng.randrange(self.largeur)])
+
+    def avancer_tick(self):
+        """
+        Avance le match d'un tick : actions en file, gravité, envoi et réception des déchets.
+
+        :return: Message "etat" encodé (bytes) si une vue a changé, sinon None.
+        """
+        if self.termine:
+            return None
+        for joueur in self.joueurs:
+            etat = joueur.etat
+            for _ in range(min(len(joueur.actions), ACTIONS_MAX_PAR_TICK)):
+                action = joueur.actions.popleft()
+                if action != ACTION_PAUSE:
+                    etat.appliquer(action)
+                joueur.actions_traitees += 1
+        for indice, joueur in enumerate(self.joueurs):
+            etat = joueur.etat
+            nb_lignes = etat.nb_lignes
+            piece = etat.piece_actuelle
+            etat.step(dt=self.duree_tick)
+            etat.vider_evenements()
+            if etat.nb_lignes != nb_lignes:
+                self._envoyer(indice, LIGNES_ENVOYEES[min(etat.nb_lignes - nb_lignes, len(LIGNES_ENVOYEES) - 1)])
+            # Les déchets en attente arrivent avec la pièce suivante
+            if etat.piece_actuelle is not piece and joueur.attente:
+                for nb, trou in joueur.attente:
+                    etat.recevoir_lignes(nb, trou)
+                joueur.attente = []
+        self.tick += 1
+        perdus = [joueur.etat.game_over for joueur in self.joueurs]
+        if any(perdus):
+            self.termine = True
+            self.gagnant = None if all(perdus) else perdus.index(False)
+        return self.message_etat()
+
+    def message_etat(self, complet=False):
+        """
+        Construit le message "etat" si une vue a changé depuis le dernier message.
+
+        :param complet: Si True, le message est construit même sans changement, avec les
+                        deux plateaux (pour un joueur qui vient d'arriver).
+        :return: Message encodé (bytes), ou None si rien n'a changé.
+        """
+        # La plupart des ticks ne changent rien : la comparaison se fait sur un tuple de
+        # quelques entiers, les vues ne sont construites que s'il diffère
+        signatures = tuple(signature_vue(joueur) for joueur in self.joueurs)
+        if signatures == self._signatures and not complet:
+            return None
+        self._signatures = signatures
+        vues = []
+        for indice, joueur in enumerate(self.joueurs):
+            vue = vue_joueur(joueur)
+            version = joueur.etat.plateau.version
+            if complet or version != self._versions[indice]:
+                self._versions[indice] = version
+                vue["plateau"] = encoder_plateau(joueur.etat.plateau)
+            vues.append(vue)
+        return encoder({"type": "etat", "tick": self.tick, "joueurs": vues})
+
+    def message_debut(self, joueur):
+        """Retourne le message "debut" (bytes) destiné à un joueur."""
+        return encoder({"type": "debut", "joueur": joueur, "graine": self.graine,
+                        "largeur": self.largeur, "hauteur": self.hauteur})
+
+    def message_fin(self):
+        """Retourne le message "fin" (bytes) du match terminé."""
+        return encoder({"type": "fin", "gagnant": self.gagnant})
+
+# =============================================================================
+# Encodage des messages
+# =============================================================================
+def encoder(message):
+    """
+    Encode un message en une ligne JSON.
+
+    :param message: Dictionnaire sérialisable.
+    :return: bytes terminés par un saut de ligne.
+    """
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+def decoder(ligne):
+    """
+    Décode une ligne reçue.
+
+    :param ligne: bytes d'une ligne JSON.
+    :return: Dictionnaire du message.
+    """
+    return json.loads(ligne)
+
+def encoder_plateau(plateau):
+    """Retourne le contenu du plateau : rangées d'indices de palette concaténées, en base64."""
+    return base64.b64encode(b"".join(plateau.couleurs)).decode()
+
+def signature_vue(joueur):
+    """
+    Retourne un tuple qui change dès que la vue du joueur change (la forme, la pièce
+    suivante, le score et le niveau ne changent qu'avec nb_pieces ou la version du plateau).
+
+    :param joueur: Instance de JoueurVersus.
+    :return: Tuple d'entiers et de booléens.
+    """
+    etat = joueur.etat
+    piece = etat.piece_actuelle
+    return (piece.col, piece.lig, piece.rotation, etat.nb_pieces, etat.plateau.version, etat.en_animation,
+            etat.game_over, joueur.actions_traitees, joueur.nb_attente())
+
+def vue_joueur(joueur):
+    """
+    Retourne ce que les clients voient de la partie d'un joueur (sans le plateau).
+
+    :param joueur: Instance de JoueurVersus.
+    :return: Dictionnaire sérialisable.
+    """
+    etat = joueur.etat
+    piece = etat.piece_actuelle
+    return {"piece": [piece.forme, piece.col, piece.lig, piece.rotation],
+            "suivante": etat.piece_suivante.forme, "score": etat.score, "lignes": etat.nb_lignes,
+            "niveau": etat.niveau, "pieces": etat.nb_pieces, "fin": etat.game_over,
+            "animation": etat.lignes_animation, "attente": joueur.nb_attente(),
+            "actions": joueur.actions_traitees}
+
+# =============================================================================
+# Miroir d'une partie distante (côté client)
+# =============================================================================
+def creer_miroir(debut):
+    """
+    Crée la partie locale qui reflète celle d'un joueur du serveur, pour l'affichage
+    ou pour un joueur automatique. Elle n'avance jamais d'elle-même.
+
+    :param debut: Message "debut" reçu du serveur.
+    :return: Instance de GameState.
+    """
+    etat = GameState(debut["largeur"], debut["hauteur"], debut["graine"])
+    etat.nb_pieces = -1         # La première vue remplace la pièce courante
+    etat.attente = 0            # Lignes de déchets en attente
+    etat.actions_traitees = 0   # Actions acquittées par le serveur
+    return etat
+
+def appliquer_vue(etat, vue):
+    """
+    Met à jour une partie miroir à partir d'une vue reçue. La pièce courante n'est
+    remplacée que lorsqu'une nouvelle pièce entre en jeu : un joueur automatique
+    (bot.PiloteAutomatique) la reconnaît ainsi d'un message à l'autre.
+
+    :param etat: Partie miroir (voir creer_miroir).
+    :param vue: Vue d'un joueur extraite d'un message "etat".
+    :return: Liste des évènements déduits de la vue (EVENEMENT_POSE, EVENEMENT_LIGNES).
+    """
+    evenements = []
+    if "plateau" in vue:
+        donnees = base64.b64decode(vue["plateau"])
+        largeur = etat.plateau.largeur
+        etat.plateau.charger_rangees(donnees[i:i + largeur] for i in range(0, len(donnees), largeur))
+    forme, col, lig, rotation = vue["piece"]
+    if vue["pieces"] != etat.nb_pieces or forme != etat.piece_actuelle.forme:
+        if etat.nb_pieces >= 0 and vue["pieces"] > etat.nb_pieces:
+            evenements.append(EVENEMENT_POSE)
+        etat.piece_actuelle = Piece(forme, col, lig, rotation)
+    else:
+        piece = etat.piece_actuelle
+        piece.col, piece.lig, piece.rotation = col, lig, rotation
+    if vue["suivante"] != etat.piece_suivante.forme:
+        etat.piece_suivante = Piece(vue["suivante"])
+    if vue["animation"] and not etat.en_animation:
+        evenements.append(EVENEMENT_LIGNES)
+        etat.timer_animation = etat.duree_animation
+    etat.en_animation = bool(vue["animation"])
+    etat.lignes_animation = vue["animation"]
+    etat.score = vue["score"]
+    etat.nb_lignes = vue["lignes"]
+    etat.niveau = vue["niveau"]
+    etat.nb_pieces = vue["pieces"]
+    etat.game_over = vue["fin"]
+    etat.attente = vue["attente"]
+    etat.actions_traitees = vue["actions"]
+    return evenements
+
+# =============================================================================
+# Client bloquant (boucle pygame de main.py)
+# =============================================================================
+class ClientVersus:
+    def __init__(self, hote, port=PORT_DEFAUT):
+        """
+        Se connecte au serveur de versus. Les messages sont lus par un thread et mis en
+        file : la boucle d'affichage les récupère sans jamais attendre le réseau.
+
+        :param hote: Adresse du serveur.
+        :param port: Port TCP du serveur.
+        """
+        self.connexion = socket.create_connection((hote, port))
+        self.connexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.messages = queue.Queue()
+        self.actions_envoyees = 0
+        self._lecteur = threading.Thread(target=self._lire, daemon=True)
+        self._lecteur.start()
+
+    def _lire(self):
+        """
+        Lit les messages du serveur jusqu'à la fermeture de la connexion (message None) ;
+        un message invalide (JSON tronqué, autre chose qu'un objet) termine aussi la lecture.
+        """
+        try:
+            with self.connexion.makefile("rb") as flux:
+                for ligne in flux:
+                    message = decoder(ligne)
+                    if not isinstance(message, dict):
+                        break
+                    self.messages.put(message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.messages.put(None)
+
+    def recevoir(self):
+        """
+        Retourne les messages reçus depuis le dernier appel, sans attendre.
+
+        :return: Liste de messages (None signale la fin de la connexion).
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def envoyer_action(self, action):
+        """
+        Envoie une action du joueur au serveur.
+
+        :param action: Une des constantes ACTION_*.
+        """
+        try:
+            self.connexion.sendall(encoder({"type": "action", "action": action}))
+            self.actions_envoyees += 1
+        except OSError:
+            pass
+
+    def fermer(self):
+        """Ferme la connexion."""
+        try:
+            self.connexion.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connexion.close()